@@ -0,0 +1,79 @@
+"""Times `PolygonObstacle.collision` with and without the edge BVH.
+
+Builds star-shaped polygons with a growing number of vertices and times
+collision tests for balls scattered over the polygon's bounding box,
+once using the BVH and once scanning every edge.
+
+Usage:
+    python benchmarks/bvh_collision.py
+"""
+
+import functools
+import math
+import random
+import timeit
+from pynball_rl import Ball, Point, PolygonObstacle
+
+
+def star(num_points: int) -> PolygonObstacle:
+    """Builds a star-shaped polygon centred on the board.
+
+    Args:
+        num_points (int): Number of vertices.
+
+    Returns:
+        PolygonObstacle: The polygon.
+    """
+    points = []
+    for i in range(num_points):
+        radius = 0.4 if i % 2 else 0.3
+        angle = 2 * math.pi * i / num_points
+        x = 0.5 + radius * math.cos(angle)
+        y = 0.5 + radius * math.sin(angle)
+        points.append(Point(x, y))
+    return PolygonObstacle(points)
+
+
+def collide_all(
+    obstacle: PolygonObstacle, balls: list[Ball], edges: range | None = None
+) -> list[bool]:
+    """Tests every ball for collision with an obstacle.
+
+    Args:
+        obstacle (PolygonObstacle): The obstacle.
+        balls (list[Ball]): Balls to test.
+        edges (range | None, optional): Edges to scan, or None to use the
+        BVH. Defaults to None.
+
+    Returns:
+        list[bool]: Whether each ball collides.
+    """
+    return [obstacle.collision(ball, edges) for ball in balls]
+
+
+def main() -> None:
+    """Prints the time per collision test for each polygon size."""
+    random.seed(0)
+    balls = []
+    for _ in range(500):
+        ball = Ball(Point(random.uniform(0.1, 0.9), random.uniform(0.1, 0.9)), 0.015)
+        ball.xdot = random.uniform(-1, 1)
+        ball.ydot = random.uniform(-1, 1)
+        balls.append(ball)
+
+    print(f"{'vertices':>8} {'full scan (us)':>15} {'bvh (us)':>10} {'speedup':>8}")
+    for num_points in (8, 32, 128, 512):
+        obstacle = star(num_points)
+        number = max(1, 512 // num_points)
+        scan = functools.partial(collide_all, obstacle, balls, range(num_points))
+        full = min(timeit.repeat(scan, number=number, repeat=3))
+        search = functools.partial(collide_all, obstacle, balls)
+        bvh = min(timeit.repeat(search, number=number, repeat=3))
+        full_us = full / number / len(balls) * 1e6
+        bvh_us = bvh / number / len(balls) * 1e6
+        speedup = full_us / bvh_us
+        print(f"{num_points:>8} {full_us:>15.2f} {bvh_us:>10.2f} {speedup:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,16 @@ from .ball import Ball
 from .point import Point
 from .obstacle import Obstacle
 from .polygon_obstacle import PolygonObstacle
+from .edge_table import EdgeTable
 from .pynball_env import PynBall
+from .vec_pynball_env import VecPynBall
+
+
+def __getattr__(name: str):
+    # Rendering front ends are loaded on first use so that importing the
+    # physics core does not pull in pygame or matplotlib.
+    if name == "Viewer":
+        from .viewer import Viewer  # pylint: disable=import-outside-toplevel
+
+        return Viewer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
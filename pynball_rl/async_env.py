@@ -0,0 +1,310 @@
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import random
+import threading
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+from pynball_rl.board import Board, SharedBoard
+from pynball_rl.pynball_env import PynBall
+
+
+def _worker(
+    config_path: Path,
+    exploration: bool,
+    seed: int,
+    board_name: str | None,
+    conn: Connection,
+) -> None:
+    """Serves requests for the environments hosted by one worker.
+
+    Requests are `(request id, environment id, command, argument)`
+    tuples. Each is answered with `(request id, result, failed)`, where
+    `result` is the exception raised if `failed`.
+    """
+    if board_name is not None:
+        Board.attach(board_name)
+    random.seed(seed)
+    envs: dict[int, PynBall] = {}
+    while True:
+        request_id, env_id, command, argument = conn.recv()
+        if command == "close":
+            break
+        try:
+            if command == "make":
+                # PynBall seeds the random module, keep the worker's stream.
+                state = random.getstate()
+                envs[env_id] = PynBall(config_path, exploration)
+                random.setstate(state)
+                result = None
+            elif command == "reset":
+                result = envs[env_id].reset()
+            elif command == "step":
+                result = envs[env_id].step(argument)
+            elif command == "remove":
+                result = envs.pop(env_id, None) is not None
+            else:
+                raise ValueError(f"Unknown command {command!r}.")
+        except Exception as error:  # pylint: disable=broad-except
+            conn.send((request_id, error, True))
+        else:
+            conn.send((request_id, result, False))
+    conn.close()
+
+
+class AsyncPynBallPool:
+    """Worker processes hosting `PynBall` environments for asyncio code.
+
+    Environments created with `make_env` live in the workers, assigned
+    round-robin. Calls on them return awaitables, so the event loop
+    never blocks on physics and any number of episodes can be in flight
+    at once. Each worker has one thread reading its replies; there is no
+    thread per environment. If a worker process dies, its outstanding
+    requests fail with `BrokenPipeError` and new requests to it are
+    refused.
+
+    Must be created inside a running event loop, preferably with
+    `async with`.
+
+    Attributes:
+        num_workers (int): Number of worker processes.
+        action_space (range): Actions of the environments.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        num_workers: int,
+        exploration: bool = False,
+        seed: int | None = None,
+        context: str | None = None,
+        share_board: bool = True,
+    ) -> None:
+        """Starts the workers.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config.
+            num_workers (int): Number of worker processes.
+            exploration (bool, optional): If True, reaching the target is
+            not terminal. Defaults to False.
+            seed (int | None, optional): Base seed, worker `k` is seeded
+            with `seed + k`. If None the config seed is used. Defaults
+            to None.
+            context (str | None, optional): Multiprocessing start method.
+            Defaults to the platform default.
+            share_board (bool, optional): Place the compiled board in
+            shared memory for the workers to attach to, rather than each
+            worker compiling its own. Defaults to True.
+        """
+        assert num_workers > 0, "Pool must have at least one worker."
+        env = PynBall(config_path, exploration)
+        if seed is None:
+            seed = env.config.get("seed", 42)
+        self.action_space = env.action_space
+        self.num_workers = num_workers
+        self._loop = asyncio.get_running_loop()
+        # Outstanding requests, the worker they were sent to and their future.
+        self._pending: dict[int, tuple[int, asyncio.Future]] = {}
+        self._dead: set[int] = set()
+        self._request_ids = itertools.count()
+        self._env_ids = itertools.count()
+        self._closed = False
+        self._board = SharedBoard(config_path) if share_board else None
+        board_name = None if self._board is None else self._board.name
+
+        ctx = multiprocessing.get_context(context)
+        self._conns: list[Connection] = []
+        self._processes = []
+        self._readers = []
+        for k in range(num_workers):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(Path(config_path), exploration, seed + k, board_name, child),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            reader = threading.Thread(
+                target=self._read, args=(k, parent), daemon=True
+            )
+            reader.start()
+            self._conns.append(parent)
+            self._processes.append(process)
+            self._readers.append(reader)
+
+    def _read(self, worker: int, conn: Connection) -> None:
+        """Forwards a worker's replies to the event loop until it exits."""
+        while True:
+            try:
+                request_id, result, failed = conn.recv()
+            except (EOFError, OSError):
+                self._loop.call_soon_threadsafe(self._worker_exited, worker)
+                return
+            self._loop.call_soon_threadsafe(self._reply, request_id, result, failed)
+
+    def _reply(self, request_id: int, result: Any, failed: bool) -> None:
+        """Resolves the future of a request with the worker's reply."""
+        _, future = self._pending.pop(request_id)
+        _resolve(future, result, failed)
+
+    def _worker_exited(self, worker: int) -> None:
+        """Fails the outstanding requests of a worker that has exited."""
+        self._dead.add(worker)
+        for request_id, (owner, future) in list(self._pending.items()):
+            if owner == worker:
+                del self._pending[request_id]
+                _resolve(future, BrokenPipeError(f"Worker {worker} exited."), True)
+
+    def request(
+        self, worker: int, env_id: int, command: str, argument: Any = None
+    ) -> asyncio.Future:
+        """Sends a request to a worker.
+
+        Args:
+            worker (int): Index of the worker.
+            env_id (int): Id of the environment the request is for.
+            command (str): One of "make", "reset", "step" or "remove".
+            argument (Any, optional): Argument of the command, the action
+            for "step". Defaults to None.
+
+        Returns:
+            asyncio.Future: Resolved with the worker's reply, or failed
+            with `BrokenPipeError` if the worker exits first.
+
+        Raises:
+            BrokenPipeError: The worker has exited.
+        """
+        assert not self._closed, "Pool is closed."
+        if worker in self._dead:
+            raise BrokenPipeError(f"Worker {worker} exited.")
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._conns[worker].send((request_id, env_id, command, argument))
+        self._pending[request_id] = (worker, future)
+        return future
+
+    async def make_env(self) -> "AsyncPynBall":
+        """Creates an environment in the next worker.
+
+        Returns:
+            AsyncPynBall: Handle to the environment.
+        """
+        env_id = next(self._env_ids)
+        worker = env_id % self.num_workers
+        await self.request(worker, env_id, "make")
+        return AsyncPynBall(self, worker, env_id)
+
+    async def close(self) -> None:
+        """Stops the workers once their outstanding requests are answered."""
+        if self._closed:
+            return
+        if self._pending:
+            futures = [future for _, future in self._pending.values()]
+            await asyncio.gather(*futures, return_exceptions=True)
+        self._closed = True
+        for worker, conn in enumerate(self._conns):
+            if worker not in self._dead:
+                try:
+                    conn.send((-1, -1, "close", None))
+                except OSError:
+                    pass
+        for process in self._processes:
+            await self._loop.run_in_executor(None, process.join)
+        for reader in self._readers:
+            reader.join()
+        for conn in self._conns:
+            conn.close()
+        if self._board is not None:
+            self._board.close()
+
+    async def __aenter__(self) -> "AsyncPynBallPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def _resolve(future: asyncio.Future, result: Any, failed: bool) -> None:
+    """Sets the outcome of a future unless it was cancelled."""
+    if future.cancelled():
+        return
+    if failed:
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+class AsyncPynBall:
+    """An asyncio handle to a `PynBall` environment in an `AsyncPynBallPool`.
+
+    Mirrors `PynBall.reset` and `PynBall.step` as coroutines.
+
+    Attributes:
+        pool (AsyncPynBallPool): The pool hosting the environment.
+        action_space (range): Actions of the environment.
+    """
+
+    def __init__(self, pool: AsyncPynBallPool, worker: int, env_id: int) -> None:
+        self.pool = pool
+        self.action_space = pool.action_space
+        self._worker = worker
+        self._env_id = env_id
+
+    async def reset(self) -> tuple:
+        """Resets the environment.
+
+        Returns:
+            tuple: Current state as (ball.x, ball.y, ball.xdot, ball.ydot).
+        """
+        return await self.pool.request(self._worker, self._env_id, "reset")
+
+    async def step(self, action: int) -> tuple:
+        """Advances the environment one timestep.
+
+        Args:
+            action (int): Action to take.
+
+        Returns:
+            tuple: (state, reward, terminal, info)
+        """
+        return await self.pool.request(self._worker, self._env_id, "step", int(action))
+
+    async def rollout(
+        self, policy: Callable[[tuple], Any], max_steps: int | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Runs an episode from a reset, yielding each transition.
+
+        Args:
+            policy (Callable[[tuple], Any]): Maps a state to an action.
+            May be a coroutine function, e.g. one querying a policy
+            server.
+            max_steps (int | None, optional): Stop after this many steps
+            even if the episode has not terminated. Defaults to None.
+
+        Yields:
+            dict[str, Any]: Transitions with keys "state", "action",
+            "next_state", "reward" and "terminal".
+        """
+        state = await self.reset()
+        for _ in itertools.count() if max_steps is None else range(max_steps):
+            action = policy(state)
+            if inspect.isawaitable(action):
+                action = await action
+            next_state, reward, terminal, _ = await self.step(action)
+            yield {
+                "state": state,
+                "action": action,
+                "next_state": next_state,
+                "reward": reward,
+                "terminal": terminal,
+            }
+            if terminal:
+                return
+            state = next_state
+
+    async def close(self) -> None:
+        """Removes the environment from its worker."""
+        await self.pool.request(self._worker, self._env_id, "remove")
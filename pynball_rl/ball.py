@@ -1,3 +1,4 @@
+import math
 from pynball_rl.point import Point
 from pynball_rl.utils import clip
 
@@ -13,6 +14,8 @@ class Ball:
         radius (float): Ball radius
     """
 
+    __slots__ = ("x", "y", "xdot", "ydot", "radius")
+
     def __init__(self, p: Point, radius: float) -> None:
         """Constructs a new ball given a point and radius. Velocities are set to zero.
 
@@ -42,8 +45,7 @@ class Ball:
         Returns:
             float: The speed of the ball.
         """
-        p = Point(self.xdot, self.ydot)
-        return p.size()
+        return math.sqrt(self.xdot * self.xdot + self.ydot * self.ydot)
 
     def add_impulse(self, x_impulse: float, y_impulse: float) -> None:
         """Add a velocity impulse to the ball.
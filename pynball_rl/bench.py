@@ -0,0 +1,372 @@
+"""Benchmarks PynBall on every bundled config and prints the results as JSON.
+
+Usage:
+    python -m pynball_rl.bench [--steps N] [--configs NAME ...] [--output FILE]
+"""
+
+from pathlib import Path
+import argparse
+import datetime
+import importlib.metadata
+import importlib.resources
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+from pynball_rl.board import Board, SharedBoard
+from pynball_rl.env_pool import PynBallPool
+from pynball_rl.pynball_env import PynBall
+from pynball_rl.vec_pynball_env import VecPynBall
+
+PERCENTILES = (50, 90, 99)
+
+
+def bundled_configs() -> list[Path]:
+    """Lists the configs shipped with the package.
+
+    Returns:
+        list[Path]: Paths of the bundled TOML configs, sorted by name.
+    """
+    configs = importlib.resources.files("pynball_rl.configs")
+    return sorted(
+        Path(file) for file in configs.iterdir() if file.name.endswith(".toml")
+    )
+
+
+def _single_env(config_path: Path, num_steps: int, seed: int) -> dict:
+    """Times resets and steps of one `PynBall` under a random policy.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Number of steps to time.
+        seed (int): Seed for RNG.
+
+    Returns:
+        dict: Steps per second, step latency percentiles and mean reset
+        time, in microseconds.
+    """
+    env = PynBall(config_path)
+    # Seed after construction, PynBall seeds the RNG from its config.
+    random.seed(seed)
+    actions = env.action_space
+    resets = []
+    latencies = np.empty(num_steps, dtype=np.int64)
+
+    start = time.perf_counter_ns()
+    env.reset()
+    resets.append(time.perf_counter_ns() - start)
+    for i in range(num_steps):
+        action = random.choice(actions)
+        start = time.perf_counter_ns()
+        _, _, terminal, _ = env.step(action)
+        latencies[i] = time.perf_counter_ns() - start
+        if terminal:
+            start = time.perf_counter_ns()
+            env.reset()
+            resets.append(time.perf_counter_ns() - start)
+
+    latency_us = latencies / 1e3
+    percentiles = np.percentile(latency_us, PERCENTILES)
+    summary = {f"p{q}": float(p) for q, p in zip(PERCENTILES, percentiles)}
+    summary["mean"] = float(latency_us.mean())
+    summary["max"] = float(latency_us.max())
+    return {
+        "steps_per_second": num_steps / (latencies.sum() / 1e9),
+        "latency_us": summary,
+        "reset_us": float(np.mean(resets) / 1e3),
+        "episodes": len(resets) - 1,
+    }
+
+
+def _collision_tests(config_path: Path, num_steps: int, seed: int) -> dict:
+    """Counts the collision tests made by one `PynBall` under a random policy.
+
+    Run separately from the timed steps, as instrumentation slows the
+    steps.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Number of steps to take.
+        seed (int): Seed for RNG.
+
+    Returns:
+        dict: Mean inner steps, obstacle tests, edge tests, collisions and
+        reversals per step.
+    """
+    env = PynBall(config_path)
+    random.seed(seed)
+    stats = env.enable_stats()
+    env.reset()
+    for _ in range(num_steps):
+        _, _, terminal, _ = env.step(random.choice(env.action_space))
+        if terminal:
+            env.reset()
+    counts = stats.as_dict()
+    names = ("substeps", "obstacles_tested", "edges_tested", "collisions", "reversals")
+    return {name: counts[name] / counts["steps"] for name in names}
+
+
+def _integrators(config_path: Path, num_steps: int, seed: int) -> dict[str, float]:
+    """Times one `PynBall` with each integrator on the same actions.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Number of steps to time per integrator.
+        seed (int): Seed for RNG.
+
+    Returns:
+        dict[str, float]: Steps per second keyed by integrator.
+    """
+    # Draw the actions once so every integrator replays the same ones.
+    rng = random.Random(seed)
+    action_space = PynBall(config_path).action_space
+    actions = [rng.choice(action_space) for _ in range(num_steps)]
+    results = {}
+    for integrator in PynBall.INTEGRATORS:
+        env = PynBall(config_path)
+        env.integrator = integrator
+        random.seed(seed)
+        env.reset()
+        start = time.perf_counter()
+        for action in actions:
+            _, _, terminal, _ = env.step(action)
+            if terminal:
+                env.reset()
+        results[integrator] = num_steps / (time.perf_counter() - start)
+    return results
+
+
+def _batch_scaling(
+    config_path: Path, num_steps: int, batch_sizes: list[int], seed: int
+) -> dict[str, float] | None:
+    """Times `VecPynBall` steps for each batch size.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Approximate number of environment steps per
+        batch size.
+        batch_sizes (list[int]): Batch sizes to time.
+        seed (int): Seed for RNG.
+
+    Returns:
+        dict[str, float] | None: Environment steps per second keyed by
+        batch size, or None if the config is not supported by
+        `VecPynBall`.
+    """
+    rng = np.random.default_rng(seed)
+    results = {}
+    for num_envs in batch_sizes:
+        try:
+            env = VecPynBall(config_path, num_envs, seed=seed)
+        except ValueError:
+            return None
+        env.reset()
+        num_batches = max(1, num_steps // num_envs)
+        actions = rng.integers(len(env.action_space), size=(num_batches, num_envs))
+        start = time.perf_counter()
+        for batch_actions in actions:
+            env.step(batch_actions)
+        elapsed = time.perf_counter() - start
+        results[str(num_envs)] = num_batches * num_envs / elapsed
+    return results
+
+
+def _worker_scaling(
+    config_path: Path,
+    num_steps: int,
+    worker_counts: list[int],
+    envs_per_worker: int,
+    seed: int,
+) -> dict[str, float]:
+    """Times `PynBallPool` steps for each number of workers.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Approximate number of environment steps per
+        worker count.
+        worker_counts (list[int]): Numbers of workers to time.
+        envs_per_worker (int): Number of environments per worker.
+        seed (int): Seed for RNG.
+
+    Returns:
+        dict[str, float]: Environment steps per second keyed by number of
+        workers.
+    """
+    rng = np.random.default_rng(seed)
+    results = {}
+    for num_workers in worker_counts:
+        with PynBallPool(config_path, num_workers, envs_per_worker, seed=seed) as pool:
+            pool.reset()
+            num_batches = max(1, num_steps // pool.num_envs)
+            actions = rng.integers(
+                len(pool.action_space), size=(num_batches, pool.num_envs)
+            )
+            start = time.perf_counter()
+            for batch_actions in actions:
+                pool.step(batch_actions)
+            elapsed = time.perf_counter() - start
+        results[str(num_workers)] = num_batches * pool.num_envs / elapsed
+    return results
+
+
+def _board_sharing(config_path: Path) -> dict[str, float]:
+    """Measures what a worker saves by attaching to a `SharedBoard`.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+
+    Returns:
+        dict[str, float]: Milliseconds to compile the board and to attach
+        to the shared copy, and the bytes of arrays mapped from the
+        segment and of Python-side structures unpickled per worker.
+    """
+    board = Board.load(config_path)
+    start = time.perf_counter()
+    Board(board.config, board.key)
+    compile_ms = 1e3 * (time.perf_counter() - start)
+    with SharedBoard(config_path) as shared:
+        # Attaching returns a cached board without touching the segment.
+        Board.clear_cache()
+        start = time.perf_counter()
+        Board.attach(shared.name)
+        attach_ms = 1e3 * (time.perf_counter() - start)
+        Board.clear_cache()
+        return {
+            "compile_ms": compile_ms,
+            "attach_ms": attach_ms,
+            "array_bytes": shared.array_bytes,
+            "object_bytes": shared.object_bytes,
+        }
+
+
+def _version() -> str | None:
+    """Gets the installed version of the package, if any."""
+    try:
+        return importlib.metadata.version("pynball-rl")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def run_benchmarks(
+    configs: list[Path] | None = None,
+    num_steps: int = 2000,
+    batch_sizes: list[int] | tuple[int, ...] = (1, 16, 256),
+    worker_counts: list[int] | tuple[int, ...] = (1, 2, 4),
+    envs_per_worker: int = 4,
+    seed: int = 0,
+) -> dict:
+    """Benchmarks each config.
+
+    Args:
+        configs (list[Path] | None, optional): Configs to benchmark.
+        Defaults to every bundled config.
+        num_steps (int, optional): Number of steps timed per measurement.
+        Defaults to 2000.
+        batch_sizes (list[int] | tuple[int, ...], optional): `VecPynBall`
+        batch sizes to time. Defaults to (1, 16, 256).
+        worker_counts (list[int] | tuple[int, ...], optional): Numbers of
+        `PynBallPool` workers to time. Defaults to (1, 2, 4).
+        envs_per_worker (int, optional): Environments per pool worker.
+        Defaults to 4.
+        seed (int, optional): Seed for RNG. Defaults to 0.
+
+    Returns:
+        dict: The results and the settings and platform they were
+        measured with.
+    """
+    assert num_steps > 0, "Number of steps must be positive."
+    if configs is None:
+        configs = bundled_configs()
+    results = {}
+    for config_path in configs:
+        config_path = Path(config_path)
+        result = _single_env(config_path, num_steps, seed)
+        result["collision_tests_per_step"] = _collision_tests(
+            config_path, num_steps, seed
+        )
+        result["integrator_steps_per_second"] = _integrators(
+            config_path, num_steps, seed
+        )
+        result["batch_steps_per_second"] = _batch_scaling(
+            config_path, num_steps, list(batch_sizes), seed
+        )
+        result["pool_steps_per_second"] = _worker_scaling(
+            config_path, num_steps, list(worker_counts), envs_per_worker, seed
+        )
+        result["shared_board"] = _board_sharing(config_path)
+        results[config_path.stem] = result
+    return {
+        "pynball_rl": _version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "settings": {
+            "num_steps": num_steps,
+            "batch_sizes": list(batch_sizes),
+            "worker_counts": list(worker_counts),
+            "envs_per_worker": envs_per_worker,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _resolve_config(name: str) -> Path:
+    """Finds a config given a path or the name of a bundled config.
+
+    Args:
+        name (str): A path, or a bundled config with or without the
+        `_config.toml` suffix, e.g. "easy".
+
+    Returns:
+        Path: Path to the config.
+    """
+    if Path(name).is_file():
+        return Path(name)
+    for config_path in bundled_configs():
+        if name in (config_path.name, config_path.stem, config_path.stem[:-7]):
+            return config_path
+    raise ValueError(f"Unknown config {name!r}.")
+
+
+def main() -> None:
+    """Command line entry point: `python -m pynball_rl.bench`."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark PynBall and print the results as JSON."
+    )
+    parser.add_argument(
+        "--configs", nargs="+", default=None, help="Configs. Defaults to all."
+    )
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 16, 256])
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    parser.add_argument("--envs-per-worker", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="File to write. Defaults to stdout."
+    )
+    args = parser.parse_args()
+    configs = None
+    if args.configs is not None:
+        configs = [_resolve_config(name) for name in args.configs]
+    report = run_benchmarks(
+        configs,
+        args.steps,
+        args.batch_sizes,
+        args.workers,
+        args.envs_per_worker,
+        args.seed,
+    )
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
+from pynball_rl.point import Point
+from pynball_rl.polygon_obstacle import PolygonObstacle
+from pynball_rl.edge_table import EdgeTable
+from pynball_rl.edge_grid import EdgeGrid
+from pynball_rl.distance_field import SignedDistanceField
+from pynball_rl.target import Target
+from pynball_rl.utils import atomic_write, config_hash
+
+# Bump when the attributes of `Board` or the classes it holds change, so
+# stale pickles in a disk cache are ignored.
+BOARD_FORMAT = 3
+# Alignment of the arrays in a shared-memory board.
+_ALIGNMENT = 64
+
+
+class Board:
+    """The parsed config and precomputed geometry of a PynBall board.
+
+    Boards are loaded with `Board.load`, which caches them in memory
+    keyed by the hash of the config file's contents, and on disk if the
+    config sets `board_cache_dir`. Environments built from the same file
+    share one board, so only the first construction pays for parsing
+    and compiling the geometry. The in-memory cache keeps the
+    `CACHE_SIZE` most recently loaded boards. A board is read-only:
+    environments hold a shallow copy of its config and their own
+    obstacle collision state.
+
+    Attributes:
+        key (str): Hash of the config file's contents.
+        config (dict): Configuration parameters.
+        obstacles (list[PolygonObstacle]): Obstacles of the board.
+        edge_table (EdgeTable): Compiled geometry of all obstacle edges.
+        edge_grid (EdgeGrid): Uniform grid over the obstacle edges.
+        target (Target): Target of the board.
+    """
+
+    CACHE_SIZE = 16
+
+    _cache: OrderedDict[str, "Board"] = OrderedDict()
+
+    def __init__(self, config: dict, key: str) -> None:
+        """Compiles the geometry of a board.
+
+        Args:
+            config (dict): Configuration parameters.
+            key (str): Hash of the config file's contents.
+        """
+        self.key = key
+        self.config = config
+        self.obstacles = [
+            PolygonObstacle([Point(*point) for point in obstacle["points"]])
+            for obstacle in config["obstacles"]
+        ]
+        self.edge_table = EdgeTable(self.obstacles)
+        self.edge_grid = EdgeGrid(
+            self.edge_table,
+            padding=config["ball"]["radius"],
+            cell_size=config.get("grid_cell_size", 0.05),
+        )
+        self.target = Target(
+            Point(*config["target"]["location"]), config["target"]["radius"]
+        )
+        self._distance_fields: dict[int, SignedDistanceField] = {}
+
+    @classmethod
+    def load(cls, config_path: Path) -> "Board":
+        """Loads the board of a config file, from a cache if possible.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config.
+
+        Returns:
+            Board: The board.
+        """
+        data = Path(config_path).read_bytes()
+        key = hashlib.sha256(data).hexdigest()[:16]
+        board = cls._cache.get(key)
+        if board is not None:
+            cls._cache.move_to_end(key)
+            return board
+        config = tomllib.loads(data.decode("utf8"))
+        cache_dir = config.get("board_cache_dir")
+        if cache_dir is None:
+            board = cls(config, key)
+        else:
+            board = cls._load_or_build(config, key, Path(cache_dir).expanduser())
+        cls._remember(board)
+        return board
+
+    @classmethod
+    def _remember(cls, board: "Board") -> None:
+        """Adds a board to the in-memory cache, evicting the least recent."""
+        cls._cache[board.key] = board
+        if len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def _load_or_build(cls, config: dict, key: str, cache_dir: Path) -> "Board":
+        """Loads a board from the disk cache, building and saving it if missing.
+
+        A cached file that cannot be loaded, whatever the error, is
+        rebuilt and overwritten.
+
+        Args:
+            config (dict): Configuration parameters.
+            key (str): Hash of the config file's contents.
+            cache_dir (Path): Directory of the disk cache.
+
+        Returns:
+            Board: The board.
+        """
+        path = cache_dir / f"board-{key}-v{BOARD_FORMAT}.pkl"
+        if path.exists():
+            try:
+                with open(path, "rb") as f:
+                    board = pickle.load(f)
+                if isinstance(board, cls) and board.key == key:
+                    return board
+            except Exception:  # pylint: disable=broad-except
+                pass
+        board = cls(config, key)
+        atomic_write(path, lambda f: pickle.dump(board, f))
+        return board
+
+    @classmethod
+    def attach(cls, name: str) -> "Board":
+        """Loads a board placed in shared memory by `SharedBoard`.
+
+        Arrays of the board, such as the edge table, grid cell masks and
+        distance field rasters, are read-only views of the shared
+        segment rather than copies. The board is added to the in-memory
+        cache, so environments built in this process from the same
+        config file use it.
+
+        Args:
+            name (str): Name of the shared-memory segment.
+
+        Returns:
+            Board: The board.
+        """
+        memory = _AttachedMemory(name=name)
+        buf = memory.buf.toreadonly()
+        header_size = int.from_bytes(buf[:8], "little")
+        key, meta_size, layout = pickle.loads(buf[8 : 8 + header_size])
+        board = cls._cache.get(key)
+        if board is not None:
+            cls._cache.move_to_end(key)
+            return board
+        data = buf[_aligned(8 + header_size) :]
+        buffers = [data[start : start + size] for start, size in layout]
+        board = pickle.loads(data[:meta_size], buffers=buffers)
+        cls._remember(board)
+        return board
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Empties the in-memory cache. The disk cache is left untouched."""
+        cls._cache.clear()
+
+    def distance_field(
+        self, resolution: int, cache_dir: Path | None
+    ) -> SignedDistanceField:
+        """Gets the signed distance field of the board, building it once.
+
+        Args:
+            resolution (int): Number of cells along each axis.
+            cache_dir (Path | None): Directory of the distance field disk
+            cache, see `SignedDistanceField.load_or_build`.
+
+        Returns:
+            SignedDistanceField: The distance field.
+        """
+        field = self._distance_fields.get(resolution)
+        if field is None:
+            field = SignedDistanceField.load_or_build(
+                self.edge_table, config_hash(self.config), resolution, cache_dir
+            )
+            self._distance_fields[resolution] = field
+        return field
+
+
+def _aligned(offset: int) -> int:
+    """Rounds an offset up to a multiple of `_ALIGNMENT`."""
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class _AttachedMemory(SharedMemory):
+    """A shared-memory segment kept mapped until the process exits.
+
+    Boards attached to a segment hold views of it for as long as they
+    are cached, so the mapping is never closed early.
+    """
+
+    def close(self) -> None:
+        pass
+
+
+class SharedBoard:
+    """A board placed in a named shared-memory segment.
+
+    The board is pickled once with its arrays stored out of band, so
+    processes attaching with `Board.attach` skip parsing the config and
+    compiling the geometry, and map the arrays without copying them.
+
+    Only that startup work and the arrays are shared. The scalar step
+    path reads Python-side structures, such as
+    `PolygonObstacle.edge_geometry` and `EdgeGrid.cells`, which are
+    unpickled into every attaching process. Each worker therefore still
+    holds its own copy of the geometry it steps with, a few tens of
+    kilobytes for the bundled configs.
+
+    The creating process owns the segment and must `close` it.
+    `python -m pynball_rl.bench` reports what sharing saves for each
+    config under "shared_board".
+
+    Attributes:
+        board (Board): The shared board.
+        name (str): Name of the shared-memory segment.
+        array_bytes (int): Size of the arrays, which attaching processes
+        map rather than copy.
+        object_bytes (int): Size of the pickled Python-side structures,
+        which every attaching process unpickles into its own memory.
+    """
+
+    def __init__(self, config_path: Path) -> None:
+        """Loads a board and copies it into a new shared-memory segment.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config.
+        """
+        self.board = Board.load(config_path)
+        buffers: list[pickle.PickleBuffer] = []
+        meta = pickle.dumps(self.board, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        self.array_bytes = sum(raw.nbytes for raw in raws)
+        self.object_bytes = len(meta)
+
+        # The header length, then a header locating the pickle and the
+        # arrays in the data that follows it.
+        layout = []
+        offset = len(meta)
+        for raw in raws:
+            offset = _aligned(offset)
+            layout.append((offset, raw.nbytes))
+            offset += raw.nbytes
+        header = pickle.dumps((self.board.key, len(meta), layout))
+        data = _aligned(8 + len(header))
+
+        self._memory = SharedMemory(create=True, size=data + offset)
+        self.name = self._memory.name
+        buf = self._memory.buf
+        buf[:8] = len(header).to_bytes(8, "little")
+        buf[8 : 8 + len(header)] = header
+        buf[data : data + len(meta)] = meta
+        for (start, size), raw in zip(layout, raws):
+            buf[data + start : data + start + size] = raw.cast("B")
+        del buf
+
+    def close(self) -> None:
+        """Frees the shared-memory segment. Attached boards stay usable."""
+        if self._memory is None:
+            return
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self) -> "SharedBoard":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
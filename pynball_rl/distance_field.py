@@ -0,0 +1,227 @@
+import math
+from pathlib import Path
+import numpy as np
+from pynball_rl.edge_table import EdgeTable
+from pynball_rl.utils import atomic_write
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "pynball_rl"
+
+
+def signed_distance(
+    edge_table: EdgeTable, x: np.ndarray | float, y: np.ndarray | float
+) -> np.ndarray:
+    """Computes exact signed distances from the edges of a board.
+
+    Args:
+        edge_table (EdgeTable): Compiled edges of the board.
+        x (np.ndarray | float): X coordinates.
+        y (np.ndarray | float): Y coordinates.
+
+    Returns:
+        np.ndarray: Signed distance of each point, negative inside
+        obstacles.
+    """
+    table = edge_table
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    p1x, p1y = table.start.T
+    dx, dy = table.direction.T
+    result = np.empty(len(x))
+    # Chunk the points to bound the size of the point-edge arrays.
+    for lo in range(0, len(x), 4096):
+        px = x[lo : lo + 4096, None] - p1x
+        py = y[lo : lo + 4096, None] - p1y
+        t = np.clip((px * dx + py * dy) * table.inv_sq_length, 0.0, 1.0)
+        ox = px - t * dx
+        oy = py - t * dy
+        distance = np.sqrt((ox * ox + oy * oy).min(axis=1))
+
+        # Even-odd crossing test, see PolygonObstacle.inside.
+        v2y = p1y + dy
+        cy = y[lo : lo + 4096, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = ((p1y > cy) != (v2y > cy)) & (
+                x[lo : lo + 4096, None] < dx * py / dy + p1x
+            )
+        parity = np.add.reduceat(crossing, table.obstacle_start, axis=1) % 2
+        result[lo : lo + 4096] = np.where(parity.any(axis=1), -distance, distance)
+    return result
+
+
+class SignedDistanceField:
+    """A raster of the signed distance to the nearest obstacle edge.
+
+    Distances are sampled on a `(resolution + 1) x (resolution + 1)`
+    lattice of points covering the unit board, indexed `[i, j]` for the
+    point `(i / resolution, j / resolution)`. Values are negative inside
+    obstacles. Lookups are O(1); `distance` recomputes the exact value
+    for points within one cell diagonal of a boundary.
+
+    Attributes:
+        edge_table (EdgeTable): Compiled edges the field is built from.
+        resolution (int): Number of cells along each axis.
+        cell_size (float): Spacing of the lattice points.
+        values (np.ndarray): `(resolution + 1, resolution + 1)` sampled
+        signed distances.
+    """
+
+    def __init__(
+        self,
+        edge_table: EdgeTable,
+        resolution: int = 256,
+        values: np.ndarray | None = None,
+    ) -> None:
+        """Builds the raster, or wraps precomputed values.
+
+        Args:
+            edge_table (EdgeTable): Compiled edges of the board.
+            resolution (int, optional): Number of cells along each axis.
+            Defaults to 256.
+            values (np.ndarray | None, optional): Precomputed raster, e.g.
+            loaded from disk. Defaults to None.
+        """
+        self.edge_table = edge_table
+        self.resolution = resolution
+        self.cell_size = 1.0 / resolution
+        self._band = math.sqrt(2) * self.cell_size
+        if values is None:
+            axis = np.linspace(0.0, 1.0, resolution + 1)
+            xs, ys = np.meshgrid(axis, axis, indexing="ij")
+            values = self.exact(xs.ravel(), ys.ravel()).reshape(xs.shape)
+        shape = (resolution + 1, resolution + 1)
+        assert values.shape == shape, "Raster does not match resolution."
+        self.values = values
+
+    @classmethod
+    def load_or_build(
+        cls,
+        edge_table: EdgeTable,
+        key: str,
+        resolution: int = 256,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    ) -> "SignedDistanceField":
+        """Loads a raster from the disk cache, building and saving it if missing.
+
+        Args:
+            edge_table (EdgeTable): Compiled edges of the board.
+            key (str): Hash identifying the board, see `utils.config_hash`.
+            resolution (int, optional): Number of cells along each axis.
+            Defaults to 256.
+            cache_dir (Path | None, optional): Directory of the disk
+            cache. If None the raster is always built and not saved.
+            Defaults to ~/.cache/pynball_rl.
+
+        Returns:
+            SignedDistanceField: The distance field.
+        """
+        if cache_dir is None:
+            return cls(edge_table, resolution)
+        path = Path(cache_dir) / f"sdf-{key}-{resolution}.npy"
+        if path.exists():
+            return cls(edge_table, resolution, np.load(path))
+        field = cls(edge_table, resolution)
+        atomic_write(path, lambda f: np.save(f, field.values))
+        return field
+
+    def exact(self, x: np.ndarray | float, y: np.ndarray | float) -> np.ndarray:
+        """Computes exact signed distances from the edges.
+
+        Args:
+            x (np.ndarray | float): X coordinates.
+            y (np.ndarray | float): Y coordinates.
+
+        Returns:
+            np.ndarray: Signed distance of each point, negative inside
+            obstacles.
+        """
+        return signed_distance(self.edge_table, x, y)
+
+    def _lattice(self, x: float, y: float) -> tuple[int, int, float, float]:
+        """Finds the cell containing a point, clamped to the board.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            tuple[int, int, float, float]: Lower lattice indices and the
+            fractional position within the cell.
+        """
+        n = self.resolution
+        u = min(max(x * n, 0.0), float(n))
+        v = min(max(y * n, 0.0), float(n))
+        i = min(int(u), n - 1)
+        j = min(int(v), n - 1)
+        return i, j, u - i, v - j
+
+    def value(self, x: float, y: float) -> float:
+        """Bilinearly interpolated signed distance.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            float: Approximate signed distance.
+        """
+        i, j, fu, fv = self._lattice(x, y)
+        v = self.values
+        return float(
+            (v[i, j] * (1 - fu) + v[i + 1, j] * fu) * (1 - fv)
+            + (v[i, j + 1] * (1 - fu) + v[i + 1, j + 1] * fu) * fv
+        )
+
+    def distance(self, x: float, y: float) -> float:
+        """Signed distance, exact within one cell diagonal of a boundary.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            float: Signed distance, negative inside obstacles.
+        """
+        value = self.value(x, y)
+        if abs(value) <= self._band or not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0):
+            return float(self.exact(x, y)[0])
+        return value
+
+    def min_distance(self, x: float, y: float) -> float:
+        """Lower bound on the distance from a point to the nearest edge.
+
+        Uses that distance is 1-Lipschitz: the distance at the point is
+        at least the distance at the nearest lattice point less the gap
+        between them.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            float: A lower bound on the unsigned distance to the nearest
+            edge. May be negative.
+        """
+        n = self.resolution
+        i = min(max(round(x * n), 0), n)
+        j = min(max(round(y * n), 0), n)
+        gap = math.sqrt((x - i / n) ** 2 + (y - j / n) ** 2)
+        return abs(float(self.values[i, j])) - gap
+
+    def is_free(self, x: float, y: float, radius: float) -> bool:
+        """Checks that a ball centred on a point does not touch any obstacle.
+
+        Args:
+            x (float): X coordinate of the ball.
+            y (float): Y coordinate of the ball.
+            radius (float): Ball radius.
+
+        Returns:
+            bool: True if the ball lies entirely in free space.
+        """
+        # Interpolation is within one cell diagonal of the exact distance,
+        # so only points that close to the ball's surface need refining.
+        on_board = 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0
+        value = self.value(x, y)
+        if abs(value - radius) <= self._band or not on_board:
+            value = float(self.exact(x, y)[0])
+        return value > radius
@@ -0,0 +1,110 @@
+from pynball_rl.utils import contact_slack
+
+
+class EdgeBVH:
+    """A bounding-volume hierarchy over the edges of a polygon.
+
+    Nodes hold the axis-aligned bounding box of their edges. Leaves hold
+    at most `leaf_size` edges. Built by recursively splitting the edges
+    at the median of their box centres along the longest axis.
+
+    Attributes:
+        boxes (list[tuple[float, float, float, float]]): Bounding box of
+        each edge as `(min_x, min_y, max_x, max_y)`.
+        nodes (list[tuple]): Flattened tree. Each node is
+        `(min_x, min_y, max_x, max_y, left, right, edges)` where `edges`
+        is None for inner nodes and a tuple of edge indices for leaves.
+        min_sq_length (float): Squared length of the shortest edge.
+    """
+
+    def __init__(
+        self, edge_geometry: list[tuple[float, ...]], leaf_size: int = 4
+    ) -> None:
+        """Builds the hierarchy.
+
+        Args:
+            edge_geometry (list[tuple[float, ...]]): Compiled edges, see
+            `polygon_obstacle.compile_edge`.
+            leaf_size (int, optional): Maximum number of edges in a leaf.
+            Defaults to 4.
+        """
+        self.leaf_size = leaf_size
+        self.boxes = [
+            (
+                min(p1x, p1x + dx),
+                min(p1y, p1y + dy),
+                max(p1x, p1x + dx),
+                max(p1y, p1y + dy),
+            )
+            for p1x, p1y, dx, dy, _, _, _ in edge_geometry
+        ]
+        self.min_sq_length = min(a for _, _, _, _, a, _, _ in edge_geometry)
+        self.nodes: list[tuple] = []
+        self._build(list(range(len(edge_geometry))))
+
+    def _build(self, edges: list[int]) -> int:
+        """Recursively adds the node covering `edges`.
+
+        Args:
+            edges (list[int]): Indices of the edges under the node.
+
+        Returns:
+            int: Index of the node in `nodes`.
+        """
+        boxes = [self.boxes[e] for e in edges]
+        box = (
+            min(b[0] for b in boxes),
+            min(b[1] for b in boxes),
+            max(b[2] for b in boxes),
+            max(b[3] for b in boxes),
+        )
+        index = len(self.nodes)
+        self.nodes.append(())
+        if len(edges) <= self.leaf_size:
+            self.nodes[index] = (*box, -1, -1, tuple(sorted(edges)))
+            return index
+
+        axis = 0 if box[2] - box[0] >= box[3] - box[1] else 1
+        centre = {e: box[axis] + box[axis + 2] for e, box in zip(edges, boxes)}
+        edges = sorted(edges, key=centre.__getitem__)
+        half = len(edges) // 2
+        left = self._build(edges[:half])
+        right = self._build(edges[half:])
+        self.nodes[index] = (*box, left, right, None)
+        return index
+
+    def query(self, x: float, y: float, radius: float) -> list[int]:
+        """Gets the edges whose bounding boxes overlap a circle's box.
+
+        The circle is grown by the tolerance of `line_intersect`, so every
+        edge the circle may be reported to intersect is returned.
+
+        Args:
+            x (float): X coordinate of the circle centre.
+            y (float): Y coordinate of the circle centre.
+            radius (float): Radius of the circle.
+
+        Returns:
+            list[int]: Ascending indices of the candidate edges.
+        """
+        r = radius + contact_slack(radius, self.min_sq_length)
+        low_x, low_y, high_x, high_y = x - r, y - r, x + r, y + r
+        nodes = self.nodes
+        boxes = self.boxes
+        found = []
+        stack = [0]
+        while stack:
+            min_x, min_y, max_x, max_y, left, right, edges = nodes[stack.pop()]
+            if high_x < min_x or high_y < min_y or low_x > max_x or low_y > max_y:
+                continue
+            if edges is None:
+                stack.append(right)
+                stack.append(left)
+                continue
+            for e in edges:
+                min_x, min_y, max_x, max_y = boxes[e]
+                if high_x < min_x or high_y < min_y or low_x > max_x or low_y > max_y:
+                    continue
+                found.append(e)
+        found.sort()
+        return found
@@ -0,0 +1,167 @@
+import math
+import numpy as np
+from pynball_rl.distance_field import signed_distance
+from pynball_rl.edge_table import EdgeTable
+from pynball_rl.utils import contact_slack
+
+
+class EdgeGrid:
+    """A uniform grid over the unit board indexing obstacle edges.
+
+    Each cell lists the edges whose bounding box, grown by `padding`,
+    overlaps the cell. Any circle of radius up to `padding` centred in
+    a cell can therefore only touch edges listed in that cell, so a
+    collision test needs a single cell lookup. Cells on the border of
+    the grid extend to infinity so points off the board are covered.
+
+    Attributes:
+        cell_size (float): Side length of a cell.
+        resolution (int): Number of cells along each axis.
+        padding (float): Radius of the circles each cell is built for.
+        cells (list[tuple[tuple[int, tuple[int, ...]], ...]]): For each
+        cell, `(obstacle index, local edge indices)` pairs, sorted by
+        obstacle and edge.
+        cell_masks (np.ndarray): `(resolution**2, E)` boolean mask of the
+        edges listed in each cell.
+        centre_distances (list[float]): For each cell, the distance from
+        its centre to the nearest edge, see `min_distance`.
+    """
+
+    def __init__(
+        self, edge_table: EdgeTable, padding: float, cell_size: float = 0.05
+    ) -> None:
+        """Bins the edges of a board into grid cells.
+
+        Args:
+            edge_table (EdgeTable): Compiled edges of the board.
+            padding (float): Largest circle radius served by a single
+            cell lookup, usually the ball radius.
+            cell_size (float, optional): Side length of a cell. Defaults to 0.05.
+        """
+        assert cell_size > 0.0, "Cell size must be positive."
+        self.resolution = max(1, math.ceil(1.0 / cell_size))
+        self.cell_size = 1.0 / self.resolution
+        # Margin covers the tolerance of `line_intersect`.
+        shortest = float(edge_table.sq_length.min())
+        self.padding = padding + contact_slack(padding, shortest)
+
+        end = edge_table.start + edge_table.direction
+        low = np.minimum(edge_table.start, end) - self.padding
+        high = np.maximum(edge_table.start, end) + self.padding
+        first = self._cell_coordinates(low)
+        last = self._cell_coordinates(high)
+
+        n = self.resolution
+        self.cell_masks = np.zeros((n * n, len(edge_table)), dtype=bool)
+        for e in range(len(edge_table)):
+            for i in range(first[e, 0], last[e, 0] + 1):
+                for j in range(first[e, 1], last[e, 1] + 1):
+                    self.cell_masks[i * n + j, e] = True
+
+        starts = edge_table.obstacle_start[edge_table.obstacle]
+        local = np.arange(len(edge_table)) - starts
+        self.cells = []
+        for mask in self.cell_masks:
+            edges = np.flatnonzero(mask)
+            groups = []
+            for obstacle in np.unique(edge_table.obstacle[edges]):
+                in_obstacle = edges[edge_table.obstacle[edges] == obstacle]
+                local_edges = tuple(int(k) for k in local[in_obstacle])
+                groups.append((int(obstacle), local_edges))
+            self.cells.append(tuple(groups))
+
+        centres = (np.arange(n) + 0.5) * self.cell_size
+        centre_x, centre_y = np.meshgrid(centres, centres, indexing="ij")
+        distances = signed_distance(edge_table, centre_x.ravel(), centre_y.ravel())
+        self.centre_distances = [float(d) for d in np.abs(distances)]
+
+    def _cell_coordinates(self, points: np.ndarray) -> np.ndarray:
+        """Gets the clamped `(i, j)` cell coordinates of an array of points.
+
+        Args:
+            points (np.ndarray): `(..., 2)` array of points.
+
+        Returns:
+            np.ndarray: `(..., 2)` integer cell coordinates.
+        """
+        coordinates = np.floor(points / self.cell_size).astype(np.intp)
+        return np.clip(coordinates, 0, self.resolution - 1)
+
+    def cell_index(self, x: float, y: float) -> int:
+        """Gets the index of the cell containing a point.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            int: Index into `cells` and `cell_masks`.
+        """
+        n = self.resolution
+        i = int(x * n)
+        j = int(y * n)
+        i = 0 if i < 0 else n - 1 if i >= n else i
+        j = 0 if j < 0 else n - 1 if j >= n else j
+        return i * n + j
+
+    def min_distance(self, x: float, y: float) -> float:
+        """Lower bound on the distance from a point to the nearest edge.
+
+        The distance at the centre of the point's cell less the gap
+        between the two, as distance is 1-Lipschitz. Costs a cell lookup.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            float: A lower bound on the unsigned distance to the nearest
+            edge. May be negative.
+        """
+        cell = self.cell_index(x, y)
+        i, j = divmod(cell, self.resolution)
+        size = self.cell_size
+        gap = math.hypot(x - (i + 0.5) * size, y - (j + 0.5) * size)
+        return self.centre_distances[cell] - gap
+
+    def cell_indices(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorised `cell_index`.
+
+        Args:
+            x (np.ndarray): X coordinates.
+            y (np.ndarray): Y coordinates.
+
+        Returns:
+            np.ndarray: Cell index of each point.
+        """
+        coordinates = self._cell_coordinates(np.stack([x, y], axis=-1))
+        return coordinates[..., 0] * self.resolution + coordinates[..., 1]
+
+    def query(
+        self, x: float, y: float, radius: float
+    ) -> tuple[tuple[int, tuple[int, ...]], ...]:
+        """Gets the edges a circle may touch, grouped by obstacle.
+
+        Args:
+            x (float): X coordinate of the circle centre.
+            y (float): Y coordinate of the circle centre.
+            radius (float): Radius of the circle.
+
+        Returns:
+            tuple[tuple[int, tuple[int, ...]], ...]: `(obstacle index,
+            local edge indices)` pairs sorted by obstacle and edge.
+        """
+        if radius <= self.padding:
+            return self.cells[self.cell_index(x, y)]
+        # Larger circles need every cell their bounding box overlaps.
+        reach = radius - self.padding
+        first = self._cell_coordinates(np.array([x - reach, y - reach]))
+        last = self._cell_coordinates(np.array([x + reach, y + reach]))
+        edges: dict[int, set[int]] = {}
+        for i in range(first[0], last[0] + 1):
+            for j in range(first[1], last[1] + 1):
+                for obstacle, local in self.cells[i * self.resolution + j]:
+                    edges.setdefault(obstacle, set()).update(local)
+        return tuple(
+            (obstacle, tuple(sorted(edges[obstacle]))) for obstacle in sorted(edges)
+        )
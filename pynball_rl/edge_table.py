@@ -0,0 +1,58 @@
+import numpy as np
+from pynball_rl.polygon_obstacle import PolygonObstacle
+
+
+class EdgeTable:
+    """Struct-of-arrays geometry of every obstacle edge on a board.
+
+    Built once per board from the geometry each `PolygonObstacle`
+    compiles at construction, so scalar and batched physics read the
+    same precomputed values. Edges are stored obstacle by obstacle in
+    the order of `PolygonObstacle.edges`.
+
+    Attributes:
+        start (np.ndarray): `(E, 2)` first vertex of each edge.
+        direction (np.ndarray): `(E, 2)` vector from the first to the
+        second vertex of each edge.
+        normal (np.ndarray): `(E, 2)` unit normal of each edge.
+        sq_length (np.ndarray): `(E,)` squared length of each edge.
+        inv_sq_length (np.ndarray): `(E,)` inverse squared length of each edge.
+        parallel_class (np.ndarray): `(E,)` parallel-class id of each
+        edge. Ids are unique across obstacles, so two edges share an id
+        if and only if they belong to the same obstacle and are parallel.
+        obstacle (np.ndarray): `(E,)` index of the obstacle owning each edge.
+        obstacle_start (np.ndarray): `(O,)` index of the first edge of
+        each obstacle.
+        bounds (np.ndarray): `(O, 4)` bounding box of each obstacle as
+        `(min_x, min_y, max_x, max_y)`.
+    """
+
+    def __init__(self, obstacles: list[PolygonObstacle]) -> None:
+        """Flattens the compiled edges of a list of obstacles.
+
+        Args:
+            obstacles (list[PolygonObstacle]): Obstacles on the board.
+        """
+        geometry, classes, owners, starts = [], [], [], []
+        num_classes = 0
+        for i, obstacle in enumerate(obstacles):
+            starts.append(len(geometry))
+            geometry.extend(obstacle.edge_geometry)
+            classes.extend(c + num_classes for c in obstacle.parallel_classes)
+            owners.extend([i] * len(obstacle.edges))
+            num_classes += max(obstacle.parallel_classes) + 1
+
+        geometry = np.array(geometry, dtype=float).reshape(-1, 7)
+        self.start = geometry[:, 0:2].copy()
+        self.direction = geometry[:, 2:4].copy()
+        self.sq_length = geometry[:, 4].copy()
+        self.inv_sq_length = 1.0 / self.sq_length
+        self.normal = geometry[:, 5:7].copy()
+        self.parallel_class = np.array(classes, dtype=np.intp)
+        self.obstacle = np.array(owners, dtype=np.intp)
+        self.obstacle_start = np.array(starts, dtype=np.intp)
+        bounds = [obstacle.bounds for obstacle in obstacles]
+        self.bounds = np.array(bounds, dtype=float).reshape(-1, 4)
+
+    def __len__(self) -> int:
+        return len(self.start)
@@ -0,0 +1,362 @@
+import multiprocessing
+import random
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Callable
+import numpy as np
+from pynball_rl.board import Board, SharedBoard
+from pynball_rl.pynball_env import PynBall
+
+
+def _buffers(buffer: memoryview, num_envs: int) -> dict[str, np.ndarray]:
+    """Lays out the arrays of a pool in a shared-memory block.
+
+    Args:
+        buffer (memoryview): The shared-memory block.
+        num_envs (int): Total number of environments in the pool.
+
+    Returns:
+        dict[str, np.ndarray]: Views of the states, final states, rewards,
+        actions and terminals.
+    """
+    layout = (
+        ("states", np.float64, (num_envs, 4)),
+        ("final_states", np.float64, (num_envs, 4)),
+        ("rewards", np.float64, (num_envs,)),
+        ("actions", np.int64, (num_envs,)),
+        ("terminals", np.bool_, (num_envs,)),
+    )
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += arrays[name].nbytes
+    return arrays
+
+
+def _buffer_size(num_envs: int) -> int:
+    """Size in bytes of the shared-memory block of a pool."""
+    return num_envs * (4 * 8 + 4 * 8 + 8 + 8 + 1)
+
+
+def _worker(
+    config_path: Path,
+    exploration: bool,
+    seed: int,
+    board_name: str | None,
+    memory_name: str,
+    num_envs: int,
+    first: int,
+    last: int,
+    conn: Connection,
+) -> None:
+    """Runs the environments `first` to `last` of a pool until closed.
+
+    Commands arrive over `conn` and results are written to shared
+    memory. Each command is acknowledged with None, or with the
+    exception it raised.
+    """
+    if board_name is not None:
+        Board.attach(board_name)
+    memory = SharedMemory(name=memory_name)
+    arrays = _buffers(memory.buf, num_envs)
+    states = arrays["states"]
+    final_states = arrays["final_states"]
+    rewards = arrays["rewards"]
+    actions = arrays["actions"]
+    terminals = arrays["terminals"]
+    envs = [PynBall(config_path, exploration) for _ in range(last - first)]
+    random.seed(seed)
+    try:
+        while True:
+            command = conn.recv()
+            if command == "close":
+                break
+            try:
+                if command == "reset":
+                    for i, env in enumerate(envs, first):
+                        states[i] = env.reset()
+                elif command == "step":
+                    for i, env in enumerate(envs, first):
+                        state, reward, terminal, _ = env.step(int(actions[i]))
+                        final_states[i] = state
+                        rewards[i] = reward
+                        terminals[i] = terminal
+                        states[i] = env.reset() if terminal else state
+                else:
+                    raise ValueError(f"Unknown command {command!r}.")
+            except Exception as error:  # pylint: disable=broad-except
+                conn.send(error)
+            else:
+                conn.send(None)
+    finally:
+        del states, final_states, rewards, actions, terminals, arrays
+        memory.close()
+
+
+class PynBallPool:
+    """A pool of `PynBall` environments stepped in worker processes.
+
+    Each worker owns `envs_per_worker` environments. Actions, states,
+    rewards and terminals are exchanged through one shared-memory block,
+    so a step sends only a short command to each worker. Finished
+    episodes are reset automatically, as in `VecPynBall`.
+
+    Steps can be taken synchronously with `step`, or started with
+    `step_async` and collected with `step_wait` to overlap the physics
+    with work in the calling process.
+
+    If a worker process exits, the command in progress and every later
+    one raise `BrokenPipeError`. The pool can still be closed.
+
+    Attributes:
+        num_workers (int): Number of worker processes.
+        envs_per_worker (int): Number of environments per worker.
+        num_envs (int): Total number of environments.
+        action_space (range): Actions of the environments.
+        states (np.ndarray): Shared `(num_envs, 4)` current states.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        num_workers: int,
+        envs_per_worker: int = 1,
+        exploration: bool = False,
+        seed: int | None = None,
+        context: str | None = None,
+        share_board: bool = True,
+    ) -> None:
+        """Starts the workers.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config.
+            num_workers (int): Number of worker processes.
+            envs_per_worker (int, optional): Number of environments per
+            worker. Defaults to 1.
+            exploration (bool, optional): If True, reaching the target is
+            not terminal. Defaults to False.
+            seed (int | None, optional): Base seed, worker `k` is seeded
+            with `seed + k`. If None the config seed is used. Defaults
+            to None.
+            context (str | None, optional): Multiprocessing start method.
+            Defaults to the platform default.
+            share_board (bool, optional): Place the compiled board in
+            shared memory for the workers to attach to, rather than each
+            worker compiling its own. Defaults to True.
+        """
+        assert num_workers > 0, "Pool must have at least one worker."
+        assert envs_per_worker > 0, "Workers must hold at least one environment."
+        env = PynBall(config_path, exploration)
+        if seed is None:
+            seed = env.config.get("seed", 42)
+        self.action_space = env.action_space
+        self.num_workers = num_workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = num_workers * envs_per_worker
+
+        self._board = SharedBoard(config_path) if share_board else None
+        self._memory = SharedMemory(create=True, size=_buffer_size(self.num_envs))
+        self._arrays = _buffers(self._memory.buf, self.num_envs)
+        self.states = self._arrays["states"]
+        self._waiting = False
+        self._closed = False
+        self._dead: set[int] = set()
+
+        ctx = multiprocessing.get_context(context)
+        self._conns: list[Connection] = []
+        self._processes = []
+        for k in range(num_workers):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    Path(config_path),
+                    exploration,
+                    seed + k,
+                    None if self._board is None else self._board.name,
+                    self._memory.name,
+                    self.num_envs,
+                    k * envs_per_worker,
+                    (k + 1) * envs_per_worker,
+                    child,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def _send(self, command: str) -> None:
+        """Sends a command to every live worker.
+
+        Raises:
+            BrokenPipeError: A worker has exited.
+        """
+        assert not self._closed, "Pool is closed."
+        if self._dead:
+            raise BrokenPipeError(f"Workers {sorted(self._dead)} exited.")
+        for k, conn in enumerate(self._conns):
+            try:
+                conn.send(command)
+            except OSError:
+                self._dead.add(k)
+
+    def _receive(self) -> list[Exception]:
+        """Reads one acknowledgement from every live worker.
+
+        Every live worker is read, even after another is found dead, so
+        no acknowledgement is left in a pipe. Workers whose pipe is
+        closed are marked dead.
+
+        Returns:
+            list[Exception]: Errors raised by the workers.
+        """
+        errors = []
+        for k, conn in enumerate(self._conns):
+            if k in self._dead:
+                continue
+            try:
+                error = conn.recv()
+            except (EOFError, OSError):
+                self._dead.add(k)
+                continue
+            if error is not None:
+                errors.append(error)
+        return errors
+
+    def _wait(self) -> None:
+        """Waits for every worker to acknowledge, re-raising worker errors.
+
+        Raises:
+            BrokenPipeError: A worker has exited.
+        """
+        errors = self._receive()
+        if self._dead:
+            raise BrokenPipeError(f"Workers {sorted(self._dead)} exited.")
+        for error in errors:
+            raise error
+
+    def reset(self) -> np.ndarray:
+        """Resets every environment.
+
+        Returns:
+            np.ndarray: Current `(num_envs, 4)` states.
+        """
+        assert not self._waiting, "A step is in progress, call step_wait first."
+        self._send("reset")
+        self._wait()
+        return self.states.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Starts a step of every environment without waiting for it.
+
+        Args:
+            actions (np.ndarray): `(num_envs,)` integer actions.
+        """
+        assert not self._waiting, "A step is already in progress."
+        self._arrays["actions"][:] = actions
+        self._send("step")
+        self._waiting = True
+
+    def step_wait(self) -> tuple:
+        """Waits for the step started by `step_async`.
+
+        Returns:
+            tuple: (states, rewards, terminals, info) where info is a dict
+            holding the pre-reset states under "final_state".
+        """
+        assert self._waiting, "No step in progress, call step_async first."
+        self._waiting = False
+        self._wait()
+        return (
+            self.states.copy(),
+            self._arrays["rewards"].copy(),
+            self._arrays["terminals"].copy(),
+            {"final_state": self._arrays["final_states"].copy()},
+        )
+
+    def step(self, actions: np.ndarray) -> tuple:
+        """Steps every environment.
+
+        Args:
+            actions (np.ndarray): `(num_envs,)` integer actions.
+
+        Returns:
+            tuple: (states, rewards, terminals, info), see `step_wait`.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def collect(
+        self, policy: Callable[[np.ndarray], np.ndarray], num_steps: int
+    ) -> dict[str, np.ndarray]:
+        """Rolls out a policy in every environment.
+
+        Args:
+            policy (Callable[[np.ndarray], np.ndarray]): Maps `(num_envs, 4)`
+            states to `(num_envs,)` actions.
+            num_steps (int): Number of steps to take.
+
+        Returns:
+            dict[str, np.ndarray]: `(num_steps, num_envs, ...)` arrays of
+            "state", "action", "next_state", "reward" and "terminal". The
+            next state of a terminal transition is its pre-reset state.
+        """
+        n = self.num_envs
+        batch = {
+            "state": np.empty((num_steps, n, 4)),
+            "action": np.empty((num_steps, n), dtype=np.int64),
+            "next_state": np.empty((num_steps, n, 4)),
+            "reward": np.empty((num_steps, n)),
+            "terminal": np.empty((num_steps, n), dtype=bool),
+        }
+        states = self.states.copy()
+        for t in range(num_steps):
+            actions = policy(states)
+            batch["state"][t] = states
+            batch["action"][t] = actions
+            states, rewards, terminals, info = self.step(actions)
+            batch["next_state"][t] = info["final_state"]
+            batch["reward"][t] = rewards
+            batch["terminal"][t] = terminals
+        return batch
+
+    def close(self) -> None:
+        """Stops the workers and frees the shared memory.
+
+        Errors of a step still in progress are discarded. The shared
+        memory is freed even if workers have exited.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._waiting:
+                self._waiting = False
+                self._receive()
+            for k, conn in enumerate(self._conns):
+                if k not in self._dead:
+                    try:
+                        conn.send("close")
+                    except OSError:
+                        self._dead.add(k)
+            for process in self._processes:
+                process.join()
+        finally:
+            for conn in self._conns:
+                conn.close()
+            self.states = None
+            self._arrays = None
+            self._memory.close()
+            self._memory.unlink()
+            if self._board is not None:
+                self._board.close()
+
+    def __enter__(self) -> "PynBallPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
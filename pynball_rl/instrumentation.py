@@ -0,0 +1,148 @@
+import time
+from typing import Callable
+
+COUNTERS = (
+    "steps",
+    "substeps",
+    "skipped_substeps",
+    "obstacles_tested",
+    "edges_tested",
+    "collisions",
+    "reversals",
+)
+PHASES = (
+    "impulse",
+    "integrate",
+    "clearance",
+    "broad_phase",
+    "narrow_phase",
+    "reflection",
+    "terminal",
+)
+
+
+class StepStats:
+    """Counters and phase timers of an instrumented `PynBall`.
+
+    Created by `PynBall.enable_stats`. While enabled, every simulated
+    step is counted; transition-cache hits are not. Timers accumulate
+    wall-clock seconds per phase of a step:
+
+    - impulse: drawing and applying the action impulse.
+    - integrate: moving the ball through the inner steps, or the whole
+      integration with the "continuous" integrator.
+    - clearance: clearance queries of the "adaptive" integrator.
+    - broad_phase: looking up the edges near the ball.
+    - narrow_phase: `PolygonObstacle.collision` tests of those edges.
+    - reflection: collision responses and multi-collision reversals.
+    - terminal: target checks.
+
+    The "continuous" integrator has no fixed inner steps. It counts each
+    stretch of path between contacts as an inner step, each contact as
+    one collision, and the edges swept for each stretch as tested. Its
+    work is timed as a whole under "integrate".
+
+    Attributes:
+        timing (bool): Whether the phase timers run.
+        timers (dict[str, float]): Seconds spent in each phase, all zero
+        unless `timing`.
+        clock (Callable[[], float]): `time.perf_counter` if `timing`,
+        else a clock stuck at zero.
+        on_episode_end (Callable[[dict], None] | None): Called with the
+        stats of each finished episode.
+        steps (int): Timesteps simulated.
+        substeps (int): Inner steps simulated.
+        skipped_substeps (int): Inner steps the "adaptive" integrator
+        moved the ball without collision tests.
+        obstacles_tested (int): Obstacle collision tests.
+        edges_tested (int): Edges checked by those tests.
+        collisions (int): Obstacle collisions detected.
+        reversals (int): Inner steps where the velocity is reversed,
+        because the ball hit several obstacles or several edges of one
+        obstacle.
+    """
+
+    def __init__(
+        self, timing: bool = False, on_episode_end: Callable[[dict], None] | None = None
+    ) -> None:
+        """Creates zeroed stats.
+
+        Args:
+            timing (bool, optional): Run the phase timers. Defaults to False.
+            on_episode_end (Callable[[dict], None] | None, optional): Called
+            with the stats of each finished episode, see `end_episode`.
+            Defaults to None.
+        """
+        self.timing = timing
+        self.clock: Callable[[], float] = time.perf_counter if timing else float
+        self.on_episode_end = on_episode_end
+        self._lap_start = 0.0
+        self.clear()
+
+    def clear(self) -> None:
+        """Zeroes every counter and timer."""
+        self.steps = 0
+        self.substeps = 0
+        self.skipped_substeps = 0
+        self.obstacles_tested = 0
+        self.edges_tested = 0
+        self.collisions = 0
+        self.reversals = 0
+        self.timers = dict.fromkeys(PHASES, 0.0)
+        self._episode_start = self.as_dict()
+
+    def start_lap(self) -> None:
+        """Starts timing a phase."""
+        self._lap_start = self.clock()
+
+    def lap(self, phase: str) -> None:
+        """Adds the time since the last lap to a phase and starts the next.
+
+        Args:
+            phase (str): One of `PHASES`.
+        """
+        now = self.clock()
+        self.timers[phase] += now - self._lap_start
+        self._lap_start = now
+
+    def as_dict(self) -> dict:
+        """Gets the totals since the stats were enabled or cleared.
+
+        Returns:
+            dict: The counters, and the timers under "timers" if `timing`.
+        """
+        stats = {name: getattr(self, name) for name in COUNTERS}
+        if self.timing:
+            stats["timers"] = dict(self.timers)
+        return stats
+
+    def episode(self) -> dict:
+        """Gets the stats of the current episode.
+
+        Returns:
+            dict: As `as_dict`, counted since the last reset.
+        """
+        stats = self.as_dict()
+        start = self._episode_start
+        episode = {name: stats[name] - start[name] for name in COUNTERS}
+        if self.timing:
+            episode["timers"] = {
+                phase: stats["timers"][phase] - start["timers"][phase]
+                for phase in PHASES
+            }
+        return episode
+
+    def end_episode(self) -> dict | None:
+        """Closes the current episode, called by `PynBall.reset`.
+
+        Returns:
+            dict | None: Stats of the episode, passed to `on_episode_end`,
+            or None if no step was simulated since the last reset.
+        """
+        episode = self.episode()
+        self._episode_start = self.as_dict()
+        if episode["steps"] == 0:
+            return None
+        if self.on_episode_end is not None:
+            self.on_episode_end(episode)
+        return episode
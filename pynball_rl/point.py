@@ -9,6 +9,8 @@ class Point:
         y (float): Y coordinate
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float) -> None:
         """Initialises the instance based on x and y coordinates.
 
@@ -101,8 +103,9 @@ class Point:
         Returns:
             float: Distance from this point to the given point point.
         """
-        distance = math.sqrt((point.x - self.x) ** 2 + (point.y - self.y) ** 2)
-        return distance
+        dx = point.x - self.x
+        dy = point.y - self.y
+        return math.sqrt(dx * dx + dy * dy)
 
     def is_parallel_to(self, point: "Point") -> bool:
         """Checks if the vector of this point is parallel to input point.
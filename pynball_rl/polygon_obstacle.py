@@ -1,6 +1,7 @@
 import math
-from typing import Optional
+from typing import Optional, Sequence
 from pynball_rl.ball import Ball
+from pynball_rl.edge_bvh import EdgeBVH
 from pynball_rl.obstacle import Obstacle
 from pynball_rl.point import Point
 from pynball_rl.utils import clip_if_close
@@ -31,14 +32,46 @@ def line_intersect(ball: Ball, edge: list[Point]) -> bool:
 
     p1, p2 = edge
     assert p1.x != p2.x or p1.y != p2.y, f"Edge is undefined: vertices both equal {p1}."
-    a = (p2.x - p1.x) ** 2 + (p2.y - p1.y) ** 2
-    b = 2 * (p2.x - p1.x) * (p1.x - ball.x) + 2 * (p2.y - p1.y) * (p1.y - ball.y)
-    c = (p1.x - ball.x) ** 2 + (p1.y - ball.y) ** 2 - ball.radius**2
-    if math.isclose(c, 0.0, abs_tol=1e-12):
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    a = dx * dx + dy * dy
+    return _line_intersect(ball.x, ball.y, ball.radius, p1.x, p1.y, dx, dy, a)
+
+
+def _line_intersect(
+    x: float,
+    y: float,
+    radius: float,
+    p1x: float,
+    p1y: float,
+    dx: float,
+    dy: float,
+    a: float,
+) -> bool:
+    """Float-only kernel of `line_intersect` using precomputed edge geometry.
+
+    Args:
+        x (float): Ball x coordinate.
+        y (float): Ball y coordinate.
+        radius (float): Ball radius.
+        p1x (float): X coordinate of the edge start.
+        p1y (float): Y coordinate of the edge start.
+        dx (float): X component of the edge direction.
+        dy (float): Y component of the edge direction.
+        a (float): Squared length of the edge.
+
+    Returns:
+        bool: True if the ball and the line intersect, False otherwise.
+    """
+    ex = p1x - x
+    ey = p1y - y
+    b = 2 * dx * ex + 2 * dy * ey
+    c = ex * ex + ey * ey - radius * radius
+    if -1e-12 <= c <= 1e-12:
         # If c = 0 then t = 0 is a root and so there is an intersection.
         return True
-    discriminant = b**2 - 4 * a * c
-    if math.isclose(discriminant, 0, abs_tol=1e-12):
+    discriminant = b * b - 4 * a * c
+    if -1e-12 <= discriminant <= 1e-12:
         # Tangential intersection, only one intersection point.
         t = clip_if_close((2 * c) / (-b))
         # Intersection is on this edge if 0 < t < 1.
@@ -70,17 +103,67 @@ def heading_towards(ball: Ball, edge: list[Point]) -> bool:
     Returns:
         bool: True if ball is headng towards edge, False otherwise.
     """
-    v = [ball.get_center(), ball.get_velocity()]
-    if math.isclose(v[1].size(), 0.0):
+    p1, p2 = edge
+    return _heading_towards(
+        ball.x, ball.y, ball.xdot, ball.ydot, p1.x, p1.y, p2.x - p1.x, p2.y - p1.y
+    )
+
+
+def _heading_towards(
+    x: float,
+    y: float,
+    xdot: float,
+    ydot: float,
+    p1x: float,
+    p1y: float,
+    dx: float,
+    dy: float,
+) -> bool:
+    """Float-only kernel of `heading_towards` using precomputed edge geometry.
+
+    Args:
+        x (float): Ball x coordinate.
+        y (float): Ball y coordinate.
+        xdot (float): Ball x velocity.
+        ydot (float): Ball y velocity.
+        p1x (float): X coordinate of the edge start.
+        p1y (float): Y coordinate of the edge start.
+        dx (float): X component of the edge direction.
+        dy (float): Y component of the edge direction.
+
+    Returns:
+        bool: True if ball is headng towards edge, False otherwise.
+    """
+    if xdot * xdot + ydot * ydot == 0.0:
+        # Ball at rest.
         return False
-    e = [edge[0], edge[1].minus(edge[0])]
-    if v[1].is_parallel_to(e[1]):
+    denominator = xdot * dy - dx * ydot
+    if denominator == 0.0:
+        # Velocity is parallel to the edge.
         return False
-    t = ((e[0].x - v[0].x) * e[1].y - e[1].x * (e[0].y - v[0].y)) / (v[1].x * e[1].y - e[1].x * v[1].y)
-
+    t = ((p1x - x) * dy - dx * (p1y - y)) / denominator
     return t > 0.0
 
 
+def compile_edge(edge: list[Point]) -> tuple[float, ...]:
+    """Precomputes the geometry of an edge used by collision tests.
+
+    Args:
+        edge (list[Point]): The edge, represented as a point pair.
+
+    Returns:
+        tuple[float, ...]: (p1x, p1y, dx, dy, a, nx, ny), where (dx, dy)
+        is the edge direction, a its squared length and (nx, ny) the
+        unit normal used for reflections.
+    """
+    p1, p2 = edge
+    assert p1.x != p2.x or p1.y != p2.y, f"Edge is undefined: vertices both equal {p1}."
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    n = Point(dy, -dx).normalise()
+    return (p1.x, p1.y, dx, dy, dx * dx + dy * dy, n.x, n.y)
+
+
 class PolygonObstacle(Obstacle):
     """A polygon obstacle.
 
@@ -93,34 +176,122 @@ class PolygonObstacle(Obstacle):
         the obstacle and a ball.
         intersect_edges (list[Point]): The edge that a ball collided with,
         represented as a pair of points.
+        edge_geometry (list[tuple[float, ...]]): Precomputed geometry of
+        each edge, see `compile_edge`.
+        parallel_classes (list[int]): Parallel-class id of each edge.
+        Edges share an id if and only if they are parallel.
+        bvh (EdgeBVH): Bounding-volume hierarchy over the edges, used to
+        find the edges near a ball when `collision` is not given them.
+        Built on first use, as environments pass the edges of their
+        `EdgeGrid` cell instead.
     """
 
     def __init__(self, points: list[Point]) -> None:
         self.points = points
         self.edges = [[self.points[i], self.points[i - 1]] for i in range(len(self.points))]
         self.bounds = self.get_bounds()
+        self.edge_geometry = [compile_edge(edge) for edge in self.edges]
+        self.parallel_classes = self.get_parallel_classes()
+        self._bvh: EdgeBVH | None = None
         self.num_collisions: int = 0
         self.intersect_edges: list[list[Point]] = []
+        self._first_intersect: int = -1
+
+    def copy(self) -> "PolygonObstacle":
+        """Copies the obstacle, sharing its precomputed geometry.
+
+        The copy has its own collision state, so environments can share
+        the geometry of a board without sharing collision results.
 
-    def collision(self, ball: Ball) -> bool:
-        if self.outside_bounds(ball.get_center(), ball.radius):
+        Returns:
+            PolygonObstacle: The copy.
+        """
+        obstacle = PolygonObstacle.__new__(PolygonObstacle)
+        obstacle.__dict__.update(self.__dict__)
+        obstacle.num_collisions = 0
+        obstacle.intersect_edges = []
+        obstacle._first_intersect = -1
+        return obstacle
+
+    @property
+    def bvh(self) -> EdgeBVH:
+        """Bounding-volume hierarchy over the edges, built on first use."""
+        if self._bvh is None:
+            self._bvh = EdgeBVH(self.edge_geometry)
+        return self._bvh
+
+    def collision(self, ball: Ball, edges: Sequence[int] | None = None) -> bool:
+        """Determine whether a collision with the ball has occured.
+
+        Args:
+            ball (Ball): The ball.
+            edges (Sequence[int] | None, optional): Ascending indices of
+            the edges to test, e.g. from a spatial index. If None the
+            edges near the ball are found with `bvh`. Defaults to None.
+
+        Returns:
+            bool: True if a collision occured, False otherwise.
+        """
+        x = ball.x
+        y = ball.y
+        r = ball.radius
+        min_x, min_y, max_x, max_y = self.bounds
+        if x + r < min_x or y + r < min_y or x - r > max_x or y - r > max_y:
             return False
 
-        self.intersect_edges = []
-        self.num_collisions = 0
-        for edge in self.edges:
-            if heading_towards(ball, edge) and line_intersect(ball, edge):
-                if not self.intersect_edges:
-                    self.intersect_edges.append(edge)
-                    self.num_collisions += 1
-                elif not self.any_parallel(edge, self.intersect_edges):
-                    # Only consider edge intersect if no parallel edge
-                    # intersections detected.
-                    self.intersect_edges.append(edge)
-                    self.num_collisions += 1
+        if self.num_collisions:
+            self.intersect_edges = []
+            self.num_collisions = 0
+        xdot = ball.xdot
+        ydot = ball.ydot
+        if xdot * xdot + ydot * ydot == 0.0:
+            # A ball at rest is not heading towards any edge.
+            return False
+        if edges is None:
+            edges = self.bvh.query(x, y, r)
+        geometry = self.edge_geometry
+        hit_classes = None
+        for i in edges:
+            p1x, p1y, dx, dy, a, _, _ = geometry[i]
+            # Inlined `_heading_towards`, the cheaper test, first.
+            denominator = xdot * dy - dx * ydot
+            if denominator == 0.0:
+                continue
+            if not ((p1x - x) * dy - dx * (p1y - y)) / denominator > 0.0:
+                continue
+            if not _line_intersect(x, y, r, p1x, p1y, dx, dy, a):
+                continue
+            # Only consider edge intersect if no parallel edge
+            # intersections detected.
+            if hit_classes is None:
+                self._first_intersect = i
+                hit_classes = [self.parallel_classes[i]]
+            elif self.parallel_classes[i] in hit_classes:
+                continue
+            else:
+                hit_classes.append(self.parallel_classes[i])
+            self.intersect_edges.append(self.edges[i])
+            self.num_collisions += 1
 
         return self.num_collisions >= 1
 
+    def get_parallel_classes(self) -> list[int]:
+        """Groups the edges of the polygon into classes of parallel edges.
+
+        Returns:
+            list[int]: The class id of each edge, numbered from 0 in
+            order of first appearance.
+        """
+        classes: list[int] = []
+        for j, (_, _, dx, dy, _, _, _) in enumerate(self.edge_geometry):
+            for i in range(j):
+                if self.edge_geometry[i][2] * dy == self.edge_geometry[i][3] * dx:
+                    classes.append(classes[i])
+                    break
+            else:
+                classes.append(max(classes, default=-1) + 1)
+        return classes
+
     def any_parallel(self, edge: list[Point], edges: list[list[Point]]) -> bool:
         """Checks if an edge is parallel to any of the input edges.
 
@@ -156,14 +327,32 @@ class PolygonObstacle(Obstacle):
             # If there are multiple collisions, reverse velocity.
             return Point(-ball.xdot, -ball.ydot)
 
-        ball_v1 = Point(ball.xdot, ball.ydot)
-        intersect_edge = self.intersect_edges[0]
-        e = intersect_edge[1].minus(intersect_edge[0])
-        # Get unit vector normal to intersecting edge
-        n = Point(e.y, -e.x).normalise()
+        # Precomputed unit vector normal to intersecting edge
+        nx, ny = self.edge_geometry[self._first_intersect][5:]
         # vector reflection
-        ball_v2 = ball_v1.minus(n.times(2).times(ball_v1.dot(n)))
-        return ball_v2
+        dot = ball.xdot * nx + ball.ydot * ny
+        return Point(ball.xdot - nx * 2 * dot, ball.ydot - ny * 2 * dot)
+
+    def apply_collision_effect(self, ball: Ball) -> None:
+        """Sets the ball's velocity to `collision_effect` in place.
+
+        Must be called after PolygonObstacle.collision
+
+        Args:
+            ball (Ball): The ball.
+        """
+        assert (
+            self.num_collisions != 0.0
+        ), "No collisions detected, did you call .collision() first?"
+
+        if self.num_collisions > 1:
+            ball.xdot = -ball.xdot
+            ball.ydot = -ball.ydot
+            return
+        _, _, _, _, _, nx, ny = self.edge_geometry[self._first_intersect]
+        dot = ball.xdot * nx + ball.ydot * ny
+        ball.xdot -= nx * 2 * dot
+        ball.ydot -= ny * 2 * dot
 
     def inside(self, point: Point) -> bool:
         """Determines whether a point lies inside the polygon.
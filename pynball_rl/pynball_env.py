@@ -1,26 +1,68 @@
+import math
 import random
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
-try:
-    import tomllib
-except ModuleNotFoundError:
-    import tomli as tomllib
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Circle
+import numpy as np
 from pynball_rl.point import Point
 from pynball_rl.ball import Ball
+from pynball_rl.board import Board
 from pynball_rl.polygon_obstacle import PolygonObstacle
-from pynball_rl.target import Target
+from pynball_rl.distance_field import DEFAULT_CACHE_DIR, SignedDistanceField
+from pynball_rl.instrumentation import StepStats
+from pynball_rl.transition_cache import TransitionCache
+from pynball_rl.utils import contact_slack
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from pynball_rl.rendering import Renderer
+from pynball_rl.time_of_impact import (
+    TIME_TOLERANCE,
+    circle_time_of_impact,
+    reflect,
+    segment_time_of_impact,
+)
+
+
+class EnvState(NamedTuple):
+    """An immutable snapshot of a `PynBall`, see `PynBall.get_state`."""
+
+    x: float
+    y: float
+    xdot: float
+    ydot: float
+    radius: float
+    reset_flag: bool
+    rng_state: tuple | None
 
 
 class PynBall:
     """A Pinball game domain.
 
     Attributes:
+        board (Board): Shared parsed config and precomputed geometry,
+        cached by `Board.load`.
         config (dict): Configuration parameters.
         step_duration (int): The number of inner-steps per step.
+        integrator (str): How the ball is moved through a step, one of
+        `INTEGRATORS`.
+        skipped_substeps (int): Number of inner steps the "adaptive"
+        integrator has moved the ball without collision tests.
         drag (float): Drag factor applied to ball each step.
         obstacles (list[PolygonObstacle]): Obstacles in the environment.
+        edge_table (EdgeTable): Compiled geometry of all obstacle edges.
+        edge_grid (EdgeGrid): Uniform grid over the obstacle edges, used
+        to test only edges near the ball.
+        distance_field (SignedDistanceField | None): Signed distance
+        raster of the board, built when the config sets `sdf_resolution`
+        or by `build_distance_field`.
+        transition_cache (TransitionCache | None): Cache of step results,
+        enabled by the config key `transition_cache_size`.
+        fixed_noise (tuple[float, float] | None): If set, a standard
+        normal sample used in place of fresh impulse noise, making the
+        dynamics deterministic.
+        stats (StepStats | None): Instrumentation counters and timers,
+        set by `enable_stats`.
         target (Target): Target instance of the environment.
         ball (Ball): The ball that travels in the environment.
         reset_flag (bool): Tracks whether the environment has been reset.
@@ -39,6 +81,10 @@ class PynBall:
     NOP_PENALTY = -1.0
     GOAL_REWARD = 10_000
 
+    INTEGRATORS = ("substep", "adaptive", "continuous")
+    # Upper bound on the contacts resolved in one continuous step.
+    MAX_CONTACTS = 32
+
     def __init__(
         self,
         config_path: Path,
@@ -46,28 +92,104 @@ class PynBall:
     ) -> None:
 
         self.exploration = exploration
-        with open(config_path, "rb") as fb:
-            self.config = tomllib.load(fb)
+        self.board = Board.load(config_path)
+        # Nested tables are shared with the board and must not be modified.
+        self.config = dict(self.board.config)
 
         random.seed(self.config.get("seed", 42))
         self.step_duration: int = self.config.get("step_duration", 20)
+        self.integrator: str = self.config.get("integrator", "substep")
+        if self.integrator not in self.INTEGRATORS:
+            raise ValueError(
+                f"Unknown integrator {self.integrator!r}, "
+                f"expected one of {self.INTEGRATORS}."
+            )
         self.drag: float = self.config.get("drag", 0.995)
         self.stddev_x: float = self.config.get("stddev_x", 0.0)
         self.stddev_y: float = self.config.get("stddev_y", 0.0)
         self.allow_noop: bool = self.config.get("allow_noop", True)
         self.action_space = range(5) if self.allow_noop else range(4)
-        self.obstacles = [
-            PolygonObstacle([Point(*point) for point in obstacle["points"]])
-            for obstacle in self.config["obstacles"]
-        ]
+        self.obstacles = [obstacle.copy() for obstacle in self.board.obstacles]
+        self.edge_table = self.board.edge_table
+        self.edge_grid = self.board.edge_grid
+        self.target = self.board.target
+        self._min_sq_length = float(self.edge_table.sq_length.min())
 
-        self.target = Target(
-            Point(*self.config["target"]["location"]), self.config["target"]["radius"]
-        )
+        self.distance_field: SignedDistanceField | None = None
+        if "sdf_resolution" in self.config:
+            self.build_distance_field(
+                self.config["sdf_resolution"],
+                Path(self.config.get("sdf_cache_dir", DEFAULT_CACHE_DIR)).expanduser(),
+            )
+
+        self.transition_cache: TransitionCache | None = None
+        if self.config.get("transition_cache_size", 0) > 0:
+            self.transition_cache = TransitionCache(
+                self.config["transition_cache_size"],
+                self.config.get("transition_cache_precision", 1e-6),
+            )
+        self.fixed_noise: tuple[float, float] | None = None
+        self.stats: StepStats | None = None
+        self._renderer: "Renderer | None" = None
 
+        self.skipped_substeps: int = 0
         self.reset_flag: bool = False
         self.ball: Ball | None = None
 
+    def build_distance_field(
+        self, resolution: int = 256, cache_dir: Path | None = DEFAULT_CACHE_DIR
+    ) -> SignedDistanceField:
+        """Loads or builds the signed distance field of the board.
+
+        Rasters are cached on disk keyed by the config hash, and in
+        memory on the board.
+
+        Args:
+            resolution (int, optional): Number of cells along each axis.
+            Defaults to 256.
+            cache_dir (Path | None, optional): Directory of the disk
+            cache, None to disable it. Defaults to ~/.cache/pynball_rl.
+
+        Returns:
+            SignedDistanceField: The distance field, also stored as
+            `self.distance_field`.
+        """
+        self.distance_field = self.board.distance_field(resolution, cache_dir)
+        return self.distance_field
+
+    def enable_stats(
+        self, timing: bool = False, on_episode_end: Callable[[dict], None] | None = None
+    ) -> StepStats:
+        """Starts counting the work done by each step.
+
+        Steps update the stats through hooks in the integration loops,
+        which leave the trajectory unchanged. Disabled environments still
+        pass the hooks, paying a few `is None` checks per inner step:
+        under 10% of a step on the bundled configs, and mostly within
+        run-to-run noise.
+
+        Args:
+            timing (bool, optional): Also time each phase of a step, at
+            some cost to the step itself. Defaults to False.
+            on_episode_end (Callable[[dict], None] | None, optional): Called
+            with the stats of each episode when the environment is reset.
+            Defaults to None.
+
+        Returns:
+            StepStats: The stats, also stored as `self.stats`.
+        """
+        self.stats = StepStats(timing, on_episode_end)
+        return self.stats
+
+    def disable_stats(self) -> StepStats | None:
+        """Stops counting the work done by each step.
+
+        Returns:
+            StepStats | None: The final stats, if they were enabled.
+        """
+        stats, self.stats = self.stats, None
+        return stats
+
     def reset(self, starting_ball: Ball | None = None) -> tuple:
         """Resets the environment.
 
@@ -89,9 +211,61 @@ class PynBall:
             )
         else:
             self.ball = starting_ball
+        if self.stats is not None:
+            self.stats.end_episode()
         self.reset_flag = True
         return (self.ball.x, self.ball.y, self.ball.xdot, self.ball.ydot)
 
+    def get_state(self, rng: bool = True) -> EnvState:
+        """Takes a snapshot of the environment, e.g. to branch a search from.
+
+        Args:
+            rng (bool, optional): Include the state of the `random` module,
+            which draws the impulse noise. May be skipped, saving its
+            cost, when the dynamics are deterministic. Defaults to True.
+
+        Returns:
+            EnvState: The snapshot.
+        """
+        ball = self.ball
+        assert ball is not None, "Environment requires resetting."
+        return EnvState(
+            ball.x,
+            ball.y,
+            ball.xdot,
+            ball.ydot,
+            ball.radius,
+            self.reset_flag,
+            random.getstate() if rng else None,
+        )
+
+    def set_state(self, state: EnvState) -> tuple:
+        """Restores a snapshot from `get_state`.
+
+        Steps taken after restoring repeat those taken after the snapshot
+        was taken, provided it includes the RNG state or the dynamics are
+        deterministic.
+
+        Args:
+            state (EnvState): The snapshot.
+
+        Returns:
+            tuple: Current state as (ball.x, ball.y, ball.xdot, ball.ydot).
+        """
+        x, y, xdot, ydot, radius, reset_flag, rng_state = state
+        ball = self.ball
+        if ball is None:
+            ball = self.ball = Ball(Point(x, y), radius)
+        ball.x = x
+        ball.y = y
+        ball.xdot = xdot
+        ball.ydot = ydot
+        ball.radius = radius
+        self.reset_flag = reset_flag
+        if rng_state is not None:
+            random.setstate(rng_state)
+        return (x, y, xdot, ydot)
+
     def terminal(self) -> bool:
         """Checks if the the environment is in a terminal state.
 
@@ -105,10 +279,18 @@ class PynBall:
     def step(self, action: int) -> tuple:
         """Advances the environment one timestep.
 
-        Each timestep is divided into `self.step_duration` inner steps.
-        Each inner step, all obstacles are checked for collision and the
-        velocity updated accordingly.
-        Drag is added after all inner steps are complete.
+        With the "substep" integrator each timestep is divided into
+        `self.step_duration` inner steps. Each inner step, the obstacle
+        edges near the ball are checked for collision and the velocity
+        updated accordingly. The "continuous" integrator instead moves
+        the ball from contact to contact using exact times of impact.
+        Drag is added after the ball has moved.
+
+        If the transition cache is enabled and the dynamics are
+        deterministic, either because the config has no impulse noise or
+        because `fixed_noise` is set, results are looked up in and stored
+        to the cache. Cache hits do not draw from the random number
+        generator.
 
         Args:
             action (int): Action to take. Used as key for ACTION_DICT:
@@ -118,49 +300,441 @@ class PynBall:
             tuple: (state, reward, terminal, info)
         """
         assert self.reset_flag is True, "Environment requires resetting."
-        if action == 4:
-            impulse = (0.0, 0.0)
-            reward = self.NOP_PENALTY
+        key = None
+        cache = self.transition_cache
+        noiseless = self.stddev_x == 0.0 and self.stddev_y == 0.0
+        if cache is not None and (noiseless or self.fixed_noise is not None):
+            ball = self.ball
+            state = (ball.x, ball.y, ball.xdot, ball.ydot)
+            # Everything but the board, which is fixed per environment.
+            settings = (
+                self.integrator,
+                self.exploration,
+                self.step_duration,
+                self.drag,
+                self.stddev_x,
+                self.stddev_y,
+                ball.radius,
+            )
+            key = cache.key(state, action, self.fixed_noise, settings)
+            cached = cache.get(key)
+            if cached is not None:
+                current_state, reward, terminal = cached
+                ball.x, ball.y, ball.xdot, ball.ydot = current_state
+                if terminal:
+                    self.reset_flag = False
+                return current_state, reward, terminal, None
+
+        reward, terminal = self._simulate(action)
+        current_state = (self.ball.x, self.ball.y, self.ball.xdot, self.ball.ydot)
+        if key is not None:
+            cache.put(key, (current_state, reward, terminal))
+        return current_state, reward, terminal, None
+
+    def step_repeat(self, action: int, k: int) -> tuple:
+        """Takes the same action `k` times, or until the episode ends.
+
+        Equivalent to calling `step` in a loop, without building the
+        intermediate results. The transition cache is not used.
+
+        Args:
+            action (int): Action to take.
+            k (int): Maximum number of steps.
+
+        Returns:
+            tuple: (state, total_reward, steps, terminal) where steps is
+            the number of steps taken.
+        """
+        assert self.reset_flag is True, "Environment requires resetting."
+        assert k > 0, "Number of repeats must be positive."
+        total_reward = 0.0
+        for steps in range(1, k + 1):
+            reward, terminal = self._simulate(action)
+            total_reward += reward
+            if terminal:
+                break
+        ball = self.ball
+        state = (ball.x, ball.y, ball.xdot, ball.ydot)
+        return state, total_reward, steps, terminal
+
+    def run_option(
+        self,
+        policy: int | Callable[[tuple], int],
+        terminate: Callable[[tuple], bool] | None = None,
+        max_steps: int | None = None,
+    ) -> tuple:
+        """Runs an option until its termination condition holds.
+
+        Each step, the option's policy picks an action for the current
+        state. The option ends after a step whose next state satisfies
+        `terminate`, when the episode ends, or after `max_steps` steps.
+        The transition cache is not used.
+
+        Args:
+            policy (int | Callable[[tuple], int]): Maps a state to an
+            action, or an action to take in every state.
+            terminate (Callable[[tuple], bool] | None, optional): Maps a
+            state to True if the option should stop. Defaults to None.
+            max_steps (int | None, optional): Maximum number of steps. If
+            None the option runs until it terminates. Defaults to None.
+
+        Returns:
+            tuple: (state, total_reward, steps, terminal) where steps is
+            the number of steps taken.
+        """
+        assert self.reset_flag is True, "Environment requires resetting."
+        ball = self.ball
+        state = (ball.x, ball.y, ball.xdot, ball.ydot)
+        total_reward = 0.0
+        steps = 0
+        terminal = False
+        while max_steps is None or steps < max_steps:
+            action = policy(state) if callable(policy) else policy
+            reward, terminal = self._simulate(action)
+            total_reward += reward
+            steps += 1
+            state = (ball.x, ball.y, ball.xdot, ball.ydot)
+            if terminal or (terminate is not None and terminate(state)):
+                break
+        return state, total_reward, steps, terminal
+
+    def _simulate(self, action: int) -> tuple[float, bool]:
+        """Runs the physics of one timestep, bypassing the transition cache.
+
+        Args:
+            action (int): Action to take.
+
+        Raises:
+            RuntimeError: Ball out of bounds error.
+
+        Returns:
+            tuple[float, bool]: The reward and whether the episode ended.
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.steps += 1
+            stats.start_lap()
+        impulse, reward = self._impulse(action)
+        self.ball.add_impulse(*impulse)
+        if stats is not None:
+            stats.lap("impulse")
+        if self.integrator == "continuous":
+            terminal = self._integrate_continuous()
+            if stats is not None:
+                stats.lap("integrate")
+        else:
+            terminal = self._integrate_substeps(self.integrator == "adaptive")
+        if terminal:
+            self.reset_flag = False
+            reward += self.GOAL_REWARD
+
+        self.ball.add_drag(self.drag)
+        self._check_bounds()
+        return reward, terminal
+
+    def transition(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rng: np.random.Generator | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Computes one timestep from each of a batch of states.
+
+        The environment's own ball, reset flag and transition cache are
+        left untouched. The "substep" and "adaptive" integrators run the
+        batched kernel of `VecPynBall`, which matches `step` exactly. The
+        "continuous" integrator steps each state in turn.
+
+        Args:
+            states (np.ndarray): `(n, 4)` ball states.
+            actions (np.ndarray): `(n,)` integer actions.
+            rng (np.random.Generator | None, optional): Source of the
+            impulse noise. If None the noise is drawn from the `random`
+            module in the same order as `n` calls to `step`, so seeded
+            results match them. Ignored if `fixed_noise` is set.
+            Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: `(n, 4)` next
+            states, `(n,)` rewards and `(n,)` terminal flags.
+        """
+        # Imported here as vec_pynball_env builds on this module.
+        # pylint: disable-next=import-outside-toplevel
+        from pynball_rl.vec_pynball_env import VecPynBall
+
+        states = np.array(states, dtype=float).reshape(-1, 4)
+        actions = np.asarray(actions, dtype=np.intp).reshape(-1)
+        if rng is None or self.fixed_noise is not None:
+            drawn = [self._impulse(action) for action in actions.tolist()]
+            impulses = np.array([impulse for impulse, _ in drawn]).reshape(-1, 2)
+            rewards = np.array([reward for _, reward in drawn], dtype=float)
         else:
-            x_imp, y_imp = self.ACTION_DICT[action]
+            noop = actions == 4
+            means = VecPynBall.IMPULSES[actions]
+            stddev = [self.stddev_x, self.stddev_y]
+            impulses = rng.normal(means, stddev, size=(len(actions), 2))
+            impulses[noop] = 0.0
+            rewards = np.where(noop, self.NOP_PENALTY, self.THRUST_PENALTY)
+
+        if self.integrator != "continuous":
+            return VecPynBall.from_env(self).integrate(states, impulses, rewards)
+
+        next_states = np.empty_like(states)
+        terminals = np.zeros(len(states), dtype=bool)
+        own_ball = self.ball
+        radius = self.config["ball"]["radius"]
+        try:
+            for i, (x, y, xdot, ydot) in enumerate(states.tolist()):
+                ball = self.ball = Ball(Point(x, y), radius)
+                ball.xdot = xdot
+                ball.ydot = ydot
+                ball.add_impulse(*impulses[i].tolist())
+                terminals[i] = self._integrate_continuous()
+                ball.add_drag(self.drag)
+                self._check_bounds()
+                next_states[i] = (ball.x, ball.y, ball.xdot, ball.ydot)
+        finally:
+            self.ball = own_ball
+        rewards = np.where(terminals, rewards + self.GOAL_REWARD, rewards)
+        return next_states, rewards, terminals
+
+    def _impulse(self, action: int) -> tuple[tuple[float, float], float]:
+        """Draws the impulse of an action.
+
+        Args:
+            action (int): Action to take.
+
+        Returns:
+            tuple[tuple[float, float], float]: The impulse and the reward
+            of the action.
+        """
+        if action == 4:
+            return (0.0, 0.0), self.NOP_PENALTY
+        x_imp, y_imp = self.ACTION_DICT[action]
+        if self.fixed_noise is None:
             impulse = (
                 random.gauss(x_imp, self.stddev_x),
                 random.gauss(y_imp, self.stddev_y),
             )
-            reward = self.THRUST_PENALTY
-        terminal = False
-        self.ball.add_impulse(*impulse)
-        for i in range(self.step_duration):
+        else:
+            impulse = (
+                x_imp + self.stddev_x * self.fixed_noise[0],
+                y_imp + self.stddev_y * self.fixed_noise[1],
+            )
+        return impulse, self.THRUST_PENALTY
+
+    def _integrate_substeps(self, adaptive: bool = False) -> bool:
+        """Moves the ball through one timestep in fixed inner steps.
+
+        In adaptive mode, the ball's clearance to the nearest edge and to
+        the target is measured and the collision tests are skipped for
+        the inner steps that cannot travel that far. The ball still moves
+        through every inner step, so the trajectory is identical.
+
+        If `self.stats` is set, the inner steps are counted and timed.
+
+        Args:
+            adaptive (bool, optional): Skip collision tests the clearance
+            rules out. Defaults to False.
+
+        Returns:
+            bool: True if the ball reached the target.
+        """
+        # Hot loop: work on locals and update the ball in place.
+        stats = self.stats
+        ball = self.ball
+        radius = ball.radius
+        step_duration = self.step_duration
+        obstacles = self.obstacles
+        grid = self.edge_grid
+        cells = grid.cells if radius <= grid.padding else None
+        if adaptive:
+            # Reflections preserve speed, so the step length is constant.
+            step_length = self._step_length()
+            free, wait = self._clearance(), 0
+            if stats is not None:
+                stats.lap("clearance")
+        for i in range(step_duration):
             num_collisions = 0
             collidor: PolygonObstacle = None
-            self.ball.step(self.step_duration)
+            # Inlined `Ball.step`.
+            ball.x += ball.xdot * radius / step_duration
+            ball.y += ball.ydot * radius / step_duration
+            if stats is not None:
+                stats.substeps += 1
+                stats.lap("integrate")
+            if adaptive:
+                free -= step_length
+                if free > 0.0:
+                    self.skipped_substeps += 1
+                    if stats is not None:
+                        stats.skipped_substeps += 1
+                    continue
 
-            for obstacle in self.obstacles:
-                if obstacle.collision(self.ball):
+            if cells is None:
+                candidates = grid.query(ball.x, ball.y, radius)
+            else:
+                candidates = cells[grid.cell_index(ball.x, ball.y)]
+            if stats is not None:
+                stats.lap("broad_phase")
+            for index, edges in candidates:
+                obstacle = obstacles[index]
+                if obstacle.collision(ball, edges):
                     num_collisions += 1
                     collidor = obstacle
+            if stats is not None:
+                stats.obstacles_tested += len(candidates)
+                stats.edges_tested += sum(len(edges) for _, edges in candidates)
+                stats.collisions += num_collisions
+                stats.lap("narrow_phase")
 
             if num_collisions == 1:
-                new_vel = collidor.collision_effect(self.ball)
-                self.ball.set_velocity(new_vel)
-                if i == self.step_duration - 1:
+                if stats is not None and collidor.num_collisions > 1:
+                    stats.reversals += 1
+                collidor.apply_collision_effect(ball)
+                if i == step_duration - 1:
                     # Add a bonus step to ensure ball bounces away from obstacle.
-                    self.ball.step(self.step_duration)
+                    ball.step(step_duration)
             elif num_collisions > 1:
                 # If there are multiple collisions, reverse velocity.
-                new_vel = Point(-self.ball.xdot, -self.ball.ydot)
-                self.ball.set_velocity(new_vel)
+                ball.xdot = -ball.xdot
+                ball.ydot = -ball.ydot
+                if stats is not None:
+                    stats.reversals += 1
+            if stats is not None:
+                stats.lap("reflection")
+
+            terminal = self.terminal()
+            if stats is not None:
+                stats.lap("terminal")
+            if terminal:
+                return True
+            if adaptive:
+                wait -= 1
+                if wait <= 0:
+                    free = self._clearance()
+                    # The clearance grows by at most a step length per inner
+                    # step, so wait until it could allow a skip to measure it.
+                    if step_length > 0.0:
+                        wait = int(1.0 - free / step_length)
+                    else:
+                        wait = step_duration
+                    if stats is not None:
+                        stats.lap("clearance")
+        return False
+
+    def _step_length(self) -> float:
+        """Distance the ball moves in one inner step.
+
+        Returns:
+            float: The inner step length.
+        """
+        return self.ball.get_speed() * self.ball.radius / self.step_duration
+
+    def _clearance(self) -> float:
+        """Distance the ball can move before it could touch an edge or the target.
 
-            if self.terminal():
-                terminal = True
-                self.reset_flag = False
-                reward += self.GOAL_REWARD
+        Returns:
+            float: The clearance, negative if the ball may already be in
+            contact.
+        """
+        ball = self.ball
+        x, y, radius = ball.x, ball.y, ball.radius
+        # Slack covering the tolerances of `line_intersect`, so a ball
+        # with positive clearance can never be reported as colliding.
+        margin = 1e-6 + contact_slack(radius, self._min_sq_length)
+        # O(1) lower bounds, a full scan of the edges would cost more
+        # than the collision tests it lets the integrator skip.
+        distance = self.edge_grid.min_distance(x, y)
+        if self.distance_field is not None:
+            distance = max(distance, self.distance_field.min_distance(x, y))
+        clearance = distance - radius
+        if not self.exploration:
+            target = self.target.point
+            to_target = math.hypot(x - target.x, y - target.y)
+            clearance = min(clearance, to_target - self.target.radius - radius)
+        return clearance - margin
+
+    def _integrate_continuous(self) -> bool:
+        """Moves the ball through one timestep from contact to contact.
+
+        The ball travels `velocity * radius` per timestep, the same
+        distance as `step_duration` inner steps. The earliest contact
+        with an edge or a vertex along the remaining path is found
+        analytically, the ball is advanced to it and its velocity is
+        reflected about the contact normal. Simultaneous contacts with
+        non-parallel normals reverse the velocity instead.
+
+        Returns:
+            bool: True if the ball reached the target.
+        """
+        if self.terminal():
+            return True
+        stats = self.stats
+        ball = self.ball
+        r = ball.radius
+        target = self.target.point
+        remaining = 1.0
+        for _ in range(self.MAX_CONTACTS):
+            ux = ball.xdot * r * remaining
+            uy = ball.ydot * r * remaining
+            if ux == 0.0 and uy == 0.0:
                 break
+            if stats is not None:
+                stats.substeps += 1
 
-        self.ball.add_drag(self.drag)
-        self._check_bounds()
-        current_state = (self.ball.x, self.ball.y, self.ball.xdot, self.ball.ydot)
-        return current_state, reward, terminal, None
+            t_contact = 1.0
+            normals: list[tuple[float, float]] = []
+            reach = r + math.sqrt(ux * ux + uy * uy) / 2
+            nearby = self.edge_grid.query(ball.x + ux / 2, ball.y + uy / 2, reach)
+            for index, edges in nearby:
+                geometry = self.obstacles[index].edge_geometry
+                for i in edges:
+                    edge = geometry[i]
+                    t = segment_time_of_impact(ball.x, ball.y, ux, uy, r, edge)
+                    if t <= t_contact + TIME_TOLERANCE:
+                        if t < t_contact - TIME_TOLERANCE:
+                            t_contact, normals = t, []
+                        normals.append(edge[5:])
+                    t = circle_time_of_impact(
+                        ball.x, ball.y, ux, uy, r, edge[0], edge[1]
+                    )
+                    if t <= t_contact + TIME_TOLERANCE:
+                        if t < t_contact - TIME_TOLERANCE:
+                            t_contact, normals = t, []
+                        nx = ball.x + t * ux - edge[0]
+                        ny = ball.y + t * uy - edge[1]
+                        norm = math.sqrt(nx * nx + ny * ny)
+                        normals.append((nx / norm, ny / norm))
+            if stats is not None:
+                stats.obstacles_tested += len(nearby)
+                stats.edges_tested += sum(len(edges) for _, edges in nearby)
+
+            if not self.exploration:
+                t = circle_time_of_impact(
+                    ball.x, ball.y, ux, uy, self.target.radius + r, target.x, target.y
+                )
+                if t <= t_contact:
+                    ball.x += t * ux
+                    ball.y += t * uy
+                    return True
+
+            ball.x += t_contact * ux
+            ball.y += t_contact * uy
+            if not normals:
+                break
+            if stats is not None:
+                stats.collisions += 1
+            nx, ny = normals[0]
+            if all(abs(nx * my - ny * mx) < 1e-9 for mx, my in normals):
+                ball.xdot, ball.ydot = reflect(ball.xdot, ball.ydot, nx, ny)
+            else:
+                # Non-parallel simultaneous contacts, reverse velocity.
+                ball.xdot, ball.ydot = -ball.xdot, -ball.ydot
+                if stats is not None:
+                    stats.reversals += 1
+            remaining *= 1.0 - t_contact
+        return False
 
     def _check_bounds(self) -> None:
         """Checks that the ball is within the bounds of the game area.
@@ -175,36 +749,32 @@ class PynBall:
                 f"vel_x: {self.ball.xdot}\nvel_y: {self.ball.ydot}"
             )
 
-    def render(self) -> plt.Figure:
-        """Renders the current state of an environment.
+    def render(self, mode: str = "human") -> "Figure | np.ndarray":
+        """Renders the current state of the environment with matplotlib.
+
+        Matplotlib is only imported on the first call. The figure is
+        built once and reused, see `rendering.Renderer`, until it is
+        closed.
 
         Args:
-            env (PynBall): The environment to render.
-        """
-        _, ax = plt.subplots()
-        for obstacle in self.obstacles:
-            points = [(p.x, p.y) for p in obstacle.points]
-            ax.add_patch(Polygon(points, facecolor="k"))
-        ax.add_patch(
-            Circle(
-                [self.target.point.x, self.target.point.y],
-                self.target.radius,
-                facecolor="r",
-            )
-        )
-        r = self.ball.radius
-        ax.add_patch(Circle([self.ball.x, self.ball.y], r, facecolor="b"))
-        if self.ball.get_speed() != 0.0:
-            ax.arrow(
-                self.ball.x,
-                self.ball.y,
-                self.ball.xdot * 2 * r,
-                self.ball.ydot * 2 * r,
-                head_width=0.03,
-                head_length=0.03,
-                facecolor="g",
-                edgecolor="g",
-            )
-        ax.axis("equal")
-        plt.gca().invert_yaxis()
-        plt.show()
+            mode (str, optional): "human" to show the figure, blocking
+            until its window is closed. "live" to update an open window
+            without blocking. "rgb_array" to return the frame. Defaults
+            to "human".
+
+        Returns:
+            Figure | np.ndarray: The figure, or for "rgb_array" an
+            `(height, width, 3)` uint8 array.
+        """
+        if self._renderer is None or not self._renderer.is_open:
+            # pylint: disable-next=import-outside-toplevel
+            from pynball_rl.rendering import Renderer
+
+            self._renderer = Renderer(self)
+        return self._renderer.render(mode)
+
+    def close(self) -> None:
+        """Closes the render figure, if any."""
+        if self._renderer is not None:
+            self._renderer.close()
+            self._renderer = None
@@ -0,0 +1,135 @@
+"""Headless NumPy rendering of PynBall environments to pixel arrays.
+
+Needs neither pygame nor matplotlib.
+"""
+
+import math
+from typing import TYPE_CHECKING
+import numpy as np
+from pynball_rl.distance_field import signed_distance
+
+if TYPE_CHECKING:
+    from pynball_rl.pynball_env import PynBall
+
+BACKGROUND_COLOR = (232, 232, 232)
+OBSTACLE_COLOR = (64, 64, 64)
+TARGET_COLOR = (255, 0, 0)
+BALL_COLOR = (0, 0, 255)
+
+
+def _gray(color: tuple[int, int, int]) -> int:
+    """Converts an RGB color to its ITU-R 601 luma."""
+    red, green, blue = color
+    return round(0.299 * red + 0.587 * green + 0.114 * blue)
+
+
+class Rasterizer:
+    """Renders ball states of an environment as uint8 pixel arrays.
+
+    The obstacles and target are rasterized once into `background`, so
+    a frame costs a copy of the background and stamping the ball. Pixel
+    `(i, j)` covers the point `((j + 0.5) / width, (i + 0.5) / height)`,
+    so rows run down the board's y axis as in `Viewer`. A pixel is
+    colored if its centre lies inside a shape.
+
+    Attributes:
+        height (int): Frame height in pixels.
+        width (int): Frame width in pixels.
+        rgb (bool): Whether frames have a trailing channel axis of RGB
+        colors, rather than holding gray levels.
+        radius (float): Radius of the ball.
+        background (np.ndarray): `(height, width)` or `(height, width, 3)`
+        frame of the board without the ball. Read-only.
+    """
+
+    def __init__(
+        self,
+        env: "PynBall",
+        height: int = 84,
+        width: int | None = None,
+        rgb: bool = False,
+    ) -> None:
+        """Rasterizes the background of an environment.
+
+        Args:
+            env (PynBall): Environment to render. For a `VecPynBall`, pass
+            its `env`.
+            height (int, optional): Frame height in pixels. Defaults to 84.
+            width (int | None, optional): Frame width in pixels. Defaults
+            to `height`.
+            rgb (bool, optional): Render RGB frames. Defaults to False.
+        """
+        assert height > 0, "Height must be positive."
+        self.height = height
+        self.width = height if width is None else width
+        assert self.width > 0, "Width must be positive."
+        self.rgb = rgb
+        self.radius: float = env.config["ball"]["radius"]
+        self._ball_color = self._color(BALL_COLOR)
+
+        x = (np.arange(self.width) + 0.5) / self.width
+        y = (np.arange(self.height) + 0.5) / self.height
+        grid_x, grid_y = np.meshgrid(x, y)
+        obstacle = signed_distance(env.edge_table, grid_x.ravel(), grid_y.ravel()) < 0.0
+        target = env.target
+        dx = grid_x - target.point.x
+        dy = grid_y - target.point.y
+        shape = (self.height, self.width) + ((3,) if rgb else ())
+        background = np.empty(shape, dtype=np.uint8)
+        background[...] = self._color(BACKGROUND_COLOR)
+        background[obstacle.reshape(grid_x.shape)] = self._color(OBSTACLE_COLOR)
+        background[dx * dx + dy * dy <= target.radius**2] = self._color(TARGET_COLOR)
+        background.flags.writeable = False
+        self.background = background
+
+        # Offsets of the pixels around the ball that its disc may cover.
+        rows = math.ceil(self.radius * self.height) + 1
+        cols = math.ceil(self.radius * self.width) + 1
+        self._row_offsets = np.arange(-rows, rows + 1)
+        self._col_offsets = np.arange(-cols, cols + 1)
+
+    def _color(self, color: tuple[int, int, int]) -> np.ndarray | int:
+        """Gets the pixel value of a color in this rasterizer's format."""
+        return np.array(color, dtype=np.uint8) if self.rgb else _gray(color)
+
+    def render(self, state: tuple[float, ...]) -> np.ndarray:
+        """Renders a single ball state.
+
+        Args:
+            state (tuple[float, ...]): Ball state, of which only the
+            position `(x, y)` is used.
+
+        Returns:
+            np.ndarray: `(height, width)` or `(height, width, 3)` frame.
+        """
+        return self.render_batch(np.asarray(state, dtype=float)[None, :2])[0]
+
+    def render_batch(self, states: np.ndarray) -> np.ndarray:
+        """Renders a batch of ball states, e.g. the states of a `VecPynBall`.
+
+        Args:
+            states (np.ndarray): `(n, 2)` positions or `(n, 4)` states.
+
+        Returns:
+            np.ndarray: `(n, height, width)` or `(n, height, width, 3)`
+            frames.
+        """
+        states = np.asarray(states, dtype=float)
+        n = len(states)
+        frames = np.empty((n,) + self.background.shape, dtype=np.uint8)
+        frames[...] = self.background
+
+        x, y = states[:, 0], states[:, 1]
+        # Pixels in a window around each ball, (n, rows, 1) and (n, 1, cols).
+        rows = np.floor(y * self.height).astype(np.intp)[:, None] + self._row_offsets
+        cols = np.floor(x * self.width).astype(np.intp)[:, None] + self._col_offsets
+        centre_y = (rows + 0.5) / self.height - y[:, None]
+        centre_x = (cols + 0.5) / self.width - x[:, None]
+        inside = (
+            centre_x[:, None, :] ** 2 + centre_y[:, :, None] ** 2 <= self.radius**2
+        )
+        inside &= ((rows >= 0) & (rows < self.height))[:, :, None]
+        inside &= ((cols >= 0) & (cols < self.width))[:, None, :]
+        ball, i, j = np.nonzero(inside)
+        frames[ball, rows[ball, i], cols[ball, j]] = self._ball_color
+        return frames
@@ -0,0 +1,150 @@
+"""Matplotlib rendering of PynBall environments.
+
+Imported lazily by `PynBall.render` so the physics core does not pay
+for matplotlib.
+"""
+
+from typing import TYPE_CHECKING
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Circle, FancyArrow
+
+if TYPE_CHECKING:
+    from pynball_rl.pynball_env import PynBall
+
+RENDER_MODES = ("human", "live", "rgb_array")
+
+
+class Renderer:
+    """A persistent matplotlib figure of an environment.
+
+    The figure, obstacles and target are drawn once. Each `render` call
+    then only moves the ball and its velocity arrow, which are animated
+    artists blitted over a cached image of the static board. The cache
+    is refreshed whenever matplotlib redraws the whole figure, e.g.
+    after the window is resized.
+
+    Attributes:
+        env (PynBall): The environment rendered.
+        fig (plt.Figure): The figure.
+        ax (plt.Axes): Axes of the board.
+        ball (Circle): Patch of the ball.
+        arrow (FancyArrow): Velocity arrow of the ball, hidden while the
+        ball is still.
+    """
+
+    def __init__(self, env: "PynBall") -> None:
+        """Creates the figure and draws the static board.
+
+        Args:
+            env (PynBall): The environment to render.
+        """
+        self.env = env
+        self.fig, self.ax = plt.subplots()
+        self.ax.add_collection(
+            PolyCollection(
+                [[(p.x, p.y) for p in obstacle.points] for obstacle in env.obstacles],
+                facecolor="k",
+            )
+        )
+        self.ax.add_patch(
+            Circle(
+                [env.target.point.x, env.target.point.y],
+                env.target.radius,
+                facecolor="r",
+            )
+        )
+        self.ball = Circle((0.0, 0.0), 0.0, facecolor="b", animated=True)
+        self.ax.add_patch(self.ball)
+        self.arrow = FancyArrow(
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            head_width=0.03,
+            head_length=0.03,
+            facecolor="g",
+            edgecolor="g",
+            animated=True,
+        )
+        self.ax.add_patch(self.arrow)
+        self.ax.set_xlim(0.0, 1.0)
+        self.ax.set_ylim(0.0, 1.0)
+        self.ax.set_aspect("equal")
+        self.ax.invert_yaxis()
+
+        self._background = None
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, _event) -> None:
+        """Caches the static board after a full redraw and redraws the ball."""
+        canvas = self.fig.canvas
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        self.fig.draw_artist(self.ball)
+        self.fig.draw_artist(self.arrow)
+
+    def _update(self) -> None:
+        """Moves the ball and its velocity arrow to the environment's state."""
+        ball = self.env.ball
+        r = ball.radius
+        self.ball.set_center((ball.x, ball.y))
+        self.ball.set_radius(r)
+        moving = ball.get_speed() != 0.0
+        self.arrow.set_visible(moving)
+        if moving:
+            self.arrow.set_data(
+                x=ball.x, y=ball.y, dx=ball.xdot * 2 * r, dy=ball.ydot * 2 * r
+            )
+
+    def _blit(self) -> None:
+        """Redraws the animated artists over the cached board."""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # The first draw caches the board through `_on_draw`.
+            canvas.draw()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the figure is still open."""
+        return plt.fignum_exists(self.fig.number)
+
+    def render(self, mode: str = "human") -> plt.Figure | np.ndarray:
+        """Draws the environment's current state.
+
+        Args:
+            mode (str, optional): "human" shows the figure and blocks until
+            its window is closed, as plain `plt.show()` does. "live" shows
+            it without blocking, updating the open window on each call
+            for live monitoring. "rgb_array" draws off screen and returns
+            the frame. Defaults to "human".
+
+        Returns:
+            plt.Figure | np.ndarray: The figure, or for "rgb_array" an
+            `(height, width, 3)` uint8 array.
+        """
+        if mode not in RENDER_MODES:
+            raise ValueError(
+                f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}."
+            )
+        self._update()
+        self._blit()
+        if mode == "rgb_array":
+            return np.array(self.fig.canvas.buffer_rgba())[..., :3]
+        if mode == "live":
+            plt.show(block=False)
+            self.fig.canvas.flush_events()
+        else:
+            plt.show()
+        return self.fig
+
+    def close(self) -> None:
+        """Closes the figure."""
+        plt.close(self.fig)
@@ -0,0 +1,171 @@
+import json
+from pathlib import Path
+import numpy as np
+from pynball_rl.rollout import RECORD_DTYPE
+
+
+class ReplayBuffer:
+    """A fixed-capacity ring buffer of PynBall transitions.
+
+    Transitions are stored in one preallocated structured array of
+    `rollout.RECORD_DTYPE` records, optionally memory-mapped to a `.npy`
+    file. Once full, new transitions overwrite the oldest.
+
+    Attributes:
+        capacity (int): Maximum number of transitions held.
+        records (np.ndarray): `(capacity,)` backing array. Only the first
+        `len(self)` records are valid.
+        position (int): Index the next transition is written to.
+    """
+
+    def __init__(self, capacity: int, path: Path | None = None) -> None:
+        """Allocates the buffer.
+
+        Args:
+            capacity (int): Maximum number of transitions held.
+            path (Path | None, optional): If given, the records are held in
+            a memory-mapped `.npy` file at this path, overwritten if it
+            exists. Defaults to None.
+        """
+        assert capacity > 0, "Capacity must be positive."
+        self.capacity = capacity
+        if path is None:
+            self.records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        else:
+            self.records = np.lib.format.open_memmap(
+                path, mode="w+", dtype=RECORD_DTYPE, shape=(capacity,)
+            )
+        self.position = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_rollout(
+        cls, path: Path, capacity: int | None = None, buffer_path: Path | None = None
+    ) -> "ReplayBuffer":
+        """Loads transitions written by the rollout tooling.
+
+        Args:
+            path (Path): A rollout `.npy` file, or a directory holding the
+            `manifest.json` of a sharded rollout.
+            capacity (int | None, optional): Buffer capacity. Defaults to
+            the number of transitions in the rollout.
+            buffer_path (Path | None, optional): File to memory-map the
+            buffer to. Defaults to None.
+
+        Returns:
+            ReplayBuffer: Buffer holding the rollout. If `capacity` is
+            smaller than the rollout, the most recent transitions.
+        """
+        path = Path(path)
+        if path.is_dir():
+            with open(path / "manifest.json", encoding="utf8") as f:
+                files = [path / shard["file"] for shard in json.load(f)["shards"]]
+        else:
+            files = [path]
+        rollouts = [np.load(file, mmap_mode="r") for file in files]
+        if capacity is None:
+            capacity = max(1, sum(len(records) for records in rollouts))
+        buffer = cls(capacity, buffer_path)
+        for records in rollouts:
+            buffer.add_records(records)
+        return buffer
+
+    def add(
+        self,
+        state: tuple[float, ...],
+        action: int,
+        next_state: tuple[float, ...],
+        reward: float,
+        terminal: bool,
+    ) -> None:
+        """Inserts a transition, overwriting the oldest if full.
+
+        Args:
+            state (tuple[float, ...]): State before the step.
+            action (int): Action taken.
+            next_state (tuple[float, ...]): State after the step.
+            reward (float): Reward received.
+            terminal (bool): Whether the step ended the episode.
+        """
+        self.records[self.position] = (state, action, next_state, reward, terminal)
+        self.position = (self.position + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def add_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        next_states: np.ndarray,
+        rewards: np.ndarray,
+        terminals: np.ndarray,
+    ) -> None:
+        """Inserts a batch of transitions, e.g. from `VecPynBall.step`.
+
+        Args:
+            states (np.ndarray): `(n, 4)` states before the step.
+            actions (np.ndarray): `(n,)` actions taken.
+            next_states (np.ndarray): `(n, 4)` states after the step.
+            rewards (np.ndarray): `(n,)` rewards received.
+            terminals (np.ndarray): `(n,)` terminal flags.
+        """
+        records = np.empty(len(actions), dtype=RECORD_DTYPE)
+        records["state"] = states
+        records["action"] = actions
+        records["next_state"] = next_states
+        records["reward"] = rewards
+        records["terminal"] = terminals
+        self.add_records(records)
+
+    def add_records(self, records: np.ndarray) -> None:
+        """Inserts an array of `RECORD_DTYPE` records in order.
+
+        Args:
+            records (np.ndarray): The records.
+        """
+        n = len(records)
+        if n >= self.capacity:
+            # Only the last `capacity` records survive.
+            records = records[n - self.capacity :]
+            start = (self.position + n - self.capacity) % self.capacity
+            self.records[start:] = records[: self.capacity - start]
+            self.records[:start] = records[self.capacity - start :]
+        else:
+            head = min(n, self.capacity - self.position)
+            self.records[self.position : self.position + head] = records[:head]
+            self.records[: n - head] = records[head:]
+        self.position = (self.position + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draws a minibatch uniformly with replacement.
+
+        Args:
+            batch_size (int): Number of transitions.
+            rng (np.random.Generator): Source of randomness.
+
+        Returns:
+            np.ndarray: `(batch_size,)` records. Fields are accessed by
+            name, e.g. `batch["state"]`.
+        """
+        assert self._size > 0, "Cannot sample from an empty buffer."
+        return self.records[rng.integers(self._size, size=batch_size)]
+
+    def view(self) -> np.ndarray:
+        """Gets the valid records without copying.
+
+        Records are in storage order, not insertion order, once the
+        buffer has wrapped around.
+
+        Returns:
+            np.ndarray: `(len(self),)` view of the records. Field views
+            such as `view()["reward"]` are also zero-copy.
+        """
+        return self.records[: self._size]
+
+    def flush(self) -> None:
+        """Writes a memory-mapped buffer to disk."""
+        if isinstance(self.records, np.memmap):
+            self.records.flush()
@@ -1,53 +1,302 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import argparse
+import hashlib
 import importlib.resources
-import random
 import json
+import random
+import numpy as np
 from pynball_rl import PynBall
+from pynball_rl.utils import config_hash
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("state", "<f4", (4,)),
+        ("action", "i1"),
+        ("next_state", "<f4", (4,)),
+        ("reward", "<f4"),
+        ("terminal", "i1"),
+    ]
+)
+# Bytes reserved for the .npy magic string and header, so the header can
+# be rewritten in place as records are appended.
+HEADER_SIZE = 256
+
+
+class RolloutWriter:
+    """Streams transitions to a `.npy` file of fixed-width records.
+
+    Records use `RECORD_DTYPE` and are buffered in memory in chunks of
+    `chunk_size`. After each chunk is appended the record count in the
+    header is updated, so the file can be opened with `read_rollout`
+    or `np.load` at any time and holds every flushed record.
+
+    Attributes:
+        path (Path): Output file.
+        chunk_size (int): Number of records buffered between writes.
+        count (int): Number of records written to the file.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 4096) -> None:
+        """Creates the output file with an empty array.
+
+        Args:
+            path (Path): Output file, overwritten if it exists.
+            chunk_size (int, optional): Number of records buffered
+            between writes. Defaults to 4096.
+        """
+        assert chunk_size > 0, "Chunk size must be positive."
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._buffer = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._buffered = 0
+        self._file = open(self.path, "wb")  # pylint: disable=consider-using-with
+        self._write_header()
+
+    def _write_header(self) -> None:
+        """Writes the header for the current record count at the file start."""
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(RECORD_DTYPE),
+                "fortran_order": False,
+                "shape": (self.count,),
+            }
+        )
+        # Version 1.0 magic string then a two byte header length.
+        length = HEADER_SIZE - len(np.lib.format.magic(1, 0)) - 2
+        assert len(header) < length, "Header does not fit the reserved space."
+        self._file.seek(0)
+        self._file.write(np.lib.format.magic(1, 0))
+        self._file.write(length.to_bytes(2, "little"))
+        self._file.write(header.ljust(length - 1).encode("latin1") + b"\n")
+        self._file.seek(0, 2)
+
+    def append(
+        self,
+        state: tuple[float, ...],
+        action: int,
+        next_state: tuple[float, ...],
+        reward: float,
+        terminal: bool,
+    ) -> None:
+        """Adds a transition, writing the buffer out if it is full.
+
+        Args:
+            state (tuple[float, ...]): State before the step.
+            action (int): Action taken.
+            next_state (tuple[float, ...]): State after the step.
+            reward (float): Reward received.
+            terminal (bool): Whether the step ended the episode.
+        """
+        self._buffer[self._buffered] = (state, action, next_state, reward, terminal)
+        self._buffered += 1
+        if self._buffered == self.chunk_size:
+            self.flush()
 
+    def flush(self) -> None:
+        """Appends the buffered records to the file and updates its header."""
+        if self._buffered == 0:
+            return
+        self._file.write(self._buffer[: self._buffered].tobytes())
+        # Records must reach the file before the header counts them.
+        self._file.flush()
+        self.count += self._buffered
+        self._buffered = 0
+        self._write_header()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flushes any buffered records and closes the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "RolloutWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_rollout(path: Path) -> np.ndarray:
+    """Opens a rollout file memory-mapped.
+
+    Safe to call while the rollout is still being written; the result
+    holds the records flushed so far.
+
+    Args:
+        path (Path): File written by `RolloutWriter`.
+
+    Returns:
+        np.ndarray: Structured array of `RECORD_DTYPE` records.
+    """
+    return np.load(path, mmap_mode="r")
+
+
+def _write_rollout(
+    config_path: Path,
+    num_steps: int,
+    seed: int | float | str | bytes | bytearray | None,
+    output: Path,
+    chunk_size: int,
+) -> None:
+    """Runs one environment with a random policy and streams its transitions.
+
+    Args:
+        config_path (Path): Path to a PynBall TOML config.
+        num_steps (int): Number of steps to rollout.
+        seed (int | float | str | bytes | bytearray | None): Seed for RNG.
+        output (Path): File to write.
+        chunk_size (int): Number of transitions buffered between writes.
+    """
+    env = PynBall(Path(config_path))
+    # Seed after construction, PynBall seeds the RNG from its config.
+    random.seed(seed)
+    s1 = env.reset()
+    with RolloutWriter(output, chunk_size) as writer:
+        for _ in range(num_steps):
+            a = random.choice(env.action_space)
+            s2, r, terminal, _ = env.step(a)
+            writer.append(s1, a, s2, r, terminal)
+            s1 = s2
+            if terminal:
+                s1 = env.reset()
 
 
 def rollout(
     config_file: str,
     num_steps: int,
     seed: int | float | str | bytes | bytearray | None = None,
+    output: Path = Path("rollout.npy"),
+    chunk_size: int = 4096,
 ):
     """Generate a rollout in the pynball environment.
 
+    Transitions are streamed to `output` as they are generated, so
+    memory use does not grow with `num_steps`. Load the result with
+    `read_rollout` or `np.load`.
+
     Args:
         config (str): config file to use
         num_steps (int): Number of steps to rollout.
         seed (int | float | str | bytes | bytearray | None, optional): Seed for RNG. Defaults to None.
+        output (Path, optional): File to write. Defaults to rollout.npy.
+        chunk_size (int, optional): Number of transitions buffered
+        between writes. Defaults to 4096.
     """
+    config = importlib.resources.files("pynball_rl.configs") / config_file
+    _write_rollout(Path(config), num_steps, seed, output, chunk_size)
 
-    random.seed(seed)
-    replay_buffer = {
-        "state": [],
-        "action": [],
-        "next_state": [],
-        "reward": [],
-        "terminal": [],
+
+def parallel_rollout(
+    config_file: str,
+    num_steps: int,
+    num_shards: int,
+    seed: int | None = None,
+    output_dir: Path = Path("rollout"),
+    workers: int | None = None,
+    chunk_size: int = 4096,
+) -> dict:
+    """Generate a rollout split into shards run across a process pool.
+
+    Shard `k` gets `num_steps // num_shards` steps, plus one for the
+    first `num_steps % num_shards` shards, and an independent seed
+    spawned from `np.random.SeedSequence(seed)`. Each shard is written to
+    `shard-{k}.npy` in `output_dir`, alongside a `manifest.json`
+    describing the run. Rerunning with the same seed and number of
+    shards reproduces every file byte for byte, whatever the number of
+    workers.
+
+    Args:
+        config_file (str): config file to use
+        num_steps (int): Total number of steps to rollout.
+        num_shards (int): Number of shards.
+        seed (int | None, optional): Master seed. If None fresh entropy is
+        drawn and recorded in the manifest. Defaults to None.
+        output_dir (Path, optional): Directory to write. Defaults to rollout.
+        workers (int | None, optional): Number of processes. Defaults to
+        the number of CPUs.
+        chunk_size (int, optional): Number of transitions buffered
+        between writes. Defaults to 4096.
+
+    Returns:
+        dict: The manifest.
+    """
+    assert num_shards > 0, "Number of shards must be positive."
+    config = Path(importlib.resources.files("pynball_rl.configs") / config_file)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    seed_sequence = np.random.SeedSequence(seed)
+    shard_seeds = [
+        int.from_bytes(child.generate_state(4).tobytes(), "little")
+        for child in seed_sequence.spawn(num_shards)
+    ]
+    base, extra = divmod(num_steps, num_shards)
+    shard_steps = [base + (k < extra) for k in range(num_shards)]
+    outputs = [output_dir / f"shard-{k}.npy" for k in range(num_shards)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        list(
+            pool.map(
+                _write_rollout,
+                [config] * num_shards,
+                shard_steps,
+                shard_seeds,
+                outputs,
+                [chunk_size] * num_shards,
+            )
+        )
+
+    manifest = {
+        "config": config_file,
+        "config_hash": config_hash(PynBall(config).config),
+        "num_steps": num_steps,
+        "seed_entropy": seed_sequence.entropy,
+        "record_dtype": np.lib.format.dtype_to_descr(RECORD_DTYPE),
+        "shards": [
+            {
+                "file": output.name,
+                "num_steps": steps,
+                "seed": shard_seed,
+                "sha256": hashlib.sha256(output.read_bytes()).hexdigest(),
+            }
+            for output, steps, shard_seed in zip(outputs, shard_steps, shard_seeds)
+        ],
     }
-    config = importlib.resources.files("pynball_rl.configs") / config_file
-    env = PynBall(Path(config))
-    s1 = env.reset()
-    for _ in range(num_steps):
-        a = random.choice(env.action_space)
-        s2, r, terminal, _ = env.step(a)
-        transition = {
-            "state": s1,
-            "action": a,
-            "next_state": s2,
-            "reward": r,
-            "terminal": terminal,
-        }
-        for key, value in transition.items():
-            replay_buffer[key].append(value)
-        s1 = s2
-        if terminal:
-            s1 = env.reset()
-    with open("rollout.json", "w", encoding="utf8") as f:
-        json.dump(replay_buffer, f)
+    with open(output_dir / "manifest.json", "w", encoding="utf8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main() -> None:
+    """Command line entry point: `python -m pynball_rl.rollout`."""
+    parser = argparse.ArgumentParser(
+        description="Generate a random-policy rollout in PynBall."
+    )
+    parser.add_argument(
+        "config", nargs="?", default="four_rooms_2d_config.toml", help="Config file."
+    )
+    parser.add_argument("num_steps", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--shards", type=int, default=None, help="Split the rollout into shards."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processes for sharded rollouts."
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+    if args.shards is None:
+        output = args.output or Path("rollout.npy")
+        rollout(args.config, args.num_steps, args.seed, output)
+    else:
+        output = args.output or Path("rollout")
+        parallel_rollout(
+            args.config, args.num_steps, args.shards, args.seed, output, args.workers
+        )
 
 
 if __name__ == "__main__":
-    rollout("four_rooms_config.toml", 1_000_000, None)
+    main()
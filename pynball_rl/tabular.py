@@ -0,0 +1,296 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from pynball_rl.distance_field import signed_distance
+from pynball_rl.pynball_env import PynBall
+from pynball_rl.utils import config_hash, contact_slack
+from pynball_rl.vec_pynball_env import VecPynBall
+
+VELOCITY_RANGE = (-1.0, 1.0)
+# Name and dtype of the arrays of a model.
+OUTPUTS = (("next_state", np.int32), ("reward", np.float32), ("terminal", bool))
+
+
+class TransitionTable:
+    """A precomputed tabular model of a deterministic PynBall config.
+
+    The state space is discretised into a uniform grid of `bins` cells
+    over `(x, y, xdot, ydot)`, with positions covering the unit board
+    and velocities covering `[-1, 1]`. Only position cells in free space
+    are kept. Each state is represented by its cell centre, and the
+    model holds the result of `PynBall.step` from every state under every
+    action.
+
+    The model is stored as a directory of `.npy` files that are loaded
+    memory-mapped, so opening even a large model is near instant.
+
+    Attributes:
+        path (Path): Directory holding the model.
+        bins (tuple[int, int, int, int]): Number of cells along each of
+        `(x, y, xdot, ydot)`.
+        actions (tuple[int, ...]): Actions of the action axis.
+        config_hash (str): Hash of the config the model was built from,
+        see `utils.config_hash`.
+        position_index (np.ndarray): `(bins[0] * bins[1],)` rank of each
+        position cell among the free cells, or -1 if it is not free.
+        next_state (np.ndarray): `(num_states, num_actions)` index of the
+        next state, or -1 if it falls outside the modelled states.
+        reward (np.ndarray): `(num_states, num_actions)` rewards.
+        terminal (np.ndarray): `(num_states, num_actions)` terminal flags.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Opens a model built by `build`.
+
+        Args:
+            path (Path): Directory holding the model.
+        """
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.bins = tuple(meta["bins"])
+        self.actions = tuple(meta["actions"])
+        self.config_hash: str = meta["config_hash"]
+        self.position_index = np.load(self.path / "position_index.npy", mmap_mode="r")
+        self.next_state = np.load(self.path / "next_state.npy", mmap_mode="r")
+        self.reward = np.load(self.path / "reward.npy", mmap_mode="r")
+        self.terminal = np.load(self.path / "terminal.npy", mmap_mode="r")
+
+    @property
+    def num_states(self) -> int:
+        """Number of modelled states."""
+        return self.next_state.shape[0]
+
+    @property
+    def num_actions(self) -> int:
+        """Number of actions."""
+        return self.next_state.shape[1]
+
+    @classmethod
+    def build(
+        cls,
+        config_path: Path,
+        path: Path,
+        bins: tuple[int, int, int, int] = (20, 20, 5, 5),
+        exploration: bool = False,
+        workers: int = 1,
+        chunk_size: int = 256,
+    ) -> "TransitionTable":
+        """Simulates every state and action of a config and saves the model.
+
+        States are stepped in batches with the `VecPynBall` kernel, split
+        across `workers` processes that write straight into the
+        memory-mapped output.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config with zero
+            `stddev_x` and `stddev_y`.
+            path (Path): Directory to write the model to.
+            bins (tuple[int, int, int, int], optional): Number of cells
+            along each of `(x, y, xdot, ydot)`. Defaults to (20, 20, 5, 5).
+            exploration (bool, optional): If True, reaching the target is
+            not terminal. Defaults to False.
+            workers (int, optional): Number of processes. Defaults to 1.
+            chunk_size (int, optional): Number of states stepped per
+            batch. Defaults to 256.
+
+        Raises:
+            ValueError: The config has impulse noise.
+
+        Returns:
+            TransitionTable: The model.
+        """
+        env = PynBall(config_path, exploration)
+        if env.stddev_x != 0.0 or env.stddev_y != 0.0:
+            raise ValueError(
+                "A tabular model requires a config with zero stddev_x and stddev_y."
+            )
+        assert len(bins) == 4, "Expected four bin counts."
+        assert all(n > 0 for n in bins), "Bin counts must be positive."
+
+        # A cell is free if a ball at its centre, which stands in for
+        # every state in the cell, touches no obstacle. Contact is judged
+        # as `line_intersect` does, so tangent balls are not free.
+        nx, ny, _, _ = bins
+        centres_x = (np.arange(nx) + 0.5) / nx
+        centres_y = (np.arange(ny) + 0.5) / ny
+        xs, ys = np.meshgrid(centres_x, centres_y, indexing="ij")
+        radius = env.config["ball"]["radius"]
+        distance = signed_distance(env.edge_table, xs.ravel(), ys.ravel())
+        slack = contact_slack(radius, float(env.edge_table.sq_length.min()))
+        free = distance > radius + slack
+        position_index = np.full(nx * ny, -1, dtype=np.int32)
+        position_index[free] = np.arange(int(free.sum()), dtype=np.int32)
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        actions = tuple(env.action_space)
+        num_states = int(free.sum()) * bins[2] * bins[3]
+        shape = (num_states, len(actions))
+        np.save(path / "position_index.npy", position_index)
+        for name, dtype in OUTPUTS:
+            np.lib.format.open_memmap(
+                path / f"{name}.npy", mode="w+", dtype=dtype, shape=shape
+            ).flush()
+
+        chunks = [
+            (lo, min(lo + chunk_size, num_states))
+            for lo in range(0, num_states, chunk_size)
+        ]
+        args = (Path(config_path), path, tuple(bins), exploration)
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                jobs = [pool.submit(_build_chunk, *args, lo, hi) for lo, hi in chunks]
+                for job in jobs:
+                    job.result()
+        else:
+            for lo, hi in chunks:
+                _build_chunk(*args, lo, hi)
+
+        with open(path / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "bins": list(bins),
+                    "actions": list(actions),
+                    "config_hash": config_hash(env.config),
+                    "exploration": exploration,
+                },
+                f,
+            )
+        return cls(path)
+
+    def state_index(self, states: np.ndarray) -> np.ndarray:
+        """Maps continuous states to the index of the cell containing them.
+
+        Args:
+            states (np.ndarray): `(n, 4)` or `(4,)` ball states.
+
+        Returns:
+            np.ndarray: State indices, -1 for states outside the modelled
+            free space.
+        """
+        return _state_index(np.asarray(self.position_index), self.bins, states)
+
+    def states(self, indices: np.ndarray) -> np.ndarray:
+        """Gets the cell-centre state each index represents.
+
+        Args:
+            indices (np.ndarray): State indices.
+
+        Returns:
+            np.ndarray: `(..., 4)` representative states.
+        """
+        position_index = np.asarray(self.position_index)
+        return _cell_centres(position_index, self.bins, np.asarray(indices))
+
+
+def _state_index(
+    position_index: np.ndarray, bins: tuple[int, ...], states: np.ndarray
+) -> np.ndarray:
+    """See `TransitionTable.state_index`."""
+    states = np.asarray(states, dtype=float)
+    nx, ny, nvx, nvy = bins
+    low, high = VELOCITY_RANGE
+    i = np.clip(np.floor(states[..., 0] * nx), 0, nx - 1).astype(np.intp)
+    j = np.clip(np.floor(states[..., 1] * ny), 0, ny - 1).astype(np.intp)
+    u = (states[..., 2] - low) / (high - low)
+    v = (states[..., 3] - low) / (high - low)
+    k = np.clip(np.floor(u * nvx), 0, nvx - 1).astype(np.intp)
+    m = np.clip(np.floor(v * nvy), 0, nvy - 1).astype(np.intp)
+    rank = position_index[i * ny + j]
+    return np.where(rank < 0, -1, (rank * nvx + k) * nvy + m)
+
+
+def _cell_centres(
+    position_index: np.ndarray, bins: tuple[int, ...], indices: np.ndarray
+) -> np.ndarray:
+    """See `TransitionTable.states`."""
+    nx, ny, nvx, nvy = bins
+    low, high = VELOCITY_RANGE
+    positions = np.flatnonzero(position_index >= 0)
+    rank, velocity = np.divmod(indices, nvx * nvy)
+    k, m = np.divmod(velocity, nvy)
+    i, j = np.divmod(positions[rank], ny)
+    return np.stack(
+        [
+            (i + 0.5) / nx,
+            (j + 0.5) / ny,
+            low + (k + 0.5) * (high - low) / nvx,
+            low + (m + 0.5) * (high - low) / nvy,
+        ],
+        axis=-1,
+    )
+
+
+def _build_chunk(
+    config_path: Path,
+    path: Path,
+    bins: tuple[int, ...],
+    exploration: bool,
+    lo: int,
+    hi: int,
+) -> None:
+    """Simulates states `lo` to `hi` under every action and writes the results.
+
+    Args:
+        config_path (Path): Path to the PynBall TOML config.
+        path (Path): Directory of the model being built.
+        bins (tuple[int, ...]): Number of cells along each state dimension.
+        exploration (bool): If True, reaching the target is not terminal.
+        lo (int): First state index.
+        hi (int): One past the last state index.
+    """
+    vec = VecPynBall(config_path, num_envs=1, exploration=exploration)
+    position_index = np.load(path / "position_index.npy")
+    next_state = np.load(path / "next_state.npy", mmap_mode="r+")
+    reward = np.load(path / "reward.npy", mmap_mode="r+")
+    terminal = np.load(path / "terminal.npy", mmap_mode="r+")
+
+    states = _cell_centres(position_index, bins, np.arange(lo, hi))
+    for column, action in enumerate(vec.action_space):
+        # Zero noise, so the impulse is the action's nominal thrust.
+        impulses = np.broadcast_to(vec.IMPULSES[action], (hi - lo, 2))
+        penalty = PynBall.NOP_PENALTY if action == 4 else PynBall.THRUST_PENALTY
+        rewards = np.full(hi - lo, penalty)
+        next_states, rewards, terminals = vec.integrate(states, impulses, rewards)
+        next_state[lo:hi, column] = _state_index(position_index, bins, next_states)
+        reward[lo:hi, column] = rewards
+        terminal[lo:hi, column] = terminals
+    for array in (next_state, reward, terminal):
+        array.flush()
+
+
+def main() -> None:
+    """Command line entry point: `python -m pynball_rl.tabular`."""
+    parser = argparse.ArgumentParser(
+        description="Build a tabular transition model of a PynBall config."
+    )
+    parser.add_argument("config", type=Path, help="Path to a PynBall TOML config.")
+    parser.add_argument("output", type=Path, help="Directory to write the model to.")
+    parser.add_argument(
+        "--bins",
+        type=int,
+        nargs=4,
+        default=(20, 20, 5, 5),
+        metavar=("X", "Y", "XDOT", "YDOT"),
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--exploration", action="store_true")
+    args = parser.parse_args()
+    table = TransitionTable.build(
+        args.config,
+        args.output,
+        tuple(args.bins),
+        args.exploration,
+        args.workers,
+        args.chunk_size,
+    )
+    size = f"{table.num_states} states x {table.num_actions} actions"
+    print(f"{size} written to {table.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import math
 from pynball_rl.obstacle import Obstacle
 from pynball_rl.ball import Ball
 from pynball_rl.point import Point
@@ -44,9 +45,9 @@ class Target(Obstacle):
         Returns:
             bool: True if there has been a collision, False otherwise.
         """
-        return self.get_center().distance_to(ball.get_center()) < (
-            self.radius + ball.radius
-        )
+        dx = ball.x - self.point.x
+        dy = ball.y - self.point.y
+        return math.sqrt(dx * dx + dy * dy) < (self.radius + ball.radius)
 
     def inside(self, point: Point) -> bool:
         """Determine whether a point is inside the target.
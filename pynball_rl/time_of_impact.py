@@ -0,0 +1,110 @@
+import math
+
+# Contacts closer together than this are treated as simultaneous.
+TIME_TOLERANCE = 1e-12
+
+
+def segment_time_of_impact(
+    x: float,
+    y: float,
+    ux: float,
+    uy: float,
+    radius: float,
+    edge: tuple[float, ...],
+) -> float:
+    """Finds when a moving circle first touches the interior of an edge.
+
+    The circle centre moves along `(x, y) + t * (ux, uy)` for `t` in
+    `[0, 1]`. Contact happens when the distance from the centre to the
+    infinite line through the edge equals the radius while the circle
+    approaches the line, and the contact point lies on the edge.
+    Contacts with the edge end points are handled by
+    `circle_time_of_impact`.
+
+    Args:
+        x (float): X coordinate of the circle centre.
+        y (float): Y coordinate of the circle centre.
+        ux (float): X displacement over the interval.
+        uy (float): Y displacement over the interval.
+        radius (float): Circle radius.
+        edge (tuple[float, ...]): Compiled edge geometry, see
+        `polygon_obstacle.compile_edge`.
+
+    Returns:
+        float: Time of impact in `[0, 1]`, or `math.inf` if the circle
+        does not touch the edge.
+    """
+    p1x, p1y, dx, dy, a, nx, ny = edge
+    height = (x - p1x) * nx + (y - p1y) * ny
+    approach = ux * nx + uy * ny
+    if height < 0.0:
+        # Work on the side of the edge the ball is on.
+        height, approach = -height, -approach
+    if approach >= 0.0:
+        return math.inf
+    t = max(0.0, (height - radius) / -approach)
+    if t > 1.0:
+        return math.inf
+    projection = ((x + t * ux - p1x) * dx + (y + t * uy - p1y) * dy) / a
+    return t if 0.0 <= projection <= 1.0 else math.inf
+
+
+def circle_time_of_impact(
+    x: float,
+    y: float,
+    ux: float,
+    uy: float,
+    radius: float,
+    cx: float,
+    cy: float,
+) -> float:
+    """Finds when a moving point first comes within `radius` of a fixed point.
+
+    Solves `|(x, y) + t * (ux, uy) - (cx, cy)| = radius` for the
+    smallest root in `[0, 1]`. Used for ball-versus-vertex contacts
+    and for entering the target.
+
+    Args:
+        x (float): X coordinate of the moving point.
+        y (float): Y coordinate of the moving point.
+        ux (float): X displacement over the interval.
+        uy (float): Y displacement over the interval.
+        radius (float): Contact distance.
+        cx (float): X coordinate of the fixed point.
+        cy (float): Y coordinate of the fixed point.
+
+    Returns:
+        float: Time of impact in `[0, 1]`, or `math.inf` if the points
+        never come within `radius` while approaching.
+    """
+    wx = x - cx
+    wy = y - cy
+    b = wx * ux + wy * uy
+    if b >= 0.0:
+        # Moving away from the point.
+        return math.inf
+    c = wx * wx + wy * wy - radius * radius
+    if c <= 0.0:
+        return 0.0
+    a = ux * ux + uy * uy
+    discriminant = b * b - a * c
+    if discriminant < 0.0:
+        return math.inf
+    t = c / (-b + math.sqrt(discriminant))
+    return t if t <= 1.0 else math.inf
+
+
+def reflect(xdot: float, ydot: float, nx: float, ny: float) -> tuple[float, float]:
+    """Reflects a velocity about a unit normal.
+
+    Args:
+        xdot (float): X velocity.
+        ydot (float): Y velocity.
+        nx (float): X component of the unit normal.
+        ny (float): Y component of the unit normal.
+
+    Returns:
+        tuple[float, float]: The reflected velocity.
+    """
+    dot = xdot * nx + ydot * ny
+    return xdot - nx * 2 * dot, ydot - ny * 2 * dot
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a `TransitionCache`, as for `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TransitionCache:
+    """A bounded least-recently-used cache of `PynBall.step` results.
+
+    Entries are keyed by the ball state quantised to `precision`, the
+    action, and the settings the dynamics depend on, so states that
+    differ by less than `precision` share a cached transition.
+
+    Attributes:
+        maxsize (int): Maximum number of cached transitions.
+        precision (float): Quantisation step of the state variables.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not in the cache.
+    """
+
+    def __init__(self, maxsize: int = 100_000, precision: float = 1e-6) -> None:
+        """Creates an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of cached transitions.
+            Defaults to 100_000.
+            precision (float, optional): Quantisation step of the state
+            variables. Defaults to 1e-6.
+        """
+        assert maxsize > 0, "Cache size must be positive."
+        assert precision > 0.0, "Precision must be positive."
+        self.maxsize = maxsize
+        self.precision = precision
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[Hashable, tuple] = OrderedDict()
+
+    def key(
+        self,
+        state: tuple[float, float, float, float],
+        action: int,
+        noise: Hashable = None,
+        settings: Hashable = None,
+    ) -> tuple:
+        """Builds the cache key of a transition.
+
+        Args:
+            state (tuple[float, float, float, float]): Ball state.
+            action (int): Action taken.
+            noise (Hashable, optional): Fixed noise sample the transition
+            is computed with, if any. Defaults to None.
+            settings (Hashable, optional): Environment settings the
+            transition depends on, e.g. the integrator. Defaults to None.
+
+        Returns:
+            tuple: The key.
+        """
+        scale = 1.0 / self.precision
+        x, y, xdot, ydot = state
+        return (
+            round(x * scale),
+            round(y * scale),
+            round(xdot * scale),
+            round(ydot * scale),
+            action,
+            noise,
+            settings,
+        )
+
+    def get(self, key: Hashable) -> tuple | None:
+        """Looks up a transition, marking it as most recently used.
+
+        Args:
+            key (Hashable): Key from `key`.
+
+        Returns:
+            tuple | None: The cached transition, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, transition: tuple) -> None:
+        """Stores a transition, evicting the least recently used if full.
+
+        Args:
+            key (Hashable): Key from `key`.
+            transition (tuple): The transition to store.
+        """
+        self._entries[key] = transition
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        """Gets hit and miss statistics.
+
+        Returns:
+            CacheInfo: The statistics.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """Empties the cache and resets the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
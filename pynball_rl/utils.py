@@ -1,4 +1,10 @@
+import hashlib
+import json
 import math
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable
 
 
 def clip(value: float, low: float = 0.0, high: float = 1.0) -> float:
@@ -37,3 +43,61 @@ def clip_if_close(value: float, low: float = 0.0, high: float = 1.0) -> float:
     if math.isclose(value, high, abs_tol=1e-12):
         return high
     return value
+
+
+def contact_slack(radius: float, sq_length: float) -> float:
+    """Bounds how far beyond `radius` `line_intersect` may report contact.
+
+    `line_intersect` accepts `c` and the discriminant within 1e-12 of
+    zero, so a ball may be reported touching an edge of squared length
+    `sq_length` from slightly further away than its radius. Spatial
+    queries grow their search radius by this amount to stay exact.
+
+    Args:
+        radius (float): Ball radius.
+        sq_length (float): Squared length of the shortest edge considered.
+
+    Returns:
+        float: Upper bound on the excess distance, including a small
+        margin for rounding.
+    """
+    return 1e-9 + (1e-12 + 2.5e-13 / sq_length) / (2 * radius)
+
+
+def atomic_write(path: Path, write: Callable[[BinaryIO], None]) -> None:
+    """Writes a file through a temporary file renamed into place.
+
+    Concurrent writers, in this or other processes, each write their own
+    uniquely named temporary file, and readers never see a partial file.
+
+    Args:
+        path (Path): File to write. Its directory is created if missing.
+        write (Callable[[BinaryIO], None]): Writes the contents to an
+        open binary file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        partial = Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            partial.unlink()
+            raise
+    os.replace(partial, path)
+
+
+def config_hash(config: dict) -> str:
+    """Hashes a parsed config, e.g. to key cached data built from it.
+
+    Args:
+        config (dict): Configuration parameters.
+
+    Returns:
+        str: Hex digest that changes whenever the config changes.
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
@@ -0,0 +1,442 @@
+from pathlib import Path
+from typing import Callable
+import numpy as np
+from pynball_rl.pynball_env import PynBall
+
+
+def _in_unit_interval(t: np.ndarray) -> np.ndarray:
+    """Vectorised `0 <= clip_if_close(t) <= 1`.
+
+    Args:
+        t (np.ndarray): Values to test.
+
+    Returns:
+        np.ndarray: Boolean mask, True where `t` lies on the edge.
+    """
+    near_one = np.abs(t - 1.0) <= np.maximum(1e-9 * np.maximum(np.abs(t), 1.0), 1e-12)
+    return (np.abs(t) <= 1e-12) | ((t >= 0.0) & (t <= 1.0)) | near_one
+
+
+class VecPynBall:
+    """A batch of independent Pinball games stepped together with NumPy.
+
+    Ball states are held as a `(num_envs, 4)` array of
+    `(x, y, xdot, ydot)` rows and every inner step is evaluated for all
+    balls against all obstacle edges at once. The physics mirrors
+    `PynBall.step` operation for operation, so for the same state,
+    action and impulse each row matches the scalar environment.
+
+    Finished episodes are reset automatically at the end of `step`, so
+    the batch never stalls.
+
+    Attributes:
+        env (PynBall): Scalar environment the board is loaded from.
+        edge_table (EdgeTable): Compiled geometry of all obstacle edges.
+        edge_grid (EdgeGrid): Uniform grid over the obstacle edges.
+        num_envs (int): Number of balls in the batch.
+        step_duration (int): The number of inner-steps per step.
+        drag (float): Drag factor applied to each ball each step.
+        radius (float): Radius of every ball.
+        states (np.ndarray): Current `(num_envs, 4)` ball states.
+        rng (np.random.Generator): Generator for impulse noise and
+        start locations.
+        reset_flag (bool): Tracks whether the environment has been reset.
+    """
+
+    IMPULSES = np.array([PynBall.ACTION_DICT[a] for a in range(5)])
+
+    def __init__(
+        self,
+        config_path: Path,
+        num_envs: int,
+        exploration: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        """Loads the board and allocates the batch.
+
+        Args:
+            config_path (Path): Path to a PynBall TOML config.
+            num_envs (int): Number of balls to step together.
+            exploration (bool, optional): If True, reaching the target is
+            not terminal. Defaults to False.
+            seed (int | None, optional): Seed for the batch RNG. If None
+            the config seed is used. Defaults to None.
+        """
+        self._setup(PynBall(config_path, exploration), num_envs, seed)
+
+    @classmethod
+    def from_env(
+        cls, env: PynBall, num_envs: int = 0, seed: int | None = None
+    ) -> "VecPynBall":
+        """Creates a batch sharing the board of an existing environment.
+
+        Unlike the constructor, this neither loads a config nor reseeds
+        the `random` module.
+
+        Args:
+            env (PynBall): Environment to take the board from.
+            num_envs (int, optional): Number of balls to step together.
+            Defaults to 0, for use through `transition` and `integrate`
+            only.
+            seed (int | None, optional): Seed for the batch RNG. If None
+            the config seed is used. Defaults to None.
+
+        Returns:
+            VecPynBall: The batch.
+        """
+        vec = cls.__new__(cls)
+        vec._setup(env, num_envs, seed)  # pylint: disable=protected-access
+        return vec
+
+    def _setup(self, env: PynBall, num_envs: int, seed: int | None) -> None:
+        """Allocates the batch for the board of an environment.
+
+        Args:
+            env (PynBall): Scalar environment the board is loaded from.
+            num_envs (int): Number of balls to step together.
+            seed (int | None): Seed for the batch RNG. If None the config
+            seed is used.
+        """
+        self.env = env
+        if self.env.integrator == "continuous":
+            raise ValueError("VecPynBall does not support the continuous integrator.")
+        self.num_envs = num_envs
+        self.exploration = env.exploration
+        self.config = self.env.config
+        self.step_duration = self.env.step_duration
+        self.drag = self.env.drag
+        self.stddev = np.array([self.env.stddev_x, self.env.stddev_y])
+        self.action_space = self.env.action_space
+        self.radius: float = self.config["ball"]["radius"]
+        self.starts = np.array(self.config["ball"]["starts"], dtype=float)
+        self.target = np.array([self.env.target.point.x, self.env.target.point.y])
+        self.target_radius: float = self.env.target.radius
+        self.rng = np.random.default_rng(
+            self.config.get("seed", 42) if seed is None else seed
+        )
+
+        self.edge_table = self.env.edge_table
+        self.edge_grid = self.env.edge_grid
+        self.states = np.zeros((num_envs, 4))
+        self.reset_flag: bool = False
+
+    def reset(self, starting_states: np.ndarray | None = None) -> np.ndarray:
+        """Resets every ball in the batch.
+
+        Args:
+            starting_states (np.ndarray | None, optional): `(num_envs, 4)`
+            states to reset to. If None, each ball is placed at rest at a
+            random start location from the config. Defaults to None.
+
+        Returns:
+            np.ndarray: Current `(num_envs, 4)` states.
+        """
+        if starting_states is None:
+            self._reset_balls(np.ones(self.num_envs, dtype=bool))
+        else:
+            states = np.array(starting_states, dtype=float)
+            self.states = states.reshape(self.num_envs, 4)
+        self.reset_flag = True
+        return self.states.copy()
+
+    def _reset_balls(self, mask: np.ndarray) -> None:
+        """Places the masked balls at rest at random start locations.
+
+        Args:
+            mask (np.ndarray): Boolean mask of balls to reset.
+        """
+        n = int(mask.sum())
+        self.states[mask, :2] = self.starts[self.rng.integers(len(self.starts), size=n)]
+        self.states[mask, 2:] = 0.0
+
+    def step(self, actions: np.ndarray) -> tuple:
+        """Advances every environment in the batch one timestep.
+
+        Balls that reach the target are reset to a start location before
+        returning. Their final states are reported in `info`.
+
+        Args:
+            actions (np.ndarray): `(num_envs,)` integer actions.
+
+        Returns:
+            tuple: (states, rewards, terminals, info) where info is a dict
+            holding the pre-reset states under "final_state".
+        """
+        assert self.reset_flag is True, "Environment requires resetting."
+        next_states, rewards, terminals = self.transition(self.states, actions)
+        self.states = next_states
+        info = {"final_state": next_states.copy()}
+        if terminals.any():
+            self._reset_balls(terminals)
+        return self.states.copy(), rewards, terminals, info
+
+    def step_repeat(self, actions: np.ndarray, k: int) -> tuple:
+        """Repeats each environment's action `k` times, or until it terminates.
+
+        Args:
+            actions (np.ndarray): `(num_envs,)` integer actions.
+            k (int): Maximum number of steps.
+
+        Returns:
+            tuple: (states, rewards, steps, terminals, info), see
+            `run_option`.
+        """
+        assert k > 0, "Number of repeats must be positive."
+        return self.run_option(np.asarray(actions), max_steps=k)
+
+    def run_option(
+        self,
+        policy: np.ndarray | Callable[[np.ndarray], np.ndarray],
+        terminate: Callable[[np.ndarray], np.ndarray] | None = None,
+        max_steps: int | None = None,
+    ) -> tuple:
+        """Runs an option in every environment until its termination condition holds.
+
+        Environments whose option has ended wait for the others, and only
+        the running environments are stepped. An option ends after a step
+        whose next state satisfies `terminate`, when its episode ends, or
+        after `max_steps` steps. Balls that reach the target are reset
+        before returning. Their final states are reported in `info`.
+
+        Args:
+            policy (np.ndarray | Callable[[np.ndarray], np.ndarray]): Maps
+            `(m, 4)` states of the running environments to `(m,)`
+            actions, or `(num_envs,)` actions to take in every state.
+            terminate (Callable[[np.ndarray], np.ndarray] | None, optional):
+            Maps `(m, 4)` states to an `(m,)` boolean mask of options that
+            should stop. Defaults to None.
+            max_steps (int | None, optional): Maximum number of steps. If
+            None the options run until they terminate. Defaults to None.
+
+        Returns:
+            tuple: (states, rewards, steps, terminals, info) where rewards
+            are summed over the steps taken, steps counts the steps of
+            each environment and info holds the pre-reset states under
+            "final_state".
+        """
+        assert self.reset_flag is True, "Environment requires resetting."
+        states = self.states.copy()
+        total_rewards = np.zeros(self.num_envs)
+        steps = np.zeros(self.num_envs, dtype=np.int64)
+        terminals = np.zeros(self.num_envs, dtype=bool)
+        running = np.arange(self.num_envs)
+        t = 0
+        while len(running) and (max_steps is None or t < max_steps):
+            t += 1
+            if callable(policy):
+                actions = np.asarray(policy(states[running]))
+            else:
+                actions = policy[running]
+            next_states, rewards, done = self.transition(states[running], actions)
+            states[running] = next_states
+            total_rewards[running] += rewards
+            steps[running] += 1
+            terminals[running] = done
+            if terminate is not None:
+                done = done | np.asarray(terminate(next_states), dtype=bool)
+            running = running[~done]
+
+        self.states = states
+        info = {"final_state": states.copy()}
+        if terminals.any():
+            self._reset_balls(terminals)
+        return self.states.copy(), total_rewards, steps, terminals, info
+
+    def transition(self, states: np.ndarray, actions: np.ndarray) -> tuple:
+        """Computes one timestep for a batch of states without storing them.
+
+        Args:
+            states (np.ndarray): `(n, 4)` ball states.
+            actions (np.ndarray): `(n,)` integer actions.
+
+        Returns:
+            tuple: (next_states, rewards, terminals) arrays.
+        """
+        actions = np.asarray(actions)
+        noop = actions == 4
+        noise = self.rng.normal(
+            self.IMPULSES[actions], self.stddev, size=(len(actions), 2)
+        )
+        impulses = np.where(noop[:, None], 0.0, noise)
+        rewards = np.where(noop, PynBall.NOP_PENALTY, PynBall.THRUST_PENALTY)
+        return self.integrate(states, impulses, rewards)
+
+    def integrate(
+        self, states: np.ndarray, impulses: np.ndarray, rewards: np.ndarray
+    ) -> tuple:
+        """Applies impulses and runs the inner-step loop for a batch of balls.
+
+        Args:
+            states (np.ndarray): `(n, 4)` ball states.
+            impulses (np.ndarray): `(n, 2)` velocity impulses.
+            rewards (np.ndarray): `(n,)` action rewards.
+
+        Raises:
+            RuntimeError: Ball out of bounds error.
+
+        Returns:
+            tuple: (next_states, rewards, terminals) arrays.
+        """
+        states = np.array(states, dtype=float).reshape(-1, 4)
+        x, y, xdot, ydot = states.T.copy()
+        xdot = np.clip(xdot + impulses[:, 0] / 5.0, -1.0, 1.0)
+        ydot = np.clip(ydot + impulses[:, 1] / 5.0, -1.0, 1.0)
+        terminals = np.zeros(len(states), dtype=bool)
+        active = np.arange(len(states))
+
+        for i in range(self.step_duration):
+            x[active] += xdot[active] * self.radius / self.step_duration
+            y[active] += ydot[active] * self.radius / self.step_duration
+            vx, vy = xdot[active], ydot[active]
+            count, first, several = self._collisions(x[active], y[active], vx, vy)
+            reverse = (count > 1) | ((count == 1) & several)
+            reflect = (count == 1) & ~several
+
+            nx, ny = self.edge_table.normal[first].T
+            dot = vx * nx + vy * ny
+            reflected_x = np.where(reflect, vx - nx * 2 * dot, vx)
+            reflected_y = np.where(reflect, vy - ny * 2 * dot, vy)
+            xdot[active] = np.where(reverse, -vx, reflected_x)
+            ydot[active] = np.where(reverse, -vy, reflected_y)
+            if i == self.step_duration - 1:
+                # Add a bonus step to ensure ball bounces away from obstacle.
+                bonus = active[count == 1]
+                x[bonus] += xdot[bonus] * self.radius / self.step_duration
+                y[bonus] += ydot[bonus] * self.radius / self.step_duration
+
+            if not self.exploration:
+                dx = x[active] - self.target[0]
+                dy = y[active] - self.target[1]
+                distance = np.sqrt(dx * dx + dy * dy)
+                done = distance < self.target_radius + self.radius
+                terminals[active[done]] = True
+                active = active[~done]
+                if len(active) == 0:
+                    break
+
+        xdot *= self.drag
+        ydot *= self.drag
+        next_states = np.stack([x, y, xdot, ydot], axis=1)
+        self._check_bounds(next_states)
+        rewards = np.where(terminals, rewards + PynBall.GOAL_REWARD, rewards)
+        return next_states, rewards, terminals
+
+    def _collisions(
+        self, x: np.ndarray, y: np.ndarray, xdot: np.ndarray, ydot: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Classifies the collisions of each ball in an inner step.
+
+        Only edges listed in the grid cells of the balls are tested.
+
+        Args:
+            x (np.ndarray): `(n,)` ball x coordinates.
+            y (np.ndarray): `(n,)` ball y coordinates.
+            xdot (np.ndarray): `(n,)` ball x velocities.
+            ydot (np.ndarray): `(n,)` ball y velocities.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The number of
+            obstacles each ball collides with, the index of the first
+            edge it hits and whether it hits several non-parallel edges
+            of that obstacle.
+        """
+        table = self.edge_table
+        cells = self.edge_grid.cell_indices(x, y)
+        edges = np.flatnonzero(self.edge_grid.cell_masks[cells].any(axis=0))
+        if len(edges) == 0:
+            zeros = np.zeros(len(x), dtype=np.intp)
+            return zeros, zeros, zeros.astype(bool)
+
+        hits = self._edge_hits(x, y, xdot, ydot, edges)
+        owner = table.obstacle[edges]
+        groups = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+        count = np.logical_or.reduceat(hits, groups, axis=1).sum(axis=1)
+        first = edges[hits.argmax(axis=1)]
+        # A single obstacle collision involves several edges if the
+        # ball hits an edge not parallel to the first edge it hits.
+        several = (
+            hits
+            & (owner == table.obstacle[first, None])
+            & (table.parallel_class[edges] != table.parallel_class[first, None])
+        ).any(axis=1)
+        return count, first, several
+
+    def _edge_hits(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        xdot: np.ndarray,
+        ydot: np.ndarray,
+        edges: np.ndarray,
+    ) -> np.ndarray:
+        """Finds the edges each ball collides with.
+
+        Evaluates the bounding box test, `heading_towards` and
+        `line_intersect` of `PolygonObstacle.collision` for every ball
+        and edge pair.
+
+        Args:
+            x (np.ndarray): `(n,)` ball x coordinates.
+            y (np.ndarray): `(n,)` ball y coordinates.
+            xdot (np.ndarray): `(n,)` ball x velocities.
+            ydot (np.ndarray): `(n,)` ball y velocities.
+            edges (np.ndarray): `(k,)` ascending indices of the edges to test.
+
+        Returns:
+            np.ndarray: `(n, k)` boolean mask of colliding edges.
+        """
+        r = self.radius
+        x, y = x[:, None], y[:, None]
+        xdot, ydot = xdot[:, None], ydot[:, None]
+        table = self.edge_table
+        min_x, min_y, max_x, max_y = table.bounds[table.obstacle[edges]].T
+        p1x, p1y = table.start[edges].T
+        dx, dy = table.direction[edges].T
+        sq_length = table.sq_length[edges]
+        outside = (x + r < min_x) | (y + r < min_y) | (x - r > max_x) | (y - r > max_y)
+
+        ex = p1x - x
+        ey = p1y - y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # heading_towards
+            moving = np.sqrt(xdot * xdot + ydot * ydot) != 0.0
+            denominator = xdot * dy - dx * ydot
+            t = (ex * dy - dx * ey) / denominator
+            heading = moving & (denominator != 0.0) & (t > 0.0)
+
+            # line_intersect
+            b = 2 * dx * ex + 2 * dy * ey
+            c = ex * ex + ey * ey - r * r
+            touching = np.abs(c) <= 1e-12
+            discriminant = b * b - 4 * sq_length * c
+            tangential = np.abs(discriminant) <= 1e-12
+            sqrt_discriminant = np.sqrt(discriminant)
+            crossing = (discriminant > 0.0) & (
+                _in_unit_interval((2 * c) / (-b + sqrt_discriminant))
+                | _in_unit_interval((2 * c) / (-b - sqrt_discriminant))
+            )
+            intersect = touching | np.where(
+                tangential, _in_unit_interval((2 * c) / (-b)), crossing
+            )
+
+        return ~outside & heading & intersect
+
+    @staticmethod
+    def _check_bounds(states: np.ndarray) -> None:
+        """Checks that every ball is within the bounds of the game area.
+
+        Args:
+            states (np.ndarray): `(n, 4)` ball states.
+
+        Raises:
+            RuntimeError: Ball out of bounds error.
+        """
+        x, y = states[:, 0], states[:, 1]
+        out = ~((0.0 < x) & (x < 1.0) & (0.0 < y) & (y < 1.0))
+        if out.any():
+            i = int(np.flatnonzero(out)[0])
+            raise RuntimeError(
+                f"Ball {i} out of bounds\n"
+                f"x: {states[i, 0]}\ny: {states[i, 1]}\n"
+                f"vel_x: {states[i, 2]}\nvel_y: {states[i, 3]}"
+            )
@@ -0,0 +1,77 @@
+# pylint: disable=missing-function-docstring
+import asyncio
+import random
+from pathlib import Path
+import pytest
+from pynball_rl import PynBall
+from pynball_rl.async_env import AsyncPynBallPool
+
+CONFIG = Path("pynball_rl/configs/hard_config.toml")
+
+
+def test_step_matches_pynball():
+    async def run():
+        async with AsyncPynBallPool(CONFIG, num_workers=1, seed=3) as pool:
+            env = await pool.make_env()
+            await env.reset()
+            return [await env.step(a % 5) for a in range(40)]
+
+    env = PynBall(CONFIG)
+    random.seed(3)
+    env.reset()
+    assert asyncio.run(run()) == [env.step(a % 5) for a in range(40)]
+
+
+def test_concurrent_rollouts():
+    async def policy(state):
+        await asyncio.sleep(0)
+        return 0 if state[0] < 0.5 else 2
+
+    async def collect(env):
+        return [transition async for transition in env.rollout(policy, max_steps=25)]
+
+    async def run():
+        async with AsyncPynBallPool(CONFIG, num_workers=2) as pool:
+            envs = [await pool.make_env() for _ in range(6)]
+            return await asyncio.gather(*(collect(env) for env in envs))
+
+    episodes = asyncio.run(run())
+    assert len(episodes) == 6
+    for episode in episodes:
+        assert len(episode) == 25
+        for previous, transition in zip(episode, episode[1:]):
+            assert transition["state"] == previous["next_state"]
+    assert episodes[0] == episodes[2]
+
+
+def test_worker_errors_are_raised():
+    async def run():
+        async with AsyncPynBallPool(CONFIG, num_workers=1) as pool:
+            env = await pool.make_env()
+            with pytest.raises(AssertionError):
+                await env.step(0)
+            await env.reset()
+            with pytest.raises(KeyError):
+                await env.step(7)
+
+    asyncio.run(run())
+
+
+def test_dead_worker_fails_pending_requests():
+    async def run():
+        pool = AsyncPynBallPool(CONFIG, num_workers=2)
+        envs = [await pool.make_env() for _ in range(2)]
+        for env in envs:
+            await env.reset()
+        pending = [pool.request(0, 0, "step", 0) for _ in range(2000)]
+        pool._processes[0].terminate()  # pylint: disable=protected-access
+        results = await asyncio.wait_for(
+            asyncio.gather(*pending, return_exceptions=True), timeout=10
+        )
+        assert isinstance(results[-1], BrokenPipeError)
+        with pytest.raises(BrokenPipeError):
+            await envs[0].step(0)
+        assert len(await envs[1].step(0)) == 4
+        await asyncio.wait_for(pool.close(), timeout=10)
+
+    asyncio.run(run())
@@ -46,3 +46,10 @@ def test_impulse(ball):
     assert ball.xdot == 1.0 and ball.ydot == 0.0
     ball.add_impulse(0.0, 2.0)
     assert ball.xdot == 1.0 and ball.ydot == 0.4
+
+
+def test_slots(ball):
+    with pytest.raises(AttributeError):
+        ball.z = 0.0
+    with pytest.raises(AttributeError):
+        ball.get_center().z = 0.0
@@ -0,0 +1,46 @@
+# pylint: disable=missing-function-docstring
+import json
+import sys
+import pytest
+from pynball_rl import PynBall, bench
+
+
+def test_run_benchmarks():
+    configs = [bench._resolve_config("very_easy")]  # pylint: disable=protected-access
+    report = bench.run_benchmarks(
+        configs, num_steps=20, batch_sizes=[1, 4], worker_counts=[1]
+    )
+    result = report["results"]["very_easy_config"]
+    assert result["steps_per_second"] > 0
+    latency = result["latency_us"]
+    assert 0 < latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+    assert result["reset_us"] > 0
+    tests = result["collision_tests_per_step"]
+    assert tests["edges_tested"] >= tests["obstacles_tested"] >= tests["collisions"]
+    assert set(result["integrator_steps_per_second"]) == set(PynBall.INTEGRATORS)
+    assert set(result["batch_steps_per_second"]) == {"1", "4"}
+    assert set(result["pool_steps_per_second"]) == {"1"}
+    shared = result["shared_board"]
+    assert shared["attach_ms"] > 0 and shared["compile_ms"] > 0
+    assert shared["array_bytes"] > 0 and shared["object_bytes"] > 0
+
+
+def test_bundled_configs():
+    names = [path.name for path in bench.bundled_configs()]
+    assert "easy_config.toml" in names
+    assert names == sorted(names)
+
+
+def test_unknown_config():
+    with pytest.raises(ValueError):
+        bench._resolve_config("missing")  # pylint: disable=protected-access
+
+
+def test_main(tmp_path, monkeypatch):
+    output = tmp_path / "bench.json"
+    argv = ["bench", "--configs", "hard_2d", "--steps", "10", "--output", str(output)]
+    monkeypatch.setattr(sys, "argv", argv + ["--batch-sizes", "2", "--workers", "1"])
+    bench.main()
+    report = json.loads(output.read_text())
+    assert report["settings"]["num_steps"] == 10
+    assert list(report["results"]) == ["hard_2d_config"]
@@ -0,0 +1,134 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import pickle
+import pytest
+from pynball_rl import PynBall
+from pynball_rl.board import BOARD_FORMAT, Board, SharedBoard
+
+CONFIG_PATH = Path("pynball_rl/configs/easy_config.toml")
+
+
+class Unloadable:  # pylint: disable=too-few-public-methods
+    """Pickles to a call that raises ValueError when loaded."""
+
+    def __reduce__(self):
+        return int, ("not a number",)
+
+
+@pytest.fixture(name="fresh_cache")
+def fresh_cache_fixture():
+    Board.clear_cache()
+    yield
+    Board.clear_cache()
+
+
+def test_envs_share_board(fresh_cache):  # pylint: disable=unused-argument
+    env_1, env_2 = PynBall(CONFIG_PATH), PynBall(CONFIG_PATH)
+    assert env_1.board is env_2.board
+    assert env_1.edge_grid is env_2.edge_grid
+    for obstacle_1, obstacle_2 in zip(env_1.obstacles, env_2.obstacles):
+        assert obstacle_1 is not obstacle_2
+        assert obstacle_1.edge_geometry is obstacle_2.edge_geometry
+        assert obstacle_1.intersect_edges is not obstacle_2.intersect_edges
+    env_1.config["seed"] = 0
+    assert env_2.config["seed"] == 12345
+
+
+def test_keyed_by_content(tmp_path, fresh_cache):  # pylint: disable=unused-argument
+    copy_path = tmp_path / "copy.toml"
+    copy_path.write_bytes(CONFIG_PATH.read_bytes())
+    assert Board.load(copy_path) is Board.load(CONFIG_PATH)
+    copy_path.write_text(CONFIG_PATH.read_text().replace("12345", "1"))
+    board = Board.load(copy_path)
+    assert board is not Board.load(CONFIG_PATH)
+    assert board.config["seed"] == 1
+
+
+def test_shared_board_trajectories(fresh_cache):  # pylint: disable=unused-argument
+    path = Path("pynball_rl/configs/very_easy_config.toml")
+    env_1, env_2 = PynBall(path), PynBall(path)
+    env_1.fixed_noise = env_2.fixed_noise = (0.0, 0.0)
+    env_1.reset()
+    env_2.reset()
+    actions_1, actions_2 = [0, 1] * 50, [1, 2, 3] * 33
+    interleaved = []
+    for a_1, a_2 in zip(actions_1, actions_2):
+        interleaved.append((env_1.step(a_1), env_2.step(a_2)))
+
+    Board.clear_cache()
+    expected = []
+    for actions in (actions_1, actions_2):
+        env = PynBall(path)
+        env.fixed_noise = (0.0, 0.0)
+        env.reset()
+        expected.append([env.step(a) for a in actions[: len(interleaved)]])
+    assert [pair[0] for pair in interleaved] == expected[0]
+    assert [pair[1] for pair in interleaved] == expected[1]
+
+
+def test_disk_cache(tmp_path, fresh_cache):  # pylint: disable=unused-argument
+    cache_dir = tmp_path / "cache"
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        f'board_cache_dir = "{cache_dir.as_posix()}"\n' + CONFIG_PATH.read_text()
+    )
+    board = Board.load(config_path)
+    path = cache_dir / f"board-{board.key}-v{BOARD_FORMAT}.pkl"
+    assert path.exists()
+
+    Board.clear_cache()
+    loaded = Board.load(config_path)
+    assert loaded is not board
+    assert loaded.config == board.config
+    assert loaded.edge_table.start.tolist() == board.edge_table.start.tolist()
+
+    path.write_bytes(b"corrupt")
+    Board.clear_cache()
+    rebuilt = Board.load(config_path)
+    assert rebuilt.config == board.config
+    assert path.read_bytes() != b"corrupt"
+
+    # Any error while unpickling, not only pickle's own, means a rebuild.
+    unloadable = pickle.dumps(Unloadable())
+    path.write_bytes(unloadable)
+    Board.clear_cache()
+    assert Board.load(config_path).config == board.config
+    assert path.read_bytes() != unloadable
+
+
+def test_cache_is_bounded(tmp_path, fresh_cache):  # pylint: disable=unused-argument
+    boards = []
+    for seed in range(Board.CACHE_SIZE + 1):
+        config_path = tmp_path / f"config_{seed}.toml"
+        config_path.write_text(CONFIG_PATH.read_text().replace("12345", str(seed)))
+        boards.append(Board.load(config_path))
+        if seed == 1:
+            assert Board.load(tmp_path / "config_0.toml") is boards[0]
+    assert Board.load(tmp_path / "config_0.toml") is boards[0]
+    assert Board.load(tmp_path / "config_1.toml") is not boards[1]
+
+
+def test_distance_field_built_once(fresh_cache):  # pylint: disable=unused-argument
+    env_1, env_2 = PynBall(CONFIG_PATH), PynBall(CONFIG_PATH)
+    field = env_1.build_distance_field(16, cache_dir=None)
+    assert env_2.build_distance_field(16, cache_dir=None) is field
+
+
+def test_attach_shared_board(fresh_cache):  # pylint: disable=unused-argument
+    env = PynBall(CONFIG_PATH)
+    field = env.build_distance_field(16, cache_dir=None)
+    with SharedBoard(CONFIG_PATH) as shared:
+        assert shared.board is env.board
+        Board.clear_cache()
+        board = Board.attach(shared.name)
+        assert board is not shared.board
+        assert Board.attach(shared.name) is board
+        assert PynBall(CONFIG_PATH).board is board
+    assert board.config == env.board.config
+    table, original = board.edge_table, env.edge_table
+    assert table.start.tolist() == original.start.tolist()
+    assert not table.start.flags.writeable
+    assert (board.edge_grid.cell_masks == env.edge_grid.cell_masks).all()
+    assert board.edge_grid.cells == env.edge_grid.cells
+    attached_field = board.distance_field(16, cache_dir=None)
+    assert (attached_field.values == field.values).all()
@@ -0,0 +1,72 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import math
+import numpy as np
+import pytest
+from pynball_rl import PynBall, Point
+from pynball_rl.distance_field import SignedDistanceField
+
+
+@pytest.fixture(name="env")
+def env_fixture():
+    return PynBall(Path("pynball_rl/configs/easy_config.toml"))
+
+
+@pytest.fixture(name="field")
+def field_fixture(env):
+    return SignedDistanceField(env.edge_table, resolution=64)
+
+
+def test_sign(env, field):
+    rng = np.random.default_rng(0)
+    for x, y in rng.uniform(0.0, 1.0, size=(200, 2)):
+        inside = any(obstacle.inside(Point(x, y)) for obstacle in env.obstacles)
+        assert (field.distance(x, y) < 0.0) == inside
+
+
+def test_exact_near_boundary(env, field):
+    edge = env.obstacles[0].edge_geometry[0]
+    x, y = edge[0] + 0.5 * edge[2], edge[1] + 0.5 * edge[3]
+    x, y = x + 0.003 * edge[5], y + 0.003 * edge[6]
+    assert math.isclose(abs(field.distance(x, y)), 0.003)
+
+
+def test_lookups_bound_exact_distance(field):
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-0.1, 1.1, size=(500, 2))
+    exact = np.abs(field.exact(points[:, 0], points[:, 1]))
+    for (x, y), d in zip(points, exact):
+        assert field.min_distance(x, y) <= d + 1e-12
+        if 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0:
+            assert abs(abs(field.value(x, y)) - d) <= math.sqrt(2) / 64
+
+
+def test_is_free_matches_exact(field):
+    radius = 3 * field.cell_size
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0.0, 1.0, size=(2000, 2))
+    exact = field.exact(points[:, 0], points[:, 1])
+    for (x, y), d in zip(points, exact):
+        assert field.is_free(x, y, radius) == (d > radius)
+
+
+def test_disk_cache(env, tmp_path):
+    field = SignedDistanceField.load_or_build(env.edge_table, "key", 32, tmp_path)
+    assert (tmp_path / "sdf-key-32.npy").exists()
+    cached = SignedDistanceField.load_or_build(env.edge_table, "key", 32, tmp_path)
+    assert np.array_equal(field.values, cached.values)
+
+
+def test_env_distance_field(tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text(
+        f"sdf_resolution = 32\nsdf_cache_dir = '{tmp_path}'\n"
+        + Path("pynball_rl/configs/easy_config.toml").read_text()
+    )
+    env = PynBall(config)
+    assert env.distance_field is not None
+    assert env.distance_field.resolution == 32
+    assert len(list(tmp_path.glob("sdf-*-32.npy"))) == 1
+    env.build_distance_field(16, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("sdf-*-16.npy"))) == 1
+    assert env.distance_field.is_free(0.2, 0.9, 0.02)
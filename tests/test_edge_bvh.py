@@ -0,0 +1,73 @@
+# pylint: disable=missing-function-docstring
+import math
+from pathlib import Path
+import random
+import pytest
+from pynball_rl import Ball, Point, PolygonObstacle, PynBall
+from pynball_rl.board import Board
+from pynball_rl.edge_bvh import EdgeBVH
+
+
+def star(num_points):
+    points = []
+    for i in range(num_points):
+        radius = 0.3 if i % 2 else 0.15
+        angle = 2 * math.pi * i / num_points
+        x = 0.5 + radius * math.cos(angle)
+        y = 0.5 + radius * math.sin(angle)
+        points.append(Point(x, y))
+    return PolygonObstacle(points)
+
+
+@pytest.fixture(name="obstacle")
+def obstacle_fixture():
+    return star(200)
+
+
+def test_tree_structure(obstacle):
+    bvh = obstacle.bvh
+    leaves = [edges for *_, edges in bvh.nodes if edges is not None]
+    assert sorted(e for edges in leaves for e in edges) == list(range(200))
+    assert all(len(edges) <= bvh.leaf_size for edges in leaves)
+
+
+def test_small_polygon_is_a_leaf():
+    square = PolygonObstacle([Point(0, 0), Point(0, 1), Point(1, 1), Point(1, 0)])
+    assert len(square.bvh.nodes) == 1
+    assert square.bvh.query(0.5, 0.5, 1.0) == [0, 1, 2, 3]
+
+
+def test_query_prunes_edges(obstacle):
+    candidates = obstacle.bvh.query(0.8, 0.5, 0.015)
+    assert 0 < len(candidates) < 10
+    assert candidates == sorted(candidates)
+    assert obstacle.bvh.query(0.05, 0.05, 0.015) == []
+
+
+def test_collision_matches_full_scan(obstacle):
+    random.seed(0)
+    for _ in range(2000):
+        ball = Ball(Point(random.uniform(0.1, 0.9), random.uniform(0.1, 0.9)), 0.015)
+        ball.xdot = random.uniform(-1, 1)
+        ball.ydot = random.uniform(-1, 1)
+        pruned = obstacle.collision(ball)
+        pruned_edges = obstacle.intersect_edges
+        full = obstacle.collision(ball, range(len(obstacle.edges)))
+        assert pruned == full
+        assert pruned_edges == obstacle.intersect_edges
+
+
+def test_leaf_size():
+    bvh = EdgeBVH(star(64).edge_geometry, leaf_size=1)
+    assert all(len(edges) == 1 for *_, edges in bvh.nodes if edges is not None)
+
+
+def test_bvh_is_built_lazily():
+    Board.clear_cache()
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.reset()
+    for _ in range(50):
+        env.step(0)
+    # pylint: disable-next=protected-access
+    assert all(obstacle._bvh is None for obstacle in env.obstacles)
+    assert env.obstacles[0].bvh is env.obstacles[0].bvh
@@ -0,0 +1,58 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import numpy as np
+import pytest
+from pynball_rl import PynBall
+from pynball_rl.edge_grid import EdgeGrid
+
+
+@pytest.fixture(name="env")
+def env_fixture():
+    return PynBall(Path("pynball_rl/configs/hard_config.toml"))
+
+
+def segment_distance(table, x, y):
+    p = np.array([x, y]) - table.start
+    t = np.clip((p * table.direction).sum(axis=1) * table.inv_sq_length, 0.0, 1.0)
+    return np.linalg.norm(p - t[:, None] * table.direction, axis=1)
+
+
+def test_grid_shape(env):
+    grid = EdgeGrid(env.edge_table, padding=0.015, cell_size=0.1)
+    assert grid.resolution == 10
+    assert grid.cell_masks.shape == (100, len(env.edge_table))
+    assert grid.cell_index(-1.0, 2.0) == 9
+    assert grid.cell_index(0.55, 0.05) == 50
+
+
+@pytest.mark.parametrize("radius", [0.015, 0.1])
+def test_query_covers_nearby_edges(env, radius):
+    table = env.edge_table
+    rng = np.random.default_rng(0)
+    for x, y in rng.uniform(-0.05, 1.05, size=(500, 2)):
+        candidates = {
+            (obstacle, edge)
+            for obstacle, edges in env.edge_grid.query(x, y, radius)
+            for edge in edges
+        }
+        for e in np.flatnonzero(segment_distance(table, x, y) <= radius):
+            local = e - table.obstacle_start[table.obstacle[e]]
+            assert (table.obstacle[e], local) in candidates
+
+
+def test_query_prunes_edges(env):
+    cell = env.edge_grid.query(0.5, 0.5, 0.015)
+    num_candidates = sum(len(edges) for _, edges in cell)
+    assert num_candidates < len(env.edge_table) / 4
+
+
+def test_min_distance_is_lower_bound(env):
+    grid = env.edge_grid
+    rng = np.random.default_rng(2)
+    bounds = []
+    for x, y in rng.random((500, 2)):
+        distance = segment_distance(env.edge_table, x, y).min()
+        bound = grid.min_distance(x, y)
+        assert bound <= distance + 1e-12
+        bounds.append(distance - bound)
+    assert max(bounds) <= np.sqrt(2) * grid.cell_size
@@ -0,0 +1,40 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import numpy as np
+import pytest
+from pynball_rl import EdgeTable, PolygonObstacle, Point, PynBall
+
+
+@pytest.fixture(name="obstacles")
+def obstacles_fixture():
+    square = PolygonObstacle(
+        [Point(0.4, 0.4), Point(0.6, 0.4), Point(0.6, 0.6), Point(0.4, 0.6)]
+    )
+    triangle = PolygonObstacle([Point(0.5, 0.6), Point(0.3, 0.4), Point(0.7, 0.4)])
+    return [square, triangle]
+
+
+def test_parallel_classes(obstacles):
+    square, triangle = obstacles
+    assert square.parallel_classes == [0, 1, 0, 1]
+    assert triangle.parallel_classes == [0, 1, 2]
+
+
+def test_edge_table(obstacles):
+    table = EdgeTable(obstacles)
+    assert len(table) == 7
+    assert table.obstacle.tolist() == [0, 0, 0, 0, 1, 1, 1]
+    assert table.obstacle_start.tolist() == [0, 4]
+    assert table.parallel_class.tolist() == [0, 1, 0, 1, 2, 3, 4]
+    assert table.bounds.tolist() == [obstacle.bounds for obstacle in obstacles]
+    assert np.allclose(table.start[0], [0.4, 0.4])
+    assert np.allclose(table.direction[0], [0.0, 0.2])
+    assert np.allclose(table.sq_length * table.inv_sq_length, 1.0)
+    assert np.allclose(np.linalg.norm(table.normal, axis=1), 1.0)
+    assert np.allclose((table.normal * table.direction).sum(axis=1), 0.0)
+
+
+def test_env_edge_table():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    assert len(env.edge_table) == sum(len(obstacle.edges) for obstacle in env.obstacles)
+    assert len(env.edge_table.bounds) == len(env.obstacles)
@@ -0,0 +1,99 @@
+# pylint: disable=missing-function-docstring
+import random
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+import numpy as np
+import pytest
+from pynball_rl import PynBall
+from pynball_rl.env_pool import PynBallPool
+
+CONFIG = Path("pynball_rl/configs/four_rooms_2d_config.toml")
+
+
+@pytest.fixture(name="pool")
+def pool_fixture():
+    with PynBallPool(CONFIG, num_workers=2, envs_per_worker=2, seed=7) as pool:
+        yield pool
+
+
+def test_matches_sequential_envs(pool):
+    actions = np.random.default_rng(0).integers(0, 5, size=(30, 4))
+    states = pool.reset()
+    for k in range(2):
+        envs = [PynBall(CONFIG) for _ in range(2)]
+        random.seed(7 + k)
+        expected = [env.reset() for env in envs]
+        assert np.array_equal(states[2 * k : 2 * k + 2], expected)
+    pool_trajectory = [pool.step(a) for a in actions]
+
+    for k in range(2):
+        envs = [PynBall(CONFIG) for _ in range(2)]
+        random.seed(7 + k)
+        for env in envs:
+            env.reset()
+        for t, a in enumerate(actions):
+            for i, env in enumerate(envs):
+                state, reward, terminal, _ = env.step(int(a[2 * k + i]))
+                _, rewards, terminals, info = pool_trajectory[t]
+                assert np.array_equal(info["final_state"][2 * k + i], state)
+                assert rewards[2 * k + i] == reward
+                assert terminals[2 * k + i] == terminal
+                if terminal:
+                    env.reset()
+
+
+def test_async_step(pool):
+    pool.reset()
+    pool.step_async(np.zeros(4, dtype=int))
+    with pytest.raises(AssertionError):
+        pool.step_async(np.zeros(4, dtype=int))
+    states, rewards, terminals, _ = pool.step_wait()
+    assert states.shape == (4, 4)
+    expected = PynBall.THRUST_PENALTY + np.where(terminals, PynBall.GOAL_REWARD, 0.0)
+    assert np.array_equal(rewards, expected)
+
+
+def test_collect(pool):
+    pool.reset()
+    batch = pool.collect(lambda states: np.full(len(states), 1), 10)
+    assert batch["state"].shape == (10, 4, 4)
+    assert np.all(batch["action"] == 1)
+    continuing = ~batch["terminal"][:-1]
+    following = batch["state"][1:][continuing]
+    assert np.array_equal(following, batch["next_state"][:-1][continuing])
+
+
+def test_worker_errors_are_raised(pool):
+    pool.reset()
+    with pytest.raises(KeyError):
+        pool.step(np.full(4, 9))
+
+
+def test_shared_board_in_spawned_workers():
+    actions = np.random.default_rng(1).integers(0, 5, size=(20, 2))
+    trajectories = []
+    for share_board in (False, True):
+        with PynBallPool(
+            CONFIG, 2, seed=3, context="spawn", share_board=share_board
+        ) as pool:
+            trajectory = [pool.reset()]
+            trajectory.extend(pool.step(a)[0] for a in actions)
+        trajectories.append(np.array(trajectory))
+    assert np.array_equal(trajectories[0], trajectories[1])
+
+
+def test_dead_worker():
+    pool = PynBallPool(CONFIG, num_workers=2, seed=7)
+    pool.reset()
+    # pylint: disable=protected-access
+    name = pool._memory.name
+    pool._processes[0].kill()
+    pool._processes[0].join()
+    with pytest.raises(BrokenPipeError):
+        pool.step(np.zeros(2))
+    with pytest.raises(BrokenPipeError):
+        pool.step(np.zeros(2))
+    pool.close()
+    assert not pool._processes[1].is_alive()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
@@ -0,0 +1,55 @@
+# pylint: disable=missing-function-docstring
+import subprocess
+import sys
+
+# Generous wall-clock budget for importing the package and building an
+# environment in a fresh interpreter. Numpy dominates; matplotlib alone
+# costs more than this.
+IMPORT_BUDGET_SECONDS = 0.5
+
+SCRIPT = """
+import sys, time
+from pathlib import Path
+start = time.perf_counter()
+import pynball_rl
+pynball_rl.PynBall(Path("pynball_rl/configs/hard_config.toml"))
+elapsed = time.perf_counter() - start
+heavy = sorted({m.split(".")[0] for m in sys.modules} & {"matplotlib", "pygame"})
+print(elapsed, ",".join(heavy))
+"""
+
+
+def run(script: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_import_is_headless():
+    _, heavy = (run(SCRIPT) + " ").split(" ", 1)
+    assert heavy.strip() == ""
+
+
+def test_import_time_budget():
+    # Best of three to ride out a cold file system cache.
+    elapsed = min(float(run(SCRIPT).split(" ")[0]) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_viewer():
+    out = run(
+        "import sys, pynball_rl; pynball_rl.Viewer; print('pygame' in sys.modules)"
+    )
+    assert out == "True"
+
+
+def test_rasterizer_is_headless():
+    out = run(
+        "import sys; from pathlib import Path; import pynball_rl;"
+        "from pynball_rl.rasterizer import Rasterizer;"
+        "env = pynball_rl.PynBall(Path('pynball_rl/configs/easy_config.toml'));"
+        "Rasterizer(env).render(env.reset());"
+        "print(bool({'matplotlib', 'pygame'} & set(sys.modules)))"
+    )
+    assert out == "False"
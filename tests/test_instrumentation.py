@@ -0,0 +1,114 @@
+# pylint: disable=missing-function-docstring
+import math
+from pathlib import Path
+import random
+import pytest
+from pynball_rl import Point, PynBall
+from pynball_rl.ball import Ball
+from pynball_rl.instrumentation import COUNTERS, PHASES
+
+
+def trajectory(env, num_steps, seed):
+    random.seed(seed)
+    states = [env.reset()]
+    for _ in range(num_steps):
+        state, _, terminal, _ = env.step(random.choice(env.action_space))
+        states.append(state)
+        if terminal:
+            states.append(env.reset())
+    return states
+
+
+@pytest.mark.parametrize("integrator", ["substep", "adaptive", "continuous"])
+def test_stats_do_not_change_trajectory(integrator):
+    path = Path("pynball_rl/configs/hard_config.toml")
+    plain, instrumented = PynBall(path), PynBall(path)
+    plain.integrator = instrumented.integrator = integrator
+    instrumented.enable_stats(timing=True)
+    assert trajectory(plain, 300, 0) == trajectory(instrumented, 300, 0)
+    assert instrumented.skipped_substeps == plain.skipped_substeps
+
+
+def test_counters():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    assert env.stats is None
+    stats = env.enable_stats()
+    trajectory(env, 200, 1)
+    assert stats.steps == 200
+    assert stats.substeps == 200 * env.step_duration
+    assert stats.edges_tested >= stats.obstacles_tested >= stats.collisions > 0
+    assert "timers" not in stats.as_dict()
+    assert set(stats.timers.values()) == {0.0}
+    assert env.disable_stats() is stats
+    env.step(0)
+    assert stats.steps == 200
+
+
+def test_adaptive_counts_skipped_substeps():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.integrator = "adaptive"
+    stats = env.enable_stats()
+    trajectory(env, 200, 1)
+    assert stats.skipped_substeps == env.skipped_substeps > 0
+    assert stats.substeps == 200 * env.step_duration
+
+
+def test_continuous_counters():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.integrator = "continuous"
+    stats = env.enable_stats()
+    trajectory(env, 200, 1)
+    assert stats.steps == 200
+    assert stats.substeps >= stats.collisions > 0
+    assert stats.edges_tested >= stats.obstacles_tested > 0
+
+
+def test_timers():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    stats = env.enable_stats(timing=True)
+    trajectory(env, 50, 2)
+    timers = stats.as_dict()["timers"]
+    assert set(timers) == set(PHASES)
+    assert timers["narrow_phase"] > 0.0
+    assert timers["clearance"] == 0.0
+
+
+def test_episode_stats():
+    env = PynBall(Path("pynball_rl/configs/easy_config.toml"))
+    episodes = []
+    stats = env.enable_stats(timing=True, on_episode_end=episodes.append)
+    random.seed(3)
+    env.reset()
+    for _ in range(30):
+        env.step(random.choice(env.action_space))
+    assert stats.episode()["steps"] == 30
+    env.reset()
+    env.reset()
+    for _ in range(10):
+        env.step(random.choice(env.action_space))
+    assert len(episodes) == 1
+    assert episodes[0]["steps"] == 30
+    assert set(episodes[0]) == set(COUNTERS) | {"timers"}
+    assert stats.episode()["steps"] == 10
+    assert stats.steps == 40
+    stats.clear()
+    assert stats.episode()["steps"] == 0 and stats.steps == 0
+
+
+def test_single_obstacle_reversals():
+    env = PynBall(Path("pynball_rl/configs/easy_config.toml"))
+    stats = env.enable_stats()
+    # Drive the ball into a vertex, so it hits two edges of one obstacle.
+    points = env.obstacles[4].points
+    centre_x = sum(p.x for p in points) / len(points)
+    centre_y = sum(p.y for p in points) / len(points)
+    dx, dy = points[0].x - centre_x, points[0].y - centre_y
+    norm = math.hypot(dx, dy)
+    radius = env.config["ball"]["radius"]
+    ball = Ball(Point(points[0].x, points[0].y), radius)
+    ball.x += dx / norm * radius / 2
+    ball.y += dy / norm * radius / 2
+    ball.xdot, ball.ydot = -dx / norm * 0.3, -dy / norm * 0.3
+    env.reset(ball)
+    env.step(4)
+    assert stats.collisions == stats.reversals == 1
@@ -274,3 +274,14 @@ def test_diamond_collision_effect_2(diamond_obstacle):
     assert (
         math.isclose(v.x, -0.2) is True and math.isclose(v.y, 0, abs_tol=1e-12) is True
     )
+
+
+def test_apply_collision_effect(square_obstacle, diamond_obstacle):
+    for obstacle in [square_obstacle, diamond_obstacle]:
+        for velocity in [Point(0.4, 0.1), Point(0.3, 0.3)]:
+            ball = Ball(Point(0.3, 0.5), 0.1)
+            ball.set_velocity(velocity)
+            assert obstacle.collision(ball) is True
+            v = obstacle.collision_effect(ball)
+            obstacle.apply_collision_effect(ball)
+            assert ball.xdot == v.x and ball.ydot == v.y
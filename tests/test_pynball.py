@@ -1,8 +1,10 @@
 # pylint: disable=missing-function-docstring
 from pathlib import Path
 import math
+import random
+import numpy as np
 import pytest
-from pynball_rl import PynBall
+from pynball_rl import Ball, Point, PynBall
 
 
 @pytest.fixture(name="env")
@@ -63,3 +65,210 @@ def test_bounds(env):
     env.ball.set_position(-0.1, 0.21)
     with pytest.raises(RuntimeError):
         env._check_bounds()
+
+
+@pytest.mark.parametrize("config", ["easy_config.toml", "hard_config.toml"])
+def test_adaptive_matches_substep(config):
+    path = Path("pynball_rl/configs") / config
+    fixed, adaptive = PynBall(path), PynBall(path)
+    adaptive.integrator = "adaptive"
+    rng = random.Random(7)
+    fixed.reset()
+    adaptive.reset()
+    for _ in range(500):
+        action = rng.choice(fixed.action_space)
+        s_fixed, r_fixed, t_fixed, _ = fixed.step(action)
+        s_adaptive, r_adaptive, t_adaptive, _ = adaptive.step(action)
+        assert s_fixed == s_adaptive
+        assert r_fixed == r_adaptive and t_fixed == t_adaptive
+        if t_fixed:
+            fixed.reset()
+            adaptive.reset()
+    assert fixed.skipped_substeps == 0
+    assert adaptive.skipped_substeps > 0
+
+
+@pytest.mark.parametrize("config", ["easy_config.toml", "hard_config.toml"])
+def test_adaptive_tests_fewer_obstacles(config):
+    # Wall-clock speed is left to `pynball_rl.bench`; count the work instead.
+    path = Path("pynball_rl/configs") / config
+    rng = random.Random(3)
+    actions = [rng.choice(range(5)) for _ in range(300)]
+    stats = {}
+    for integrator in ("substep", "adaptive"):
+        env = PynBall(path)
+        env.integrator = integrator
+        stats[integrator] = env.enable_stats()
+        env.reset()
+        for action in actions:
+            if env.step(action)[2]:
+                env.reset()
+    substep, adaptive = stats["substep"], stats["adaptive"]
+    assert adaptive.skipped_substeps > 0
+    assert adaptive.obstacles_tested < substep.obstacles_tested
+    assert adaptive.edges_tested < substep.edges_tested
+
+
+def test_get_set_state():
+    # Noisy dynamics, so branches only match if the RNG is restored.
+    env = PynBall(Path("pynball_rl/configs/four_rooms_2d_config.toml"))
+    env.reset()
+    random.seed(5)
+    for _ in range(20):
+        env.step(random.choice(env.action_space))
+    snapshot = env.get_state()
+    assert snapshot.reset_flag is True
+    with pytest.raises(AttributeError):
+        snapshot.x = 0.0  # pylint: disable=assigning-non-slot
+
+    branches = []
+    for _ in range(2):
+        assert env.set_state(snapshot) == snapshot[:4]
+        branch = []
+        for t in range(50):
+            state, reward, terminal, _ = env.step(t % 5)
+            branch.append((state, reward, terminal, random.random()))
+            if terminal:
+                break
+        branches.append(branch)
+    assert branches[0] == branches[1]
+
+
+def test_set_state_restores_terminal_flag():
+    env = PynBall(Path("pynball_rl/configs/easy_config.toml"))
+    env.reset()
+    env.ball.set_position(0.9, 0.2)
+    env.step(4)
+    assert env.reset_flag is False
+    done = env.get_state(rng=False)
+    assert done.rng_state is None
+    env.reset()
+    env.set_state(done)
+    with pytest.raises(AssertionError):
+        env.step(4)
+
+
+def test_set_state_before_reset():
+    source = PynBall(Path("pynball_rl/configs/easy_config.toml"))
+    source.reset()
+    snapshot = source.get_state(rng=False)
+    env = PynBall(Path("pynball_rl/configs/easy_config.toml"))
+    env.set_state(snapshot)
+    assert env.step(0) == source.step(0)
+
+
+def visited_states(env, num_steps):
+    random.seed(0)
+    state = env.reset()
+    states, actions = [], []
+    for _ in range(num_steps):
+        action = random.choice(env.action_space)
+        states.append(state)
+        actions.append(action)
+        state, _, terminal, _ = env.step(action)
+        if terminal:
+            state = env.reset()
+    return np.array(states), np.array(actions)
+
+
+def stepped_one_by_one(env, states, actions):
+    radius = env.config["ball"]["radius"]
+    results = []
+    for state, action in zip(states, actions):
+        ball = Ball(Point(state[0], state[1]), radius)
+        ball.set_velocity(Point(state[2], state[3]))
+        env.reset(ball)
+        results.append(env.step(int(action))[:3])
+    return results
+
+
+@pytest.mark.parametrize("integrator", ["substep", "adaptive", "continuous"])
+def test_transition_matches_step(integrator):
+    env = PynBall(Path("pynball_rl/configs/four_rooms_2d_config.toml"))
+    env.integrator = integrator
+    states, actions = visited_states(env, 300)
+    actions = np.roll(actions, 1)
+    random.seed(4)
+    next_states, rewards, terminals = env.transition(states, actions)
+    random.seed(4)
+    expected = stepped_one_by_one(env, states, actions)
+    for i, (state, reward, terminal) in enumerate(expected):
+        assert tuple(next_states[i]) == state
+        assert rewards[i] == reward
+        assert terminals[i] == terminal
+
+
+def test_transition_leaves_env_untouched():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    states, actions = visited_states(env, 50)
+    env.reset()
+    env.step(0)
+    before = env.get_state(rng=False)
+    env.transition(states, actions)
+    assert env.get_state(rng=False) == before
+
+
+def test_transition_with_generator():
+    env = PynBall(Path("pynball_rl/configs/four_rooms_2d_config.toml"))
+    states, actions = visited_states(env, 100)
+    random.seed(0)
+    first = env.transition(states, actions, np.random.default_rng(3))
+    draw = random.random()
+    second = env.transition(states, actions, np.random.default_rng(3))
+    for a, b in zip(first, second):
+        assert np.array_equal(a, b)
+    # The random module is not drawn from.
+    random.seed(0)
+    assert random.random() == draw
+    rewards = np.where(actions == 4, -1.0, -5.0)
+    assert np.array_equal(first[1], np.where(first[2], rewards + 10_000, rewards))
+
+
+def test_step_repeat_matches_step():
+    path = Path("pynball_rl/configs/four_rooms_2d_config.toml")
+    repeated, stepped = PynBall(path), PynBall(path)
+    for env in (repeated, stepped):
+        random.seed(2)
+        env.reset()
+    for action in (0, 1, 1, 3, 2, 4):
+        random.seed(action)
+        state, total_reward, steps, terminal = repeated.step_repeat(action, 7)
+        random.seed(action)
+        rewards = []
+        for _ in range(7):
+            expected, reward, expected_terminal, _ = stepped.step(action)
+            rewards.append(reward)
+            if expected_terminal:
+                break
+        assert state == expected
+        assert total_reward == sum(rewards) and steps == len(rewards)
+        assert terminal == expected_terminal
+        if terminal:
+            break
+
+
+def test_step_repeat_stops_at_terminal(env):
+    env.reset()
+    env.ball.set_position(0.9, 0.15)
+    state, total_reward, steps, terminal = env.step_repeat(1, 10)
+    assert terminal is True and steps == 1
+    assert total_reward == -5.0 + 10_000
+    assert env.reset_flag is False
+    assert state == (env.ball.x, env.ball.y, env.ball.xdot, env.ball.ydot)
+
+
+def test_run_option(env):
+    env.reset()
+    visited = []
+
+    def policy(state):
+        visited.append(state)
+        return 0
+
+    state, total_reward, steps, terminal = env.run_option(
+        policy, terminate=lambda s: s[0] > 0.22, max_steps=100
+    )
+    assert state[0] > 0.22 and all(s[0] <= 0.22 for s in visited)
+    assert steps == len(visited) and total_reward == -5.0 * steps
+    assert terminal is False
+    assert env.run_option(4, max_steps=3)[1:] == (-3.0, 3, False)
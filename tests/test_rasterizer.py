@@ -0,0 +1,50 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import numpy as np
+import pytest
+from pynball_rl import Point, PynBall, VecPynBall
+from pynball_rl.rasterizer import BALL_COLOR, Rasterizer, _gray
+
+CONFIG_PATH = Path("pynball_rl/configs/hard_config.toml")
+
+
+@pytest.fixture(name="env")
+def env_fixture():
+    return PynBall(CONFIG_PATH)
+
+
+def test_background(env):
+    rasterizer = Rasterizer(env, 60, 80)
+    background = rasterizer.background
+    assert background.shape == (60, 80) and background.dtype == np.uint8
+    assert not background.flags.writeable
+    for i in range(0, 60, 7):
+        for j in range(0, 80, 7):
+            centre = Point((j + 0.5) / 80, (i + 0.5) / 60)
+            inside = any(obstacle.inside(centre) for obstacle in env.obstacles)
+            assert (background[i, j] == _gray((64, 64, 64))) == inside
+
+
+def test_render(env):
+    rasterizer = Rasterizer(env, 200)
+    state = (0.5, 0.3, 0.1, 0.2)
+    frame = rasterizer.render(state)
+    ball = np.argwhere(frame == _gray(BALL_COLOR))
+    assert abs(len(ball) - np.pi * (rasterizer.radius * 200) ** 2) < 10
+    assert np.allclose(ball.mean(axis=0), (0.3 * 200 - 0.5, 0.5 * 200 - 0.5), atol=0.5)
+    unchanged = np.ones(frame.shape, dtype=bool)
+    unchanged[tuple(ball.T)] = False
+    assert np.array_equal(frame[unchanged], rasterizer.background[unchanged])
+
+
+def test_render_batch_rgb(env):
+    vec_env = VecPynBall(CONFIG_PATH, 5)
+    states = vec_env.reset()
+    states[:, 0] = [0.005, 0.2, 0.5, 0.8, 0.995]
+    rasterizer = Rasterizer(vec_env.env, 128, 96, rgb=True)
+    frames = rasterizer.render_batch(states)
+    assert frames.shape == (5, 128, 96, 3) and frames.dtype == np.uint8
+    for state, frame in zip(states, frames):
+        assert np.array_equal(frame, rasterizer.render(state))
+    assert (frames == BALL_COLOR).all(axis=-1).any(axis=(1, 2)).all()
+    assert Rasterizer(env, 32).render_batch(states[:, :2]).shape == (5, 32, 32)
@@ -0,0 +1,46 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from pynball_rl import PynBall
+
+matplotlib.use("Agg")
+
+
+@pytest.fixture(name="env")
+def env_fixture():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.reset()
+    yield env
+    env.close()
+
+
+def test_figure_is_reused(env):
+    fig = env.render("live")
+    for _ in range(3):
+        env.step(1)
+        assert env.render("live") is fig
+    assert plt.get_fignums() == [fig.number]
+    env.close()
+    assert not plt.get_fignums()
+    assert env.render("live") is not fig
+
+
+def test_rgb_array_matches_full_redraw(env):
+    first = env.render("rgb_array")
+    assert first.ndim == 3 and first.shape[2] == 3 and first.dtype == np.uint8
+    for _ in range(5):
+        env.step(0)
+    frame = env.render("rgb_array")
+    assert not np.array_equal(frame, first)
+    canvas = env._renderer.fig.canvas  # pylint: disable=protected-access
+    canvas.draw()
+    redraw = np.asarray(canvas.buffer_rgba())[..., :3]
+    assert np.array_equal(frame, redraw)
+
+
+def test_unknown_mode(env):
+    with pytest.raises(ValueError):
+        env.render("video")
@@ -0,0 +1,62 @@
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+from pynball_rl.replay_buffer import ReplayBuffer
+from pynball_rl.rollout import parallel_rollout, rollout
+
+
+def fill(buffer, start, stop):
+    n = stop - start
+    states = np.zeros((n, 4))
+    states[:, 0] = np.arange(start, stop)
+    buffer.add_batch(states, np.zeros(n), states, np.arange(start, stop), np.zeros(n))
+
+
+@pytest.mark.parametrize("chunks", [[3, 4, 5], [12], [1] * 12, [25]])
+def test_ring_insertion(chunks):
+    buffer = ReplayBuffer(5)
+    total = 0
+    for n in chunks:
+        fill(buffer, total, total + n)
+        total += n
+    assert len(buffer) == min(total, 5)
+    assert buffer.position == total % 5
+    assert sorted(buffer.view()["reward"]) == list(range(max(0, total - 5), total))
+    assert buffer.records["reward"][(total - 1) % 5] == total - 1
+
+
+def test_add_and_view_is_zero_copy():
+    buffer = ReplayBuffer(4)
+    buffer.add((1, 2, 3, 4), 2, (5, 6, 7, 8), -5.0, True)
+    view = buffer.view()
+    assert len(view) == 1
+    assert view["next_state"][0].tolist() == [5, 6, 7, 8]
+    assert np.shares_memory(view["reward"], buffer.records)
+
+
+def test_sample():
+    buffer = ReplayBuffer(100)
+    fill(buffer, 0, 10)
+    batch = buffer.sample(1000, np.random.default_rng(0))
+    assert batch.shape == (1000,)
+    assert set(batch["reward"].tolist()) == set(range(10))
+
+
+def test_memory_mapped(tmp_path):
+    buffer = ReplayBuffer(8, tmp_path / "buffer.npy")
+    fill(buffer, 0, 3)
+    buffer.flush()
+    assert np.load(tmp_path / "buffer.npy")["reward"][:3].tolist() == [0, 1, 2]
+
+
+def test_from_rollout(tmp_path):
+    rollout("hard_config.toml", 30, seed=0, output=tmp_path / "rollout.npy")
+    buffer = ReplayBuffer.from_rollout(tmp_path / "rollout.npy")
+    assert len(buffer) == buffer.capacity == 30
+    assert np.array_equal(buffer.view(), np.load(tmp_path / "rollout.npy"))
+
+    parallel_rollout("hard_config.toml", 30, 3, 0, tmp_path / "shards", workers=1)
+    buffer = ReplayBuffer.from_rollout(tmp_path / "shards", capacity=20)
+    assert len(buffer) == 20
+    last = np.load(tmp_path / "shards" / "shard-2.npy")
+    assert np.array_equal(buffer.records[:10], last)
@@ -0,0 +1,43 @@
+# pylint: disable=missing-function-docstring
+import numpy as np
+from pynball_rl.rollout import (
+    RECORD_DTYPE,
+    RolloutWriter,
+    parallel_rollout,
+    read_rollout,
+    rollout,
+)
+
+
+def test_readable_while_writing(tmp_path):
+    path = tmp_path / "rollout.npy"
+    with RolloutWriter(path, chunk_size=4) as writer:
+        assert len(read_rollout(path)) == 0
+        for i in range(10):
+            writer.append((i, 0.0, 0.0, 0.0), i % 5, (0.0, 0.0, 0.0, i), -5.0, i == 9)
+        assert len(read_rollout(path)) == 8
+    records = read_rollout(path)
+    assert records.dtype == RECORD_DTYPE
+    assert np.array_equal(records["state"][:, 0], np.arange(10))
+    assert np.array_equal(records["action"], np.arange(10) % 5)
+    assert records["terminal"].tolist() == [0] * 9 + [1]
+
+
+def test_rollout(tmp_path):
+    path = tmp_path / "rollout.npy"
+    rollout("hard_config.toml", 50, seed=0, output=path, chunk_size=16)
+    records = np.load(path)
+    assert len(records) == 50
+    assert np.all(records["reward"] <= -1.0)
+    assert np.array_equal(records["state"][1:], records["next_state"][:-1])
+
+
+def test_parallel_rollout_is_reproducible(tmp_path):
+    first = parallel_rollout("hard_config.toml", 25, 3, 11, tmp_path / "a")
+    parallel_rollout("hard_config.toml", 25, 3, 11, tmp_path / "b", workers=1)
+    assert [shard["num_steps"] for shard in first["shards"]] == [9, 8, 8]
+    assert len({shard["seed"] for shard in first["shards"]}) == 3
+    for name in ["manifest.json", "shard-0.npy", "shard-1.npy", "shard-2.npy"]:
+        first_bytes = (tmp_path / "a" / name).read_bytes()
+        assert first_bytes == (tmp_path / "b" / name).read_bytes()
+    assert len(np.load(tmp_path / "a" / "shard-0.npy")) == 9
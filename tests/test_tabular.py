@@ -0,0 +1,73 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import numpy as np
+import pytest
+from pynball_rl import Ball, Point, PynBall
+from pynball_rl.polygon_obstacle import line_intersect
+from pynball_rl.tabular import TransitionTable
+
+CONFIG = Path("pynball_rl/configs/very_easy_config.toml")
+BINS = (16, 16, 2, 2)
+
+
+@pytest.fixture(name="table")
+def table_fixture(tmp_path):
+    return TransitionTable.build(CONFIG, tmp_path / "model", BINS, chunk_size=100)
+
+
+def test_shape(table):
+    assert table.num_actions == 5
+    assert table.num_states == int((table.position_index >= 0).sum()) * 4
+    assert table.reward.dtype == np.float32
+    assert table.next_state.dtype == np.int32
+
+
+def test_index_round_trip(table):
+    indices = np.arange(table.num_states)
+    assert np.array_equal(table.state_index(table.states(indices)), indices)
+    blocked = int(np.flatnonzero(table.position_index < 0)[0])
+    i, j = divmod(blocked, table.bins[1])
+    centre = np.array([(i + 0.5) / table.bins[0], (j + 0.5) / table.bins[1], 0.0, 0.0])
+    assert table.state_index(centre) == -1
+
+
+def test_matches_scalar_step(table):
+    env = PynBall(CONFIG)
+    for s in range(0, table.num_states, 7):
+        x, y, xdot, ydot = table.states(s)
+        for column, action in enumerate(table.actions):
+            env.reset()
+            env.ball = Ball(Point(x, y), env.ball.radius)
+            env.ball.xdot, env.ball.ydot = xdot, ydot
+            state, reward, terminal, _ = env.step(action)
+            assert table.next_state[s, column] == table.state_index(np.array(state))
+            assert table.reward[s, column] == reward
+            assert table.terminal[s, column] == terminal
+
+
+def test_reload_and_workers(table, tmp_path):
+    parallel = TransitionTable.build(
+        CONFIG, tmp_path / "parallel", BINS, workers=2, chunk_size=100
+    )
+    reloaded = TransitionTable(table.path)
+    assert reloaded.config_hash == parallel.config_hash
+    assert np.array_equal(reloaded.next_state, parallel.next_state)
+    assert np.array_equal(reloaded.reward, parallel.reward)
+    assert np.array_equal(reloaded.terminal, parallel.terminal)
+
+
+def test_rejects_noisy_config(tmp_path):
+    with pytest.raises(ValueError):
+        TransitionTable.build(Path("pynball_rl/configs/easy_2d_config.toml"), tmp_path)
+
+
+def test_source_states_are_free(tmp_path):
+    config = Path("pynball_rl/configs/hard_config.toml")
+    table = TransitionTable.build(config, tmp_path / "hard", (20, 20, 1, 1))
+    env = PynBall(config)
+    radius = env.config["ball"]["radius"]
+    for x, y, _, _ in table.states(np.arange(table.num_states)):
+        ball = Ball(Point(x, y), radius)
+        for obstacle in env.obstacles:
+            assert not obstacle.inside(ball.get_center())
+            assert not any(line_intersect(ball, edge) for edge in obstacle.edges)
@@ -0,0 +1,115 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import math
+import random
+import pytest
+from pynball_rl import PynBall, Ball, Point, VecPynBall
+from pynball_rl.polygon_obstacle import compile_edge
+from pynball_rl.time_of_impact import (
+    circle_time_of_impact,
+    reflect,
+    segment_time_of_impact,
+)
+
+WALL = """
+[ball]
+    starts = [[0.5, 0.5]]
+    radius = 0.02
+[target]
+    location = [0.1, 0.1]
+    radius = 0.04
+[[obstacles]]
+    points = [[0.55, 0.3], [0.6, 0.3], [0.6, 0.7], [0.55, 0.7]]
+"""
+
+
+def make_env(tmp_path: Path, integrator: str, body: str = WALL) -> PynBall:
+    config = tmp_path / "config.toml"
+    config.write_text(f'integrator = "{integrator}"\ndrag = 1.0\n' + body)
+    return PynBall(config)
+
+
+def test_segment_time_of_impact():
+    edge = compile_edge([Point(0.5, 0.0), Point(0.5, 1.0)])
+    assert math.isclose(segment_time_of_impact(0.3, 0.5, 0.2, 0.0, 0.1, edge), 0.5)
+    assert segment_time_of_impact(0.3, 0.5, -0.2, 0.0, 0.1, edge) == math.inf
+    assert segment_time_of_impact(0.3, 0.5, 0.05, 0.0, 0.1, edge) == math.inf
+    assert math.isclose(segment_time_of_impact(0.7, 0.5, -0.2, 0.0, 0.1, edge), 0.5)
+    # Contact point beyond the end of the edge.
+    assert segment_time_of_impact(0.3, 1.5, 0.2, 0.0, 0.1, edge) == math.inf
+
+
+def test_circle_time_of_impact():
+    assert math.isclose(circle_time_of_impact(0.0, 0.0, 1.0, 0.0, 0.1, 0.6, 0.0), 0.5)
+    assert circle_time_of_impact(0.0, 0.0, -1.0, 0.0, 0.1, 0.6, 0.0) == math.inf
+    assert circle_time_of_impact(0.0, 0.0, 1.0, 0.0, 0.1, 0.6, 0.2) == math.inf
+    assert circle_time_of_impact(0.55, 0.0, 1.0, 0.0, 0.1, 0.6, 0.0) == 0.0
+
+
+def test_reflect():
+    assert reflect(1.0, 0.5, -1.0, 0.0) == (-1.0, 0.5)
+
+
+def test_invalid_integrator(tmp_path):
+    with pytest.raises(ValueError):
+        make_env(tmp_path, "leapfrog")
+
+
+def test_exact_bounce(tmp_path):
+    env = make_env(tmp_path, "continuous")
+    ball = Ball(Point(0.52, 0.5), 0.02)
+    ball.set_velocity(Point(1.0, 0.0))
+    env.reset(ball)
+    s, _, t, _ = env.step(4)
+    # Contact at x = 0.53 half way through the step, then back 0.01.
+    assert math.isclose(s[0], 0.52)
+    assert s[1:] == (0.5, -1.0, 0.0)
+    assert t is False
+
+
+def test_vertex_bounce(tmp_path):
+    env = make_env(tmp_path, "continuous")
+    ball = Ball(Point(0.575, 0.27), 0.02)
+    ball.set_velocity(Point(0.0, 1.0))
+    env.reset(ball)
+    s, _, _, _ = env.step(4)
+    assert s[3] < 0.0
+
+
+def test_reaches_target(tmp_path):
+    env = make_env(tmp_path, "continuous")
+    ball = Ball(Point(0.1, 0.17), 0.02)
+    ball.set_velocity(Point(0.0, -1.0))
+    env.reset(ball)
+    s, r, t, _ = env.step(4)
+    assert t is True
+    assert r == PynBall.NOP_PENALTY + PynBall.GOAL_REWARD
+    assert math.isclose(s[1], 0.16)
+
+
+def edge_distance(x: float, y: float, edge: tuple[float, ...]) -> float:
+    p1x, p1y, dx, dy, a, _, _ = edge
+    t = min(max(((x - p1x) * dx + (y - p1y) * dy) / a, 0.0), 1.0)
+    return math.hypot(x - p1x - t * dx, y - p1y - t * dy)
+
+
+def test_no_penetration():
+    env = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.integrator = "continuous"
+    random.seed(3)
+    env.reset()
+    for _ in range(1000):
+        _, _, t, _ = env.step(random.choice(env.action_space))
+        for obstacle in env.obstacles:
+            for edge in obstacle.edge_geometry:
+                distance = edge_distance(env.ball.x, env.ball.y, edge)
+                assert distance >= env.ball.radius - 1e-9
+        if t:
+            env.reset()
+
+
+def test_vec_rejects_continuous(tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text('integrator = "continuous"\n' + WALL)
+    with pytest.raises(ValueError):
+        VecPynBall(config, 2)
@@ -0,0 +1,114 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import pytest
+from pynball_rl import Ball, Point, PynBall
+from pynball_rl.transition_cache import TransitionCache
+
+
+def cached_env(tmp_path, config_name, size=1000):
+    config = tmp_path / "config.toml"
+    base = Path(f"pynball_rl/configs/{config_name}").read_text()
+    config.write_text(f"transition_cache_size = {size}\n" + base)
+    return PynBall(config)
+
+
+def test_lru_eviction():
+    cache = TransitionCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.cache_info() == (2, 1, 2, 2)
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_key_quantisation():
+    cache = TransitionCache(precision=1e-3)
+    key = cache.key((0.5, 0.5, 0.1, 0.0), 1)
+    assert key == cache.key((0.5002, 0.4998, 0.1, 0.0), 1)
+    assert cache.key((0.5, 0.5, 0.1, 0.0), 1) != cache.key((0.5, 0.5, 0.1, 0.0), 2)
+    assert cache.key((0.5, 0.5, 0.1, 0.0), 1) != cache.key((0.502, 0.5, 0.1, 0.0), 1)
+
+
+def test_cached_steps_match(tmp_path):
+    env = cached_env(tmp_path, "hard_config.toml")
+    reference = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    for _ in range(2):
+        env.reset()
+        reference.reset()
+        for action in [0, 1, 1, 2, 3, 4, 0, 0, 1] * 5:
+            assert env.step(action) == reference.step(action)
+    info = env.transition_cache.cache_info()
+    assert info.hits == 45
+    assert info.misses == 45
+
+
+def test_bypassed_with_noise(tmp_path):
+    env = cached_env(tmp_path, "easy_2d_config.toml")
+    env.reset()
+    env.step(0)
+    assert env.transition_cache.cache_info().misses == 0
+
+
+def test_fixed_noise(tmp_path):
+    env = cached_env(tmp_path, "easy_2d_config.toml")
+    env.fixed_noise = (0.5, -1.0)
+    radius = env.config["ball"]["radius"]
+    env.reset(Ball(Point(0.2, 0.9), radius))
+    first = env.step(0)
+    env.reset(Ball(Point(0.2, 0.9), radius))
+    assert env.step(0) == first
+    assert env.transition_cache.cache_info().hits == 1
+    # Impulse of 1 + 0.2 * 0.5 moves the ball 0.22 radii.
+    assert first[0][0] == pytest.approx(0.2 + 0.22 * radius)
+
+
+def test_settings_change_key(tmp_path):
+    env = cached_env(tmp_path, "hard_config.toml")
+    reference = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    actions = [0, 0, 1, 1, 2, 0, 3, 1] * 4
+    for integrator, exploration in [
+        ("substep", False),
+        ("continuous", False),
+        ("continuous", True),
+    ]:
+        env.integrator = reference.integrator = integrator
+        env.exploration = reference.exploration = exploration
+        env.reset()
+        reference.reset()
+        for action in actions:
+            assert env.step(action) == reference.step(action)
+    assert env.transition_cache.cache_info().hits == 0
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [("drag", 0.9), ("step_duration", 10), ("stddev_x", 0.2), ("stddev_y", 0.2)],
+)
+def test_physics_change_key(tmp_path, name, value):
+    env = cached_env(tmp_path, "hard_config.toml")
+    reference = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    env.fixed_noise = reference.fixed_noise = (0.5, -1.0)
+    actions = [0, 0, 1, 1, 2, 0, 3, 1] * 4
+    for setting in [getattr(env, name), value]:
+        setattr(env, name, setting)
+        setattr(reference, name, setting)
+        env.reset()
+        reference.reset()
+        for action in actions:
+            assert env.step(action) == reference.step(action)
+    assert env.transition_cache.cache_info().hits == 0
+
+
+def test_ball_radius_changes_key(tmp_path):
+    env = cached_env(tmp_path, "hard_config.toml")
+    reference = PynBall(Path("pynball_rl/configs/hard_config.toml"))
+    for radius in [0.02, 0.01]:
+        env.reset(Ball(Point(0.2, 0.9), radius))
+        reference.reset(Ball(Point(0.2, 0.9), radius))
+        for action in [0, 0, 1, 1, 2, 0, 3, 1] * 4:
+            assert env.step(action) == reference.step(action)
+    assert env.transition_cache.cache_info().hits == 0
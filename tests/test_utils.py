@@ -1,7 +1,7 @@
 # pylint: disable=missing-function-docstring
 
 import pytest
-from pynball_rl.utils import clip
+from pynball_rl.utils import atomic_write, clip
 
 TEST_VALUES = [-100, -1.5, 0, 1.5, 50, 1e3, 5 / 83]
 TEST_BOUNDS = [[0, 1], [-1, 1], [-100, -50], [0, 1e-3], [1, 5]]
@@ -24,3 +24,19 @@ def test_clip_arguments():
     for value in TEST_VALUES:
         for lower, upper in TEST_BOUNDS:
             assert lower <= clip(value, lower, upper) <= upper
+
+
+def test_atomic_write(tmp_path):
+    path = tmp_path / "cache" / "data.bin"
+    atomic_write(path, lambda f: f.write(b"first"))
+    atomic_write(path, lambda f: f.write(b"second"))
+    assert path.read_bytes() == b"second"
+
+    def fail(f):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        atomic_write(path, fail)
+    assert path.read_bytes() == b"second"
+    assert [p.name for p in path.parent.iterdir()] == ["data.bin"]
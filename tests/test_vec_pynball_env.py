@@ -0,0 +1,113 @@
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+import random
+import numpy as np
+import pytest
+from pynball_rl import PynBall, VecPynBall, Ball, Point
+
+CONFIGS = ["easy_config.toml", "hard_config.toml"]
+
+
+def scalar_trajectory(env: PynBall, num_steps: int) -> tuple[np.ndarray, np.ndarray]:
+    random.seed(0)
+    s = env.reset()
+    states, actions = [], []
+    for _ in range(num_steps):
+        a = random.choice(env.action_space)
+        states.append(s)
+        actions.append(a)
+        s, _, t, _ = env.step(a)
+        if t:
+            s = env.reset()
+    return np.array(states), np.array(actions)
+
+
+@pytest.fixture(name="vec_env")
+def vec_env_fixture():
+    return VecPynBall(Path("pynball_rl/configs/easy_config.toml"), 4)
+
+
+def test_reset(vec_env):
+    with pytest.raises(AssertionError):
+        vec_env.step(np.full(4, 4))
+    s = vec_env.reset()
+    assert s.shape == (4, 4)
+    assert np.all(s == [0.2, 0.9, 0.0, 0.0])
+
+
+def test_step(vec_env):
+    vec_env.reset()
+    s, r, t, _ = vec_env.step(np.array([4, 0, 1, 4]))
+    assert np.all(r == [-1.0, -5.0, -5.0, -1.0])
+    assert not t.any()
+    assert np.all(s[0] == [0.2, 0.9, 0.0, 0.0])
+    assert np.isclose(s[1, 0], 0.02 / 5 + 0.2)
+    assert np.isclose(s[1, 2], 1 / 5 * 0.995)
+    assert np.isclose(s[2, 1], 0.02 / 5 + 0.9)
+
+
+def test_auto_reset(vec_env):
+    vec_env.reset(np.array([[0.9, 0.25, 0.0, -0.5]] + [[0.2, 0.9, 0.0, 0.0]] * 3))
+    s, r, t, info = vec_env.step(np.full(4, 4))
+    assert np.all(t == [True, False, False, False])
+    assert r[0] == PynBall.NOP_PENALTY + PynBall.GOAL_REWARD
+    assert np.all(s[0] == [0.2, 0.9, 0.0, 0.0])
+    assert info["final_state"][0, 1] < 0.25
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_matches_scalar_step(config):
+    path = Path("pynball_rl/configs") / config
+    env = PynBall(path)
+    vec_env = VecPynBall(path, 1)
+    states, actions = scalar_trajectory(env, 1000)
+    next_states, rewards, terminals = vec_env.transition(states, actions)
+    radius = env.config["ball"]["radius"]
+    for i, (state, action) in enumerate(zip(states, actions)):
+        ball = Ball(Point(state[0], state[1]), radius)
+        ball.set_velocity(Point(state[2], state[3]))
+        env.reset(ball)
+        s, r, t, _ = env.step(action)
+        assert tuple(next_states[i]) == s
+        assert rewards[i] == r
+        assert terminals[i] == t
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_step_repeat_matches_scalar(config):
+    path = Path("pynball_rl/configs") / config
+    env = PynBall(path)
+    vec_env = VecPynBall(path, 8)
+    starts, _ = scalar_trajectory(env, 200)
+    starts = starts[::25]
+    actions = np.arange(8) % 5
+    vec_env.reset(starts)
+    _, rewards, steps, terminals, info = vec_env.step_repeat(actions, 6)
+    radius = env.config["ball"]["radius"]
+    for i, (start, action) in enumerate(zip(starts, actions)):
+        ball = Ball(Point(start[0], start[1]), radius)
+        ball.set_velocity(Point(start[2], start[3]))
+        env.reset(ball)
+        state, total_reward, num_steps, terminal = env.step_repeat(int(action), 6)
+        assert tuple(info["final_state"][i]) == state
+        assert rewards[i] == total_reward and steps[i] == num_steps
+        assert terminals[i] == terminal
+
+
+def test_run_option(vec_env):
+    vec_env.reset(np.array([[0.9, 0.25, 0.0, -0.5]] + [[0.2, 0.9, 0.0, 0.0]] * 3))
+    seen = []
+
+    def policy(states):
+        seen.append(len(states))
+        return np.zeros(len(states), dtype=int)
+
+    s, r, steps, t, info = vec_env.run_option(
+        policy, terminate=lambda states: states[:, 0] > 0.22, max_steps=50
+    )
+    assert np.all(t == [True, False, False, False])
+    assert steps[0] == 1 and np.all(steps[1:] == steps[1])
+    assert seen[0] == 4 and seen[1] == 3
+    assert np.all(info["final_state"][1:, 0] > 0.22)
+    assert np.all(r[1:] == -5.0 * steps[1:])
+    assert np.all(s[0] == [0.2, 0.9, 0.0, 0.0])